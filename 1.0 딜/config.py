@@ -37,3 +37,9 @@ RETRY_COUNT = 3
 
 # 12. 병렬 처리를 위한 워커 수 (이미지 추출 시 사용)
 MAX_WORKERS = 4
+
+# 13. 이미지 URL을 HTTP로 먼저 추출할 때의 동시 요청 수 (찾지 못한 URL만 Selenium으로 다시 처리)
+IMAGE_HTTP_WORKERS = 16
+
+# 14. 이미지 URL 추출 HTTP 요청 타임아웃(초)
+IMAGE_HTTP_TIMEOUT = 10
@@ -10,10 +10,14 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 import os
+import re
 import shutil
 from datetime import datetime
 import openpyxl
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 import signal
 import sys
@@ -146,12 +150,11 @@ def rename_downloaded_file(download_folder):
         print(f"❌ 파일명 변경 중 오류 발생: {e}")
         return None
 
-def find_column_by_header(sheet, header_texts, start_row=1):
-    """헤더 텍스트로 열 번호를 찾습니다."""
+def find_column_by_header(header_row, header_texts):
+    """헤더 행 값 목록에서 헤더 텍스트로 열 번호(A=1)를 찾습니다."""
     try:
-        header_row = sheet[start_row]
-        for col_idx, cell in enumerate(header_row, 1):
-            cell_value = str(cell.value or '').strip()
+        for col_idx, value in enumerate(header_row, 1):
+            cell_value = str(value or '').strip()
             for header_text in header_texts:
                 if header_text.lower() in cell_value.lower():
                     return col_idx
@@ -160,7 +163,91 @@ def find_column_by_header(sheet, header_texts, start_row=1):
         print(f"⚠️ 헤더 검색 중 오류: {e}")
         return None
 
-def get_data_from_sheet(client):
+# 시트에서 읽어오는 열 (A=1): 상품번호 열, B열 상품번호, C열 상품명, BH열/BI열 URL
+SHEET_READ_COLUMNS = (config.PRODUCT_ID_COLUMN, 2, 3, 60, 61)
+
+def _column_letter(column):
+    """열 번호(A=1)를 열 문자(예: 60 → 'BH')로 바꿉니다."""
+    letters = ''
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def _column_ranges(columns, start_row):
+    """
+    열 번호들을 연속 구간별 A1 범위로 묶습니다.
+
+    예: (2, 3, 60, 61), 5 → [('B5:C', 2), ('BH5:BI', 60)] (범위, 첫 열 번호)
+    """
+    spans = []
+    for column in sorted(set(columns)):
+        if spans and column == spans[-1][1] + 1:
+            spans[-1][1] = column
+        else:
+            spans.append([column, column])
+    return [(f"{_column_letter(first)}{start_row}:{_column_letter(last)}", first) for first, last in spans]
+
+class WorksheetSnapshot:
+    """
+    원본 시트에서 필요한 열만 한 번 내려받아 여러 열 추출 함수가 함께 쓰는 스냅샷입니다.
+
+    전체 시트(get_all_values) 대신 columns의 연속 구간(예: 'B5:C', 'BH5:BI')만
+    batch_get 한 번으로 읽고, 행 번호별 {열 번호: 값} 레코드로 맞춰 둡니다.
+    열 추출 함수들은 같은 스냅샷을 보므로 한 단계에서 시트 읽기 API 호출은 한 번입니다.
+    이 스냅샷으로 시트에 쓰면(update_cells) 자동으로 무효화되어 다음 읽기에서 다시 받습니다.
+    """
+
+    def __init__(self, client, columns=SHEET_READ_COLUMNS):
+        self.client = client
+        self.ranges = _column_ranges(columns, config.START_ROW)
+        self._worksheet = None
+        self._records = None
+        self.fetch_count = 0
+
+    @property
+    def worksheet(self):
+        if self._worksheet is None:
+            self._worksheet = self.client.open(config.SPREADSHEET_NAME).worksheet(config.SOURCE_SHEET_NAME)
+        return self._worksheet
+
+    def records(self):
+        """
+        데이터 시작 행(config.START_ROW)부터 (행 번호, {열 번호: 값}) 목록을 반환합니다.
+
+        스냅샷이 없을 때만 API로 읽습니다. 범위마다 끝의 빈 행/열은 응답에서
+        빠지므로 가장 긴 범위에 맞춰 행을 정렬하고, 없는 셀은 레코드에 넣지 않습니다.
+        """
+        if self._records is None:
+            value_ranges = self.worksheet.batch_get([a1_range for a1_range, _ in self.ranges])
+            row_count = max((len(values) for values in value_ranges), default=0)
+            records = [(config.START_ROW + i, {}) for i in range(row_count)]
+            for (_, first_column), values in zip(self.ranges, value_ranges):
+                for (_, record), row in zip(records, values):
+                    for offset, value in enumerate(row):
+                        record[first_column + offset] = value
+            self._records = records
+            self.fetch_count += 1
+            ranges_label = ', '.join(a1_range for a1_range, _ in self.ranges)
+            print(f"📥 시트 데이터를 불러왔습니다. ({ranges_label}: {row_count}행, 읽기 {self.fetch_count}회째)")
+        return self._records
+
+    def invalidate(self):
+        """스냅샷을 버려 다음 읽기에서 시트를 다시 받도록 합니다."""
+        self._records = None
+
+    def update_cells(self, cells, value_input_option='USER_ENTERED'):
+        """셀을 업데이트하고 스냅샷을 무효화합니다."""
+        try:
+            self.worksheet.update_cells(cells, value_input_option=value_input_option)
+        finally:
+            self.invalidate()
+
+def _cell_text(record, column):
+    """레코드에서 column번째 열(A=1) 값을 공백 제거하여 반환합니다 (없으면 '')."""
+    return record.get(column, "").strip()
+
+def get_data_from_sheet(snapshot):
     """
     구글 시트에서 상품번호 목록을 가져옵니다.
     """
@@ -168,25 +255,17 @@ def get_data_from_sheet(client):
     print(f"📋 시트명: '{config.SOURCE_SHEET_NAME}'")
     print(f"'{config.SPREADSHEET_NAME}' 스프레드시트의 '{config.SOURCE_SHEET_NAME}' 시트에서 데이터를 가져옵니다...")
     try:
-        sheet = client.open(config.SPREADSHEET_NAME).worksheet(config.SOURCE_SHEET_NAME)
-        all_values = sheet.get_all_values()
-        
-        if len(all_values) < config.START_ROW:
+        if not snapshot.records():
             print("⚠️ 시트에 데이터가 없습니다.")
             return []
 
-        # 헤더와 데이터 분리
-        data_rows = all_values[config.START_ROW - 1:]
-
         # 처리할 상품번호와 행 번호를 저장할 리스트
         products_to_process = []
         total_count = 0
         
-        for i, row in enumerate(data_rows):
-            row_num = config.START_ROW + i
-            
+        for row_num, row in snapshot.records():
             # 상품번호만 가져오기 (열 인덱스 벗어남 방지)
-            product_id = row[config.PRODUCT_ID_COLUMN - 1].strip() if len(row) >= config.PRODUCT_ID_COLUMN else ""
+            product_id = _cell_text(row, config.PRODUCT_ID_COLUMN)
 
             if product_id:  # 상품번호가 있는 경우에만 처리
                 total_count += 1
@@ -207,7 +286,7 @@ def get_data_from_sheet(client):
         print(f"❌ 시트 데이터 로딩 중 오류 발생: {e}")
     return []
 
-def get_bc_column_data_from_sheet(client):
+def get_bc_column_data_from_sheet(snapshot):
     """
     구글 시트에서 B열(상품번호)과 C열(상품명) 데이터를 가져옵니다.
     """
@@ -215,25 +294,17 @@ def get_bc_column_data_from_sheet(client):
     print(f"📋 시트명: '{config.SOURCE_SHEET_NAME}'")
     print(f"'{config.SPREADSHEET_NAME}' 스프레드시트의 '{config.SOURCE_SHEET_NAME}' 시트에서 B,C열 데이터를 가져옵니다...")
     try:
-        sheet = client.open(config.SPREADSHEET_NAME).worksheet(config.SOURCE_SHEET_NAME)
-        all_values = sheet.get_all_values()
-        
-        if len(all_values) < config.START_ROW:
+        if not snapshot.records():
             print("⚠️ 시트에 데이터가 없습니다.")
             return []
 
-        # 헤더와 데이터 분리
-        data_rows = all_values[config.START_ROW - 1:]
-
         # B,C열 데이터와 행 번호를 저장할 리스트
         bc_column_data = []
         
-        for i, row in enumerate(data_rows):
-            row_num = config.START_ROW + i
-            
+        for row_num, row in snapshot.records():
             # B열(상품번호)과 C열(상품명) 가져오기
-            product_id = row[1].strip() if len(row) >= 2 else ""  # B열은 2번째 열 (인덱스 1)
-            product_name = row[2].strip() if len(row) >= 3 else ""  # C열은 3번째 열 (인덱스 2)
+            product_id = _cell_text(row, 2)  # B열은 2번째 열
+            product_name = _cell_text(row, 3)  # C열은 3번째 열
 
             if product_id and product_name:  # 둘 다 있는 경우에만 처리
                 bc_column_data.append({
@@ -254,7 +325,7 @@ def get_bc_column_data_from_sheet(client):
         print(f"❌ B,C열 데이터 로딩 중 오류 발생: {e}")
         return []
 
-def get_bi_column_data_from_sheet(client):
+def get_bi_column_data_from_sheet(snapshot):
     """
     구글 시트에서 BI열(URL) 데이터를 가져옵니다.
     """
@@ -262,24 +333,16 @@ def get_bi_column_data_from_sheet(client):
     print(f"📋 시트명: '{config.SOURCE_SHEET_NAME}'")
     print(f"'{config.SPREADSHEET_NAME}' 스프레드시트의 '{config.SOURCE_SHEET_NAME}' 시트에서 BI열 데이터를 가져옵니다...")
     try:
-        sheet = client.open(config.SPREADSHEET_NAME).worksheet(config.SOURCE_SHEET_NAME)
-        all_values = sheet.get_all_values()
-        
-        if len(all_values) < config.START_ROW:
+        if not snapshot.records():
             print("⚠️ 시트에 데이터가 없습니다.")
             return []
 
-        # 헤더와 데이터 분리
-        data_rows = all_values[config.START_ROW - 1:]
-
         # BI열 데이터와 행 번호를 저장할 리스트
         bi_column_data = []
         
-        for i, row in enumerate(data_rows):
-            row_num = config.START_ROW + i
-            
-            # BI열(URL) 가져오기 (61번째 열, 인덱스 60)
-            url = row[60].strip() if len(row) >= 61 else ""
+        for row_num, row in snapshot.records():
+            # BI열(URL) 가져오기 (61번째 열)
+            url = _cell_text(row, 61)
 
             if url and url.startswith('http'):  # 유효한 URL인 경우에만 처리
                 bi_column_data.append({
@@ -299,7 +362,7 @@ def get_bi_column_data_from_sheet(client):
         print(f"❌ BI열 데이터 로딩 중 오류 발생: {e}")
         return []
 
-def get_bh_column_data_from_sheet(client):
+def get_bh_column_data_from_sheet(snapshot):
     """
     구글 시트에서 BH열(URL) 데이터를 가져옵니다.
     """
@@ -307,24 +370,16 @@ def get_bh_column_data_from_sheet(client):
     print(f"📋 시트명: '{config.SOURCE_SHEET_NAME}'")
     print(f"'{config.SPREADSHEET_NAME}' 스프레드시트의 '{config.SOURCE_SHEET_NAME}' 시트에서 BH열 데이터를 가져옵니다...")
     try:
-        sheet = client.open(config.SPREADSHEET_NAME).worksheet(config.SOURCE_SHEET_NAME)
-        all_values = sheet.get_all_values()
-        
-        if len(all_values) < config.START_ROW:
+        if not snapshot.records():
             print("⚠️ 시트에 데이터가 없습니다.")
             return []
 
-        # 헤더와 데이터 분리
-        data_rows = all_values[config.START_ROW - 1:]
-
         # BH열 데이터와 행 번호를 저장할 리스트
         bh_column_data = []
         
-        for i, row in enumerate(data_rows):
-            row_num = config.START_ROW + i
-            
-            # BH열(URL) 가져오기 (60번째 열, 인덱스 59)
-            url = row[59].strip() if len(row) >= 60 else ""
+        for row_num, row in snapshot.records():
+            # BH열(URL) 가져오기 (60번째 열)
+            url = _cell_text(row, 60)
 
             if url and url.startswith('http'):  # 유효한 URL인 경우에만 처리
                 bh_column_data.append({
@@ -345,19 +400,26 @@ def get_bh_column_data_from_sheet(client):
         return []
 
 def read_excel_data_by_product_ids(excel_file_path, product_data_list):
-    """엑셀 파일에서 상품번호로 데이터를 찾아 읽어옵니다."""
+    """
+    엑셀 파일에서 상품번호로 데이터를 찾아 읽어옵니다.
+
+    읽기 전용 모드로 한 행씩 읽으며 헤더에서 찾은 열(상품번호, 상품명, 판매가, 옵션값)만
+    꺼냅니다. 상품번호로 찾지 못한 상품은 미리 만들어 둔 상품명 색인으로 찾습니다.
+    """
+    workbook = None
     try:
         print(f"📖 엑셀 파일을 읽는 중: {excel_file_path}")
-        workbook = openpyxl.load_workbook(excel_file_path)
+        workbook = openpyxl.load_workbook(excel_file_path, read_only=True)
         sheet = workbook.active
         
-        print(f"📊 엑셀 파일 정보: {sheet.max_row}행, {sheet.max_column}열")
+        print(f"📊 엑셀 파일 정보: {sheet.max_row or '?'}행, {sheet.max_column or '?'}열")
         
         # 헤더에서 열 위치 동적 탐지
-        product_id_col = find_column_by_header(sheet, ['상품번호', 'product_id', 'productid'], 1)
-        product_name_col = find_column_by_header(sheet, ['상품명', 'product_name', 'productname'], 1)
-        price_col = find_column_by_header(sheet, ['판매가', 'price', 'selling_price'], 1)
-        option_col = find_column_by_header(sheet, ['옵션값'], 1)
+        header_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        product_id_col = find_column_by_header(header_row, ['상품번호', 'product_id', 'productid'])
+        product_name_col = find_column_by_header(header_row, ['상품명', 'product_name', 'productname'])
+        price_col = find_column_by_header(header_row, ['판매가', 'price', 'selling_price'])
+        option_col = find_column_by_header(header_row, ['옵션값'])
         
         # 기본값 설정 (탐지 실패시)
         if not product_id_col:
@@ -377,25 +439,20 @@ def read_excel_data_by_product_ids(excel_file_path, product_data_list):
         matched_data = {}
         unmatched_products = []
         
-        # 엑셀 데이터를 먼저 모두 읽어서 딕셔너리로 저장
+        # 엑셀 데이터를 먼저 모두 읽어서 딕셔너리로 저장 (필요한 열까지만 읽음)
+        columns = (product_id_col - 1, product_name_col - 1, price_col - 1, option_col - 1)
         excel_data_dict = {}
-        for row in range(2, sheet.max_row + 1):
-            try:
-                excel_product_id = sheet.cell(row=row, column=product_id_col).value
-                if excel_product_id:
-                    excel_product_id = str(excel_product_id).strip()
-                    excel_product_name = sheet.cell(row=row, column=product_name_col).value
-                    excel_price = sheet.cell(row=row, column=price_col).value
-                    excel_option = sheet.cell(row=row, column=option_col).value
-                    
-                    excel_data_dict[excel_product_id] = {
-                        'name': str(excel_product_name) if excel_product_name else '',
-                        'price': str(excel_price) if excel_price else '',
-                        'option': str(excel_option) if excel_option else '',
-                        'row': row
-                    }
-            except Exception as e:
-                continue
+        for row_num, row in enumerate(sheet.iter_rows(min_row=2, max_col=max(columns) + 1, values_only=True), start=2):
+            excel_product_id, excel_product_name, excel_price, excel_option = (
+                row[index] if index < len(row) else None for index in columns
+            )
+            if excel_product_id:
+                excel_data_dict[str(excel_product_id).strip()] = {
+                    'name': str(excel_product_name) if excel_product_name else '',
+                    'price': str(excel_price) if excel_price else '',
+                    'option': str(excel_option) if excel_option else '',
+                    'row': row_num
+                }
         
         print(f"📊 엑셀에서 {len(excel_data_dict)}개 상품 데이터를 로드했습니다.")
         
@@ -421,21 +478,29 @@ def read_excel_data_by_product_ids(excel_file_path, product_data_list):
         # 매칭 실패한 상품들에 대해 상품명으로 재시도 (폴백)
         if unmatched_products:
             print(f"\n🔄 {len(unmatched_products)}개 상품에 대해 상품명으로 재시도합니다...")
-            for product_info in unmatched_products[:]:  # 복사본으로 순회
+            # 상품명 → 엑셀 데이터 색인 (같은 상품명이 여러 개면 먼저 나온 상품)
+            name_index = {}
+            for excel_data in excel_data_dict.values():
+                if excel_data['name']:
+                    name_index.setdefault(excel_data['name'].strip(), excel_data)
+            
+            still_unmatched = []
+            for product_info in unmatched_products:
                 product_id = product_info['product_id']
                 product_name = product_info['product_name']
                 
                 # 상품명으로 매칭 시도
-                for excel_id, excel_data in excel_data_dict.items():
-                    if excel_data['name'] and str(excel_data['name']).strip() == product_name:
-                        matched_data[product_id] = {
-                            'name': excel_data['name'],
-                            'price': excel_data['price'],
-                            'option': excel_data['option'],
-                            'google_name': product_name
-                        }
-                        unmatched_products.remove(product_info)
-                        break
+                excel_data = name_index.get(product_name)
+                if excel_data:
+                    matched_data[product_id] = {
+                        'name': excel_data['name'],
+                        'price': excel_data['price'],
+                        'option': excel_data['option'],
+                        'google_name': product_name
+                    }
+                else:
+                    still_unmatched.append(product_info)
+            unmatched_products = still_unmatched
         
         print(f"\n📊 매칭 결과: 성공 {len(matched_data)}개, 실패 {len(unmatched_products)}개")
         
@@ -444,8 +509,11 @@ def read_excel_data_by_product_ids(excel_file_path, product_data_list):
     except Exception as e:
         print(f"❌ 엑셀 파일 읽기 중 오류 발생: {e}")
         return {}
+    finally:
+        if workbook is not None:
+            workbook.close()
 
-def update_google_sheet_with_excel_data(client, excel_data, bc_column_data):
+def update_google_sheet_with_excel_data(snapshot, excel_data, bc_column_data):
     """엑셀 데이터를 구글 시트에 업데이트합니다."""
     if not excel_data or not bc_column_data:
         return
@@ -454,8 +522,6 @@ def update_google_sheet_with_excel_data(client, excel_data, bc_column_data):
     print(f"📋 시트명: '{config.SOURCE_SHEET_NAME}'")
     print(f"📝 구글 시트에 엑셀 데이터를 업데이트합니다...")
     try:
-        sheet = client.open(config.SPREADSHEET_NAME).worksheet(config.SOURCE_SHEET_NAME)
-        
         cells_to_update = []
         updated_count = 0
         
@@ -478,7 +544,7 @@ def update_google_sheet_with_excel_data(client, excel_data, bc_column_data):
                 print(f"⚠️ 행 {row_num} (상품번호: {product_id}, 상품명: '{product_name}'): 엑셀에서 해당 상품을 찾을 수 없습니다.")
         
         if cells_to_update:
-            sheet.update_cells(cells_to_update, value_input_option='USER_ENTERED')
+            snapshot.update_cells(cells_to_update, value_input_option='USER_ENTERED')
             print(f"✅ 구글 시트 업데이트 완료! ({updated_count}개 상품)")
         else:
             print("⚠️ 업데이트할 데이터가 없습니다.")
@@ -486,7 +552,7 @@ def update_google_sheet_with_excel_data(client, excel_data, bc_column_data):
     except Exception as e:
         print(f"❌ 구글 시트 업데이트 중 오류 발생: {e}")
 
-def update_sheet_status(client, processed_rows):
+def update_sheet_status(snapshot, processed_rows):
     """
     처리가 완료된 행에 대해 구글 시트의 상태를 업데이트합니다.
     """
@@ -495,8 +561,6 @@ def update_sheet_status(client, processed_rows):
     
     print(f"Google 시트에 {len(processed_rows)}개 항목의 작업 상태를 업데이트합니다...")
     try:
-        sheet = client.open(config.SPREADSHEET_NAME).worksheet(config.SOURCE_SHEET_NAME)
-        
         cells_to_update = []
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
@@ -504,13 +568,13 @@ def update_sheet_status(client, processed_rows):
             # D열(4): 작업 상태만 업데이트 (E열은 건드리지 않음)
             cells_to_update.append(gspread.Cell(row_num, 4, '다운로드 완료'))  # D열
 
-        sheet.update_cells(cells_to_update, value_input_option='USER_ENTERED')
+        snapshot.update_cells(cells_to_update, value_input_option='USER_ENTERED')
         print("✅ Google 시트 상태 업데이트 완료!")
 
     except Exception as e:
         print(f"❌ 시트 업데이트 중 오류 발생: {e}")
 
-def search_and_download_naver_format(driver, products_to_process, client=None):
+def search_and_download_naver_format(driver, products_to_process, snapshot=None):
     """
     b-flow에서 상품을 검색하고 '네이버 스마트스토어 형식'으로 다운로드합니다.
     성공적으로 처리된 chunk의 행 번호 목록을 yield합니다.
@@ -560,6 +624,12 @@ def search_and_download_naver_format(driver, products_to_process, client=None):
 
     chunks = [products_to_process[i:i + 500] for i in range(0, len(products_to_process), 500)]
     
+    # B,C열은 묶음마다 시트 전체를 다시 읽지 않고 한 번만 읽어 행 번호로 찾음
+    # (묶음 처리 중 시트에 쓰는 열은 D, F, H, I열이라 처음 읽은 B,C열 값이 그대로 유효)
+    bc_by_row = {}
+    if snapshot is not None:
+        bc_by_row = {bc['row_num']: bc for bc in get_bc_column_data_from_sheet(snapshot)}
+    
     for i, chunk in enumerate(chunks):
         product_ids_in_chunk = [p['product_id'] for p in chunk]
         row_nums_in_chunk = [p['row_num'] for p in chunk]
@@ -664,8 +734,8 @@ def search_and_download_naver_format(driver, products_to_process, client=None):
                 if downloaded_file_path and os.path.exists(downloaded_file_path):
                     print(f"\n📊 엑셀 데이터를 구글 시트에 업데이트합니다...")
                     
-                    # B,C열 데이터 가져오기
-                    bc_data = get_bc_column_data_from_sheet(client)
+                    # 이번 묶음 상품의 B,C열 데이터만 사용 (시트 전체가 아닌 묶음 크기만큼만 매칭)
+                    bc_data = [bc_by_row[row_num] for row_num in row_nums_in_chunk if row_num in bc_by_row]
                     if bc_data:
                         # B,C열 데이터를 사용하여 엑셀 데이터 읽기 (상품번호 기준)
                         excel_data = read_excel_data_by_product_ids(downloaded_file_path, bc_data)
@@ -673,7 +743,7 @@ def search_and_download_naver_format(driver, products_to_process, client=None):
                         if excel_data:
                             print(f"✅ 엑셀에서 {len(excel_data)}개 상품 데이터를 읽었습니다.")
                             # 구글 시트 업데이트
-                            update_google_sheet_with_excel_data(client, excel_data, bc_data)
+                            update_google_sheet_with_excel_data(snapshot, excel_data, bc_data)
                             print("✅ 엑셀 데이터로 구글 시트 업데이트 완료!")
                         else:
                             print("❌ 엑셀 데이터를 읽을 수 없습니다.")
@@ -705,6 +775,82 @@ def search_and_download_naver_format(driver, products_to_process, client=None):
                 if attempt == config.RETRY_COUNT - 1:
                     print(f"❌ 최대 재시도 횟수({config.RETRY_COUNT})를 초과하여 이번 묶음을 건너뜁니다.")
 
+# style 속성의 background-image: url("...") 에서 URL 추출
+BACKGROUND_IMAGE_URL_PATTERN = re.compile(r'url\(\s*["\']?([^"\')]+)["\']?\s*\)')
+# 상품 페이지 HTML에서 product-image-swipe가 들어 있는 div 시작 태그 (후보만 빠르게 찾고,
+# 실제로 class 값에 product-image-swipe가 있는지는 태그를 파싱해서 확인)
+PRODUCT_IMAGE_TAG_CANDIDATE_PATTERN = re.compile(r'<div\b[^>]*product-image-swipe[^>]*>', re.IGNORECASE)
+
+# HTTP 요청 헤더 (일반 브라우저처럼 요청)
+IMAGE_HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7'
+}
+
+def _image_url_from_style(style):
+    """style 속성 문자열에서 background-image URL을 추출합니다."""
+    if style and 'background-image' in style:
+        url_match = BACKGROUND_IMAGE_URL_PATTERN.search(style)
+        if url_match:
+            return url_match.group(1)
+    return None
+
+def create_image_http_session():
+    """이미지 URL 추출용 keep-alive 연결 풀 세션을 만듭니다 (여러 스레드가 함께 사용)."""
+    # 연결 실패/일시적 서버 오류만 짧게 재시도
+    retry = Retry(
+        total=2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        backoff_factor=0.5,
+        raise_on_status=False
+    )
+    # pool_block=True: 풀이 가득 차면 연결을 새로 만들고 버리는 대신 반환될 때까지 대기
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=config.IMAGE_HTTP_WORKERS,
+        max_retries=retry,
+        pool_block=True
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(IMAGE_HTTP_HEADERS)
+    return session
+
+def extract_image_url_from_html(page_html, page_url):
+    """
+    상품 페이지 HTML에서 product-image-swipe div의 background-image URL을 추출합니다.
+    브라우저 없이 받은 HTML에는 활성 슬라이드 표시가 없으므로 첫 번째 이미지를 사용합니다.
+    """
+    for tag_match in PRODUCT_IMAGE_TAG_CANDIDATE_PATTERN.finditer(page_html):
+        # 페이지 전체 대신 시작 태그만 파싱 (product-image-swipe-wrap, data-class 등은 제외)
+        image_div = BeautifulSoup(tag_match.group(0), 'html.parser').div
+        if image_div is None or 'product-image-swipe' not in image_div.get('class', []):
+            continue
+        image_url = _image_url_from_style(image_div.get('style'))
+        if image_url:
+            # //cdn... 처럼 상대 경로인 경우 페이지 URL 기준으로 완성
+            return urljoin(page_url, image_url)
+    return None
+
+def extract_image_url_via_http(session, url):
+    """
+    HTTP로 상품 페이지 HTML만 받아 이미지 URL을 추출합니다.
+    찾지 못하거나 요청이 실패하면 None을 반환합니다 (Selenium으로 다시 처리).
+    """
+    if interrupted:
+        return None
+
+    try:
+        response = session.get(url, timeout=config.IMAGE_HTTP_TIMEOUT)
+        if response.status_code != 200:
+            return None
+        return extract_image_url_from_html(response.text, response.url)
+    except requests.RequestException:
+        return None
+
 def extract_image_url_from_brich(driver, url):
     """
     Selenium을 사용하여 brich.co.kr URL에서 상품 이미지 URL을 추출합니다.
@@ -731,43 +877,27 @@ def extract_image_url_from_brich(driver, url):
             )
             
             # style 속성에서 background-image URL 추출
-            style = active_image_div.get_attribute('style')
-            
-            if style and 'background-image' in style:
-                # url("...") 패턴에서 URL 추출
-                import re
-                url_match = re.search(r'url\(["\']?([^"\']+)["\']?\)', style)
-                if url_match:
-                    image_url = url_match.group(1)
-                    return image_url
+            image_url = _image_url_from_style(active_image_div.get_attribute('style'))
+            if image_url:
+                return image_url
             
         except Exception as e:
             # 첫 번째 product-image-swipe div 찾기 (fallback)
             try:
                 first_image_div = driver.find_element(By.CSS_SELECTOR, "div.product-image-swipe")
-                style = first_image_div.get_attribute('style')
-                
-                if style and 'background-image' in style:
-                    import re
-                    url_match = re.search(r'url\(["\']?([^"\']+)["\']?\)', style)
-                    if url_match:
-                        image_url = url_match.group(1)
-                        return image_url
+                image_url = _image_url_from_style(first_image_div.get_attribute('style'))
+                if image_url:
+                    return image_url
                         
             except Exception as e2:
                 # 모든 product-image-swipe div 찾기
                 try:
                     all_image_divs = driver.find_elements(By.CSS_SELECTOR, "div.product-image-swipe")
                     
-                    for i, div in enumerate(all_image_divs):
-                        style = div.get_attribute('style')
-                        
-                        if style and 'background-image' in style:
-                            import re
-                            url_match = re.search(r'url\(["\']?([^"\']+)["\']?\)', style)
-                            if url_match:
-                                image_url = url_match.group(1)
-                                return image_url
+                    for div in all_image_divs:
+                        image_url = _image_url_from_style(div.get_attribute('style'))
+                        if image_url:
+                            return image_url
                                 
                 except Exception as e3:
                     pass
@@ -779,10 +909,71 @@ def extract_image_url_from_brich(driver, url):
         print(f"❌ 이미지 URL 추출 중 오류 발생 ({url}): {e}")
         return None
 
-def update_bj_column_with_image_urls(client, url_column_data, column_type="BI"):
+def extract_image_urls_via_http(url_column_data):
+    """
+    HTTP 연결 풀로 여러 URL의 이미지 URL을 동시에 추출합니다.
+    (찾은 결과 목록, 찾지 못한 항목 목록)을 반환합니다.
+    """
+    print(f"🌐 HTTP로 이미지 URL 추출 시작 (동시 요청 수: {config.IMAGE_HTTP_WORKERS})")
+    results = []
+    missed = []
+    start_time = time.time()
+
+    session = create_image_http_session()
+    try:
+        with ThreadPoolExecutor(max_workers=config.IMAGE_HTTP_WORKERS) as executor:
+            futures = {executor.submit(extract_image_url_via_http, session, item['url']): item for item in url_column_data}
+
+            for done_count, future in enumerate(as_completed(futures), start=1):
+                if interrupted:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+                item = futures[future]
+                image_url = future.result()
+                if image_url:
+                    results.append({'row_num': item['row_num'], 'image_url': image_url})
+                else:
+                    missed.append(item)
+                if done_count % 500 == 0:
+                    print(f"   ... {done_count}/{len(url_column_data)}개 처리")
+    finally:
+        session.close()
+
+    # 행 순서대로 Selenium에 넘김
+    missed.sort(key=lambda item: item['row_num'])
+    print(f"✅ HTTP 추출: {len(results)}개 성공, {len(missed)}개 미확인 ({time.time() - start_time:.1f}초)")
+    return results, missed
+
+def process_url_chunk(chunk, chunk_num):
+    """
+    브라우저 하나로 URL 묶음의 이미지 URL을 추출합니다 (HTTP로 찾지 못한 URL 처리용).
+    """
+    results = []
+    driver = None
+    try:
+        driver = setup_driver(headless=True)
+        for i, item in enumerate(chunk, start=1):
+            if interrupted:
+                break
+            image_url = extract_image_url_from_brich(driver, item['url'])
+            if image_url:
+                results.append({'row_num': item['row_num'], 'image_url': image_url})
+            if i % 20 == 0:
+                print(f"   [워커 {chunk_num}] {i}/{len(chunk)}개 처리")
+    except Exception as e:
+        print(f"❌ [워커 {chunk_num}] 브라우저 처리 중 오류 발생: {e}")
+    finally:
+        if driver:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    return results
+
+def update_bj_column_with_image_urls(snapshot, url_column_data, column_type="BI"):
     """
     BI열 또는 BH열의 URL들을 사용하여 BJ열에 이미지 URL을 업데이트합니다.
-    병렬 처리를 사용하여 속도를 개선합니다.
+    먼저 HTTP로 페이지 HTML만 받아 추출하고, 찾지 못한 URL만 브라우저로 병렬 처리합니다.
     """
     global interrupted
     
@@ -790,13 +981,19 @@ def update_bj_column_with_image_urls(client, url_column_data, column_type="BI"):
         return
     print(f"📋 시트명: '{config.SOURCE_SHEET_NAME}'")
     print(f"📝 {column_type}열의 URL들을 사용하여 BJ열에 이미지 URL을 업데이트합니다...")
-    print(f"🚀 병렬 처리 시작 (워커 수: {config.MAX_WORKERS})")
-    
-    # 데이터를 워커 수에 맞게 분할
-    chunk_size = (len(url_column_data) + config.MAX_WORKERS - 1) // config.MAX_WORKERS
-    chunks = [url_column_data[i:i + chunk_size] for i in range(0, len(url_column_data), chunk_size)]
-    
-    all_results = []
+
+    # 1단계: 페이지 HTML만 받아 빠르게 추출
+    all_results, missed = extract_image_urls_via_http(url_column_data)
+    if interrupted:
+        return
+
+    # 2단계: HTTP로 찾지 못한 URL만 브라우저로 처리
+    chunks = []
+    if missed:
+        print(f"🚀 미확인 {len(missed)}개 URL을 브라우저로 병렬 처리 시작 (워커 수: {config.MAX_WORKERS})")
+        # 데이터를 워커 수에 맞게 분할
+        chunk_size = (len(missed) + config.MAX_WORKERS - 1) // config.MAX_WORKERS
+        chunks = [missed[i:i + chunk_size] for i in range(0, len(missed), chunk_size)]
     
     try:
         with ThreadPoolExecutor(max_workers=config.MAX_WORKERS) as executor:
@@ -821,7 +1018,6 @@ def update_bj_column_with_image_urls(client, url_column_data, column_type="BI"):
         print(f"✅ 총 {len(all_results)}개의 이미지 URL을 추출했습니다. 구글 시트에 업데이트합니다...")
         
         try:
-            sheet = client.open(config.SPREADSHEET_NAME).worksheet(config.SOURCE_SHEET_NAME)
             cells_to_update = []
             
             for item in all_results:
@@ -831,7 +1027,7 @@ def update_bj_column_with_image_urls(client, url_column_data, column_type="BI"):
                 cells_to_update.append(gspread.Cell(row_num, 62, image_url))
             
             if cells_to_update:
-                sheet.update_cells(cells_to_update, value_input_option='USER_ENTERED')
+                snapshot.update_cells(cells_to_update, value_input_option='USER_ENTERED')
                 print(f"✅ BJ열 업데이트 완료! ({len(cells_to_update)}개 이미지 URL)")
             else:
                 print("⚠️ 업데이트할 이미지 URL이 없습니다.")
@@ -849,10 +1045,12 @@ def update_image_urls_only():
     gspread_client = authenticate_google_sheets()
     if not gspread_client:
         return
+    # 열 추출 함수들이 함께 쓰는 시트 스냅샷 (쓰기 후 자동 무효화)
+    snapshot = WorksheetSnapshot(gspread_client)
 
     # BI열과 BH열 데이터 모두 확인
-    bi_column_data = get_bi_column_data_from_sheet(gspread_client)
-    bh_column_data = get_bh_column_data_from_sheet(gspread_client)
+    bi_column_data = get_bi_column_data_from_sheet(snapshot)
+    bh_column_data = get_bh_column_data_from_sheet(snapshot)
     
     # 어떤 열에 데이터가 있는지 확인
     if bi_column_data and bh_column_data:
@@ -873,7 +1071,7 @@ def update_image_urls_only():
         return
     
     # BJ열에 이미지 URL 업데이트
-    update_bj_column_with_image_urls(gspread_client, url_data, column_type)
+    update_bj_column_with_image_urls(snapshot, url_data, column_type)
     
     print("\n🎉 이미지 URL 업데이트가 완료되었습니다!")
 
@@ -885,9 +1083,11 @@ def update_sheet_from_existing_file():
     gspread_client = authenticate_google_sheets()
     if not gspread_client:
         return
+    # 열 추출 함수들이 함께 쓰는 시트 스냅샷 (쓰기 후 자동 무효화)
+    snapshot = WorksheetSnapshot(gspread_client)
 
     # B,C열 데이터 가져오기
-    bc_column_data = get_bc_column_data_from_sheet(gspread_client)
+    bc_column_data = get_bc_column_data_from_sheet(snapshot)
     if not bc_column_data:
         print("⚠️ B,C열에 유효한 데이터가 없습니다.")
         return
@@ -906,11 +1106,11 @@ def update_sheet_from_existing_file():
         return
 
     # 구글 시트 업데이트 (F, H, I열)
-    update_google_sheet_with_excel_data(gspread_client, excel_data, bc_column_data)
+    update_google_sheet_with_excel_data(snapshot, excel_data, bc_column_data)
     
     # BI열과 BH열 데이터 모두 확인
-    bi_column_data = get_bi_column_data_from_sheet(gspread_client)
-    bh_column_data = get_bh_column_data_from_sheet(gspread_client)
+    bi_column_data = get_bi_column_data_from_sheet(snapshot)
+    bh_column_data = get_bh_column_data_from_sheet(snapshot)
     
     # 어떤 열에 데이터가 있는지 확인
     if bi_column_data and bh_column_data:
@@ -932,7 +1132,7 @@ def update_sheet_from_existing_file():
         return
     
     # BJ열에 이미지 URL 업데이트
-    update_bj_column_with_image_urls(gspread_client, url_data, column_type)
+    update_bj_column_with_image_urls(snapshot, url_data, column_type)
     
     print("\n🎉 구글 시트 업데이트가 완료되었습니다!")
 
@@ -941,15 +1141,17 @@ def main():
     gspread_client = authenticate_google_sheets()
     if not gspread_client:
         return
+    # 열 추출 함수들이 함께 쓰는 시트 스냅샷 (쓰기 후 자동 무효화)
+    snapshot = WorksheetSnapshot(gspread_client)
 
-    products_to_process = get_data_from_sheet(gspread_client)
+    products_to_process = get_data_from_sheet(snapshot)
     if not products_to_process:
         return
 
     driver = setup_driver()
     try:
         # 각 chunk 처리 직후 시트 상태를 업데이트합니다.
-        for result in search_and_download_naver_format(driver, products_to_process, gspread_client):
+        for result in search_and_download_naver_format(driver, products_to_process, snapshot):
             if isinstance(result, dict):
                 # 새로운 형식: 엑셀 데이터 포함
                 processed_rows = result['row_nums']
@@ -957,14 +1159,14 @@ def main():
                 products = result['products']
                 
                 # 구글 시트 상태 업데이트
-                update_sheet_status(gspread_client, processed_rows)
+                update_sheet_status(snapshot, processed_rows)
                 
                 # 엑셀 데이터를 구글 시트에 업데이트
                 if excel_data:
-                    update_google_sheet_with_excel_data(gspread_client, excel_data, products)
+                    update_google_sheet_with_excel_data(snapshot, excel_data, products)
             else:
                 # 기존 형식: 행 번호만
-                update_sheet_status(gspread_client, result)
+                update_sheet_status(snapshot, result)
         
         print("\n🎉 모든 자동화 작업이 성공적으로 완료되었습니다.")
     finally:
@@ -988,10 +1190,12 @@ def run_full_process(skip_download=False, extract_images=True):
         print("❌ 구글 시트 연결 실패")
         return
     print("✅ 구글 시트 연결 성공")
+    # 열 추출 함수들이 함께 쓰는 시트 스냅샷 (쓰기 후 자동 무효화)
+    snapshot = WorksheetSnapshot(client)
     
     # 2단계: B열 상품번호 가져오기
     print("\n=== 2단계: B열 상품번호 가져오기 ===")
-    products_to_process = get_data_from_sheet(client)
+    products_to_process = get_data_from_sheet(snapshot)
     if not products_to_process:
         print("❌ B열에 상품번호가 없습니다")
         return
@@ -1005,16 +1209,16 @@ def run_full_process(skip_download=False, extract_images=True):
         driver = setup_driver()
         try:
             # b-flow 로그인 및 다운로드
-            for result in search_and_download_naver_format(driver, products_to_process, client):
+            for result in search_and_download_naver_format(driver, products_to_process, snapshot):
                 if isinstance(result, dict):
                     processed_rows = result['row_nums']
                     excel_data = result['excel_data']
                     products = result['products']
                     
                     # 구글 시트 상태 업데이트
-                    update_sheet_status(client, processed_rows)
+                    update_sheet_status(snapshot, processed_rows)
                 else:
-                    update_sheet_status(client, result)
+                    update_sheet_status(snapshot, result)
             
             print("✅ b-flow 다운로드 및 구글 시트 업데이트 완료!")
             
@@ -1027,8 +1231,8 @@ def run_full_process(skip_download=False, extract_images=True):
     
     # 4단계: BI열과 BH열 데이터 확인
     print("\n=== 4단계: BI열과 BH열 데이터 확인 ===")
-    bi_data = get_bi_column_data_from_sheet(client)
-    bh_data = get_bh_column_data_from_sheet(client)
+    bi_data = get_bi_column_data_from_sheet(snapshot)
+    bh_data = get_bh_column_data_from_sheet(snapshot)
     
     # 어떤 열에 데이터가 있는지 확인
     if bi_data and bh_data:
@@ -1054,7 +1258,7 @@ def run_full_process(skip_download=False, extract_images=True):
         print("\n=== 5단계: 이미지 URL 추출 ===")
         print(f"{column_type}열에 {len(url_data)}개 URL이 있습니다.")
         print("🖼️ 이미지 URL 추출을 시작합니다...")
-        update_bj_column_with_image_urls(client, url_data, column_type)
+        update_bj_column_with_image_urls(snapshot, url_data, column_type)
         print("✅ 이미지 URL 업데이트 완료!")
     else:
         print("\n=== 5단계: 이미지 추출 건너뜀 ===")
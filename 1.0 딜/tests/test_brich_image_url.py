@@ -0,0 +1,38 @@
+"""brich 상품 페이지 HTML에서 이미지 URL을 정확한 div에서만 추출하는지 확인합니다."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from firstdeal import extract_image_url_from_html
+
+PAGE_URL = 'https://www.brich.co.kr/product/123'
+
+
+def test_reads_background_image_of_product_image_swipe_div():
+    page_html = ('<div class="swiper-slide"><div class="product-image-swipe" '
+                 'style="background-image: url(&quot;https://img.brich.co.kr/a.jpg&quot;);"></div></div>')
+    assert extract_image_url_from_html(page_html, PAGE_URL) == 'https://img.brich.co.kr/a.jpg'
+
+
+def test_ignores_class_names_that_only_start_with_product_image_swipe():
+    page_html = ('<div class="product-image-swipe-wrap" style="background-image: url(/bg.png)">'
+                 '<div class="swiper-slide product-image-swipe" style="background-image: url(//cdn.brich.co.kr/b.png)"></div>'
+                 '</div>')
+    assert extract_image_url_from_html(page_html, PAGE_URL) == 'https://cdn.brich.co.kr/b.png'
+
+
+def test_ignores_data_class_attribute():
+    page_html = '<div data-class="product-image-swipe" style="background-image: url(/no.jpg)"></div>'
+    assert extract_image_url_from_html(page_html, PAGE_URL) is None
+
+
+def test_unquoted_url_stops_at_its_closing_parenthesis():
+    page_html = ('<div class="product-image-swipe" '
+                 'style="background-image:url(/c.jpg); box-shadow: 0 0 1px rgb(0,0,0)"></div>')
+    assert extract_image_url_from_html(page_html, PAGE_URL) == 'https://www.brich.co.kr/c.jpg'
+
+
+def test_client_rendered_page_is_a_miss():
+    assert extract_image_url_from_html('<html><div id="app"></div></html>', PAGE_URL) is None
@@ -5,14 +5,21 @@ CJ 할인 데이터 분할 프로그램 (GitHub 버전)
 환경변수 또는 직접 설정을 통해 경로를 지정할 수 있습니다.
 """
 
-import pandas as pd
 import openpyxl
 import os
 import shutil
 import math
+import argparse
+import itertools
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+from cjsales_manifest import ChunkManifest, hash_file, hash_rows
+from cjsales_xlsx_writer import TemplateChunkWriter, TemplateFormatError
+
 # --- 환경변수 로드 (선택사항) ---
 try:
     from dotenv import load_dotenv
@@ -60,24 +67,213 @@ except ValueError:
     print("⚠️  CJ_CHUNK_SIZE 환경변수가 올바른 숫자가 아닙니다. 기본값 500을 사용합니다.")
     chunk_size = 500
 
+# 6. 분할 파일을 동시에 생성할 프로세스 수
+# 환경변수 CJ_SPLIT_WORKERS가 있으면 사용, 없으면 CPU 코어 수 (1이면 순서대로 하나씩 생성)
+try:
+    split_workers = int(os.getenv("CJ_SPLIT_WORKERS", str(os.cpu_count() or 1)))
+except ValueError:
+    print("⚠️  CJ_SPLIT_WORKERS 환경변수가 올바른 숫자가 아닙니다. CPU 코어 수를 사용합니다.")
+    split_workers = os.cpu_count() or 1
+
+# 7. 양식 파일에서 데이터를 채우기 시작할 행 (A5부터)
+DATA_START_ROW = 5
+
+# 8. 열별 셀 표시 형식 (B열: 판매가K 천 단위 구분, C열: 업로드용마진 숫자)
+NUMBER_FORMATS = {
+    2: '#,##0',
+    3: '0'
+}
+
+# 9. 변경분 모드: 이전 실행과 내용이 같은 분할 파일은 다시 만들지 않음
+# 환경변수 CJ_CHANGED_ONLY=1 또는 --changed-only 옵션으로 사용
+CHANGED_ONLY = os.getenv("CJ_CHANGED_ONLY", "0").lower() in ("1", "true", "yes")
+
+# 10. 분할 파일별 행 범위/내용 해시 기록과, 새로 생기거나 바뀐 파일 목록
+#     (변경 목록은 CJ 일괄업로드의 --files-from 옵션에 그대로 넘길 수 있음)
+MANIFEST_FILE = os.path.join(output_dir, "cjsales_manifest.json")
+CHANGED_LIST_FILE = os.path.join(output_dir, "cjsales_changed_files.txt")
+
 # --- 설정 정보 출력 ---
-print("\n" + "="*60)
-print("CJ 할인 데이터 분할 프로그램")
-print("="*60)
-print(f"📁 원본 파일: {source_file}")
-print(f"📋 템플릿 파일: {template_file}")
-print(f"📂 출력 폴더: {output_dir}")
-print(f"📊 분할 크기: {chunk_size}개 행/파일")
-print("="*60 + "\n")
+# (프로세스 풀 워커가 이 파일을 다시 import할 때는 출력하지 않음)
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("CJ 할인 데이터 분할 프로그램")
+    print("="*60)
+    print(f"📁 원본 파일: {source_file}")
+    print(f"📋 템플릿 파일: {template_file}")
+    print(f"📂 출력 폴더: {output_dir}")
+    print(f"📊 분할 크기: {chunk_size}개 행/파일")
+    print(f"⚙️  동시 생성: {split_workers}개 프로세스")
+    print("="*60 + "\n")
 
 # --- 코드 실행 부분 ---
 
-def process_and_split_files():
+# 원본 파일의 헤더 행 (A2행, 데이터는 A3행부터)
+SOURCE_HEADER_ROW = 2
+
+# 양식 A, B, C열에 들어갈 원본 열 번호 (0부터 시작)
+# 원본: 0:B.상품코드, 1:판매가K, 2:CJ상품코드, 3:외부할인, 4:할인판매가, 5:공급가, 6:등록할인율, 7:종료일
+SOURCE_COLUMNS = (
+    2,  # 원본 C열 CJ상품코드 → 양식 A열
+    1,  # 원본 B열 판매가K → 양식 B열
+    4,  # 원본 E열 할인판매가 → 양식 C열 (업로드용마진)
+)
+
+def iter_source_chunks(source_sheet, size):
     """
-    원본 엑셀 데이터를 읽고 가공한 후, 양식 파일에 맞춰
-    정해진 개수만큼 나누어 새로운 엑셀 파일들로 저장합니다.
+    원본 시트를 한 행씩 읽어 양식 열 순서로 바꾼 행들을 size개씩 묶어
+    (첫 원본 행 번호, 마지막 원본 행 번호, 행 목록)으로 반환합니다.
+
+    필요한 열만 꺼내고 모든 값이 비어 있는 행은 건너뜁니다. 한 번에 size개
+    행만 메모리에 두므로 원본 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+    rows = (
+        (row_num, tuple(row[i] if i < len(row) else None for i in SOURCE_COLUMNS))
+        for row_num, row in enumerate(
+            source_sheet.iter_rows(min_row=SOURCE_HEADER_ROW + 1, values_only=True),
+            start=SOURCE_HEADER_ROW + 1
+        )
+    )
+    rows = ((row_num, row) for row_num, row in rows if any(value is not None for value in row))
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk[0][0], chunk[-1][0], [row for _, row in chunk]
+
+def write_chunk_with_openpyxl(output_path, rows, template_path=None):
+    """
+    양식 파일을 복사한 뒤 openpyxl로 열어 데이터를 채웁니다.
+
+    양식 XML을 직접 다룰 수 없는 경우(TemplateFormatError)에만 사용합니다.
+    """
+    # a. 양식 파일을 새 출력 파일로 복사 (서식 유지를 위함)
+    shutil.copy(template_path or template_file, output_path)
+
+    # b. 복사된 엑셀 파일을 열고 데이터 추가
+    workbook = openpyxl.load_workbook(output_path)
+    sheet = workbook.active
+
+    # c. 데이터프레임의 각 행을 엑셀 시트에 추가 (A5부터 시작)
+    for chunk_idx, row_data in enumerate(rows):
+        for col_idx, value in enumerate(row_data, start=1):  # 열은 1부터 시작 (A=1, B=2, ...)
+            cell = sheet.cell(row=DATA_START_ROW + chunk_idx, column=col_idx)
+            # B열(판매가K), C열(업로드용마진)의 셀 형식을 숫자로 변경
+            if col_idx in NUMBER_FORMATS:
+                cell.number_format = NUMBER_FORMATS[col_idx]
+            cell.value = value
+
+    # d. 변경사항 저장
+    workbook.save(output_path)
+
+def open_chunk_writer(template_path):
+    """양식 파일을 한 번 읽어 둔 작성기를 만듭니다 (직접 쓸 수 없는 양식이면 None)."""
+    try:
+        return TemplateChunkWriter(template_path, start_row=DATA_START_ROW, number_formats=NUMBER_FORMATS)
+    except (TemplateFormatError, OSError, zipfile.BadZipFile):
+        return None
+
+def write_chunk_file(chunk_writer, output_path, rows, template_path=None):
+    """데이터 조각 하나를 분할 파일로 저장합니다."""
+    if chunk_writer:
+        chunk_writer.write(output_path, rows)
+    else:
+        write_chunk_with_openpyxl(output_path, rows, template_path)
+
+# 프로세스 풀 워커마다 한 번 만들어 두는 작성기
+_worker_chunk_writer = None
+_worker_template_path = None
+
+def _init_chunk_worker(template_path):
+    global _worker_chunk_writer, _worker_template_path
+    _worker_template_path = template_path
+    _worker_chunk_writer = open_chunk_writer(template_path)
+
+def _write_chunk_job(output_path, rows):
+    """워커 프로세스에서 분할 파일 하나를 저장하고 오류 메시지(성공 시 None)를 반환합니다."""
+    try:
+        write_chunk_file(_worker_chunk_writer, output_path, rows, _worker_template_path)
+        return None
+    except Exception as e:
+        return str(e)
+
+def generate_chunk_files(jobs, num_files, workers=1):
+    """
+    (파일 번호, 출력 경로, 행 목록) 작업들을 분할 파일로 저장하고
+    (성공 수, 실패한 파일 번호 목록)을 반환합니다.
+
+    jobs는 지연 생성되는 이터러블이어도 되며, num_files는 진행 표시용
+    예상 파일 수입니다 (모르면 None).
+
+    workers가 2 이상이면 프로세스 풀에서 동시에 생성합니다. 동시에 제출해 두는
+    작업은 워커 수의 2배로 제한하며, 결과는 파일 번호 순서대로 출력합니다.
+    """
+    counts = {'success': 0, 'failed': []}
+    total_label = num_files or '?'
+
+    def report(file_num, output_path, row_count, error):
+        output_filename = os.path.basename(output_path)
+        if error is None:
+            print(f"[{file_num}/{total_label}] '{output_filename}' ✓ 완료 ({row_count}개 행)")
+            counts['success'] += 1
+        else:
+            print(f"[{file_num}/{total_label}] '{output_filename}' ❌ 실패 (데이터 저장 오류: {error})")
+            counts['failed'].append(file_num)
+
+    if workers <= 1 or num_files == 1:
+        # 양식 파일은 한 번만 읽고, 파일마다 데이터 시트 XML만 새로 작성
+        chunk_writer = open_chunk_writer(template_file)
+        if chunk_writer is None:
+            print(f"⚠️  양식 파일을 직접 쓸 수 없어 openpyxl 방식으로 생성합니다.\n")
+        for file_num, output_path, rows in jobs:
+            try:
+                write_chunk_file(chunk_writer, output_path, rows)
+                report(file_num, output_path, len(rows), None)
+            except Exception as e:
+                report(file_num, output_path, len(rows), e)
+        return counts['success'], counts['failed']
+
+    workers = min(workers, num_files or workers)
+    print(f"⚙️  {workers}개 프로세스로 동시에 생성합니다.\n")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_chunk_worker,
+                             initargs=(template_file,)) as executor:
+        pending = deque()
+        for file_num, output_path, rows in jobs:
+            pending.append((file_num, output_path, len(rows), executor.submit(_write_chunk_job, output_path, rows)))
+            # 제출해 둔 작업이 많으면 가장 먼저 제출한 작업이 끝날 때까지 대기
+            while len(pending) >= workers * 2:
+                file_num, output_path, row_count, future = pending.popleft()
+                report(file_num, output_path, row_count, future.result())
+        while pending:
+            file_num, output_path, row_count, future = pending.popleft()
+            report(file_num, output_path, row_count, future.result())
+    return counts['success'], counts['failed']
+
+def manifest_signature():
+    """분할 결과를 좌우하는 설정 (바뀌면 모든 분할 파일을 다시 만듦)"""
+    return {
+        'template': hash_file(template_file),
+        'chunkSize': chunk_size,
+        'sourceColumns': list(SOURCE_COLUMNS),
+        'dataStartRow': DATA_START_ROW,
+        'numberFormats': {str(col): fmt for col, fmt in NUMBER_FORMATS.items()}
+    }
+
+def write_changed_list(paths):
+    """새로 생기거나 바뀐 분할 파일 경로를 한 줄에 하나씩 저장합니다."""
+    tmp_path = CHANGED_LIST_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for path in paths:
+            f.write(f"{os.path.abspath(path)}\n")
+    os.replace(tmp_path, CHANGED_LIST_FILE)
+
+def open_source_sheet():
+    """
+    원본 데이터 파일을 읽기 전용 모드로 열고 열 구조를 확인합니다.
+
+    (워크북, 시트)를 반환하며, 문제가 있으면 안내를 출력하고 (None, None)을 반환합니다.
+    전체를 한 번에 읽지 않으므로 시트는 iter_source_chunks로 한 행씩 읽습니다.
     """
-    # 0. 필수 파일 및 폴더 존재 여부 확인
     if not os.path.exists(source_file):
         print(f"❌ 오류: 원본 데이터 파일을 찾을 수 없습니다.")
         print(f"   경로: {source_file}")
@@ -85,140 +281,175 @@ def process_and_split_files():
         print(f"   1. 파일이 해당 경로에 있는지 확인하세요.")
         print(f"   2. .env 파일에서 CJ_SOURCE_FILE 경로를 확인하세요.")
         print(f"   3. 또는 이 스크립트의 source_file 변수를 직접 수정하세요.")
-        return
-    
-    if not os.path.exists(template_file):
-        print(f"❌ 오류: 양식 파일을 찾을 수 없습니다.")
-        print(f"   경로: {template_file}")
-        print(f"\n💡 해결 방법:")
-        print(f"   1. 파일이 해당 경로에 있는지 확인하세요.")
-        print(f"   2. .env 파일에서 CJ_TEMPLATE_FILE 경로를 확인하세요.")
-        print(f"   3. 또는 이 스크립트의 template_file 변수를 직접 수정하세요.")
-        return
-    
-    # 출력 폴더가 없으면 생성
-    os.makedirs(output_dir, exist_ok=True)
-    print(f"✓ 출력 폴더 준비 완료: '{output_dir}'\n")
+        return None, None
 
-    # 1. 원본 데이터 파일 읽기 (A2행을 헤더로, A3부터 데이터 시작)
+    # 원본 데이터 파일 열기 (A2행을 헤더로, A3부터 데이터 시작)
     try:
-        print("📖 원본 데이터 파일을 읽는 중입니다...")
-        source_df = pd.read_excel(source_file, header=1)  # A2행을 헤더로, A3부터 데이터
+        print("📖 원본 데이터 파일을 여는 중입니다...")
+        source_workbook = openpyxl.load_workbook(source_file, read_only=True, data_only=True)
+        source_sheet = source_workbook.active
+        header = next(source_sheet.iter_rows(min_row=SOURCE_HEADER_ROW, max_row=SOURCE_HEADER_ROW, values_only=True), ())
         # 열 이름이 문자열인 경우에만 공백 제거
-        source_df.columns = [str(col).strip() if isinstance(col, str) else str(col) for col in source_df.columns]
-        print(f"✓ 파일 읽기 완료 (총 {len(source_df)}개 행)\n")
+        header = [str(col).strip() if isinstance(col, str) else str(col) for col in header]
     except Exception as e:
         print(f"❌ 오류: 원본 데이터 파일을 읽는 중 문제가 발생했습니다.")
         print(f"   상세 오류: {e}")
         print(f"\n💡 해결 방법:")
         print(f"   1. 파일이 손상되지 않았는지 확인하세요.")
         print(f"   2. 엑셀 파일이 다른 프로그램에서 열려있지 않은지 확인하세요.")
-        print(f"   3. pandas와 openpyxl 라이브러리가 설치되어 있는지 확인하세요.")
-        return
-
-    # 2. 새로운 양식에 맞게 데이터 가공 및 재구성
-    print("🔄 데이터를 새로운 양식에 맞게 가공합니다...")
-    # 출력될 데이터프레임 생성
-    output_df = pd.DataFrame()
+        print(f"   3. openpyxl 라이브러리가 설치되어 있는지 확인하세요.")
+        return None, None
 
-    # 열 매핑 및 데이터 할당 (양식 구조에 맞춰 수정)
-    try:
-        # 원본 데이터를 양식 구조에 맞게 매핑
-        # 원본: 0:B.상품코드, 1:판매가K, 2:CJ상품코드, 3:외부할인, 4:할인판매가, 5:공급가, 6:등록할인율, 7:종료일
-        output_df['CJ상품코드'] = source_df.iloc[:, 2]      # 원본 C열 → 양식 A5열
-        output_df['판매가K'] = source_df.iloc[:, 1]         # 원본 B열 → 양식 B5열  
-        output_df['업로드용마진'] = source_df.iloc[:, 4]    # 원본 E열 → 양식 C3열 (10 → 10)
-        
-        print(f"✓ 데이터 가공 완료 (총 {len(output_df)}개 행)\n")
-    except Exception as e:
+    # 새로운 양식에 맞게 열 매핑 확인
+    if len(header) <= max(SOURCE_COLUMNS):
+        source_workbook.close()
         print(f"❌ 오류: 데이터 가공 중 문제가 발생했습니다.")
-        print(f"   상세 오류: {e}")
+        print(f"   상세 오류: 원본 파일의 열이 {len(header)}개뿐입니다 (최소 {max(SOURCE_COLUMNS) + 1}개 필요).")
         print(f"\n사용 가능한 열 정보:")
-        for i, col in enumerate(source_df.columns):
+        for i, col in enumerate(header):
             print(f"  {i}: '{col}'")
         print(f"\n💡 해결 방법:")
         print(f"   원본 파일의 열 구조가 예상과 다를 수 있습니다.")
         print(f"   위의 열 정보를 확인하고 스크립트를 수정해야 할 수 있습니다.")
+        return None, None
+
+    return source_workbook, source_sheet
+
+def check_template_file():
+    """양식 파일이 있는지 확인합니다 (없으면 안내를 출력하고 False)."""
+    if os.path.exists(template_file):
+        return True
+    print(f"❌ 오류: 양식 파일을 찾을 수 없습니다.")
+    print(f"   경로: {template_file}")
+    print(f"\n💡 해결 방법:")
+    print(f"   1. 파일이 해당 경로에 있는지 확인하세요.")
+    print(f"   2. .env 파일에서 CJ_TEMPLATE_FILE 경로를 확인하세요.")
+    print(f"   3. 또는 이 스크립트의 template_file 변수를 직접 수정하세요.")
+    return False
+
+def process_and_split_files(changed_only=CHANGED_ONLY):
+    """
+    원본 엑셀 데이터를 읽고 가공한 후, 양식 파일에 맞춰
+    정해진 개수만큼 나누어 새로운 엑셀 파일들로 저장합니다.
+
+    changed_only이면 매니페스트의 내용 해시가 같은 분할 파일은 다시 만들지 않습니다.
+    어느 모드든 새로 생기거나 바뀐 파일 목록을 CHANGED_LIST_FILE에 저장합니다.
+    """
+    # 0. 필수 파일 및 폴더 존재 여부 확인
+    if not check_template_file():
         return
 
-    total_rows = len(output_df)
-    if total_rows == 0:
-        print("⚠️  가공할 데이터가 없습니다. 작업을 종료합니다.")
+    # 출력 폴더가 없으면 생성
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"✓ 출력 폴더 준비 완료: '{output_dir}'\n")
+
+    # 1~2. 원본 데이터 파일 열기 및 열 구조 확인
+    #      전체를 한 번에 읽지 않고 읽기 전용 모드로 한 행씩 읽어 필요한 열만 꺼냄
+    source_workbook, source_sheet = open_source_sheet()
+    if source_workbook is None:
         return
 
-    # 3. 가공된 데이터를 정해진 크기로 나누어 파일로 저장
-    num_files = math.ceil(total_rows / chunk_size)
-    print(f"📦 총 {total_rows}개의 데이터를 {chunk_size}개씩 나누어 {num_files}개의 파일을 생성합니다.\n")
-
-    # 오늘 날짜를 YYYY-MM-DD 형식으로 가져오기
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    success_count = 0
-    fail_count = 0
-    
-    for i in range(num_files):
-        # 파일 이름에 붙일 번호 계산 (1부터 시작).
-        file_num = i + 1
-        output_filename = f"{today}_{file_num}.xlsx"
-        output_path = os.path.join(output_dir, output_filename)
-
-        print(f"[{file_num}/{num_files}] '{output_filename}' 파일 생성 중...", end=" ")
-
-        # a. 양식 파일을 새 출력 파일로 복사 (서식 유지를 위함)
-        try:
-            shutil.copy(template_file, output_path)
-        except Exception as e:
-            print(f"❌ 실패 (템플릿 복사 오류: {e})")
-            fail_count += 1
+    try:
+        chunks = iter_source_chunks(source_sheet, chunk_size)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            print("⚠️  가공할 데이터가 없습니다. 작업을 종료합니다.")
+            return
+
+        # 3. 읽는 대로 정해진 크기로 나누어 파일로 저장
+        #    (전체 행 수는 시트 크기 정보로 추정, 정보가 없으면 '?'로 표시)
+        estimated_rows = source_sheet.max_row - SOURCE_HEADER_ROW if source_sheet.max_row else None
+        num_files = math.ceil(estimated_rows / chunk_size) if estimated_rows else None
+        if num_files:
+            print(f"📦 약 {estimated_rows}개의 데이터를 {chunk_size}개씩 나누어 {num_files}개의 파일을 생성합니다. (읽는 대로 바로 저장)\n")
+        else:
+            print(f"📦 데이터를 {chunk_size}개씩 나누어 파일을 생성합니다. (읽는 대로 바로 저장)\n")
+
+        # 오늘 날짜를 YYYY-MM-DD 형식으로 가져오기
+        today = datetime.now().strftime("%Y-%m-%d")
+        row_counts = []
+        manifest = ChunkManifest(MANIFEST_FILE, manifest_signature())
+        if changed_only:
+            print(f"🔎 변경분 모드: 이전 실행과 내용이 같은 파일은 다시 만들지 않습니다. ({MANIFEST_FILE})\n")
+        # 이번에 저장할 파일의 매니페스트 기록 (저장에 성공한 파일만 반영)
+        written = {}
+        unchanged_count = 0
+
+        def chunk_jobs():
+            nonlocal unchanged_count
+            for file_num, (start_row, end_row, rows) in enumerate(itertools.chain([first_chunk], chunks), start=1):
+                row_counts.append(len(rows))
+                content_hash = hash_rows(rows)
+                status = manifest.status(file_num, content_hash)
+                if changed_only and status == 'unchanged':
+                    # 내용이 같으면 이전 파일(이전 날짜 이름)을 그대로 사용
+                    manifest.keep_previous(file_num)
+                    unchanged_count += 1
+                    print(f"[{file_num}/{num_files or '?'}] '{manifest.previous_file_name(file_num)}' ⏩ 변경 없음")
+                    continue
+                # 파일 이름에 붙일 번호는 1부터 시작
+                output_filename = f"{today}_{file_num}.xlsx"
+                written[file_num] = (status, output_filename, start_row, end_row, len(rows), content_hash)
+                yield file_num, os.path.join(output_dir, output_filename), rows
+
+        success_count, failed_files = generate_chunk_files(chunk_jobs(), num_files, split_workers)
+    finally:
+        source_workbook.close()
+
+    print(f"\n✓ 원본 읽기 및 가공 완료 (총 {sum(row_counts)}개 행)")
+
+    # 4. 매니페스트와 변경 파일 목록 저장
+    changed_paths = []
+    for file_num, (status, output_filename, start_row, end_row, row_count, content_hash) in sorted(written.items()):
+        if file_num in failed_files:
+            # 다음 실행에서 다시 만들도록 이전 기록을 유지
+            manifest.keep_previous(file_num)
             continue
+        previous_filename = manifest.previous_file_name(file_num)
+        if changed_only and previous_filename and previous_filename != output_filename:
+            # 바뀐 파일의 이전 날짜 파일은 업로드 폴더에 남지 않도록 삭제
+            previous_path = os.path.join(output_dir, previous_filename)
+            if os.path.exists(previous_path):
+                os.remove(previous_path)
+        manifest.record(file_num, output_filename, start_row, end_row, row_count, content_hash)
+        if status != 'unchanged':
+            changed_paths.append(os.path.join(output_dir, output_filename))
 
-        # b. 현재 처리할 데이터 조각(chunk) 선택
-        start_index = i * chunk_size
-        end_index = start_index + chunk_size
-        chunk = output_df.iloc[start_index:end_index]
-
-        try:
-            # c. 복사된 엑셀 파일을 열고 데이터 추가
-            workbook = openpyxl.load_workbook(output_path)
-            sheet = workbook.active
-
-            # d. 데이터프레임의 각 행을 엑셀 시트에 추가 (A5부터 시작)
-            start_row = 5  # A5부터 시작
-            for chunk_idx, (_, row) in enumerate(chunk.iterrows()):
-                row_data = list(row)
-                for col_idx, value in enumerate(row_data, start=1):  # 열은 1부터 시작 (A=1, B=2, ...)
-                    cell = sheet.cell(row=start_row + chunk_idx, column=col_idx)
-                    # B열의 셀 형식을 숫자로 변경
-                    if col_idx == 2:  # B=2 (판매가K)
-                        cell.number_format = '#,##0'  # 천 단위 구분자 포함
-                    # C열의 셀 형식을 숫자로 변경
-                    elif col_idx == 3:  # C=3 (업로드용마진)
-                        cell.number_format = '0'  # 숫자 형식
-                    cell.value = value
-
-            # e. 변경사항 저장
-            workbook.save(output_path)
-            print(f"✓ 완료 ({len(chunk)}개 행)")
-            success_count += 1
-
-        except Exception as e:
-            print(f"❌ 실패 (데이터 저장 오류: {e})")
-            fail_count += 1
+    # 원본 행이 줄어 더 이상 생성되지 않는 분할 파일
+    removed_files = manifest.removed_file_names()
+    if changed_only:
+        for filename in removed_files:
+            removed_path = os.path.join(output_dir, filename)
+            if os.path.exists(removed_path):
+                os.remove(removed_path)
+
+    manifest.save()
+    write_changed_list(changed_paths)
 
     # 최종 결과 출력
     print("\n" + "="*60)
     print("작업 완료!")
     print("="*60)
     print(f"✓ 성공: {success_count}개 파일")
-    if fail_count > 0:
-        print(f"❌ 실패: {fail_count}개 파일")
+    if failed_files:
+        print(f"❌ 실패: {len(failed_files)}개 파일")
+    if changed_only:
+        print(f"⏩ 변경 없음: {unchanged_count}개 파일")
+        if removed_files:
+            print(f"🗑️  삭제: {len(removed_files)}개 파일 (원본에서 사라진 분할 파일)")
+    print(f"📝 새로 생기거나 바뀐 파일: {len(changed_paths)}개 ({CHANGED_LIST_FILE})")
     print(f"📂 저장 위치: {output_dir}")
     print("="*60)
 
 # 스크립트 실행
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CJ 할인 데이터 분할 프로그램")
+    parser.add_argument("--changed-only", action="store_true", default=CHANGED_ONLY,
+                        help="이전 실행과 내용이 같은 분할 파일은 다시 만들지 않고, 새로 생기거나 바뀐 파일만 만듭니다.")
+    args = parser.parse_args()
+
     try:
-        process_and_split_files()
+        process_and_split_files(changed_only=args.changed_only)
     except KeyboardInterrupt:
         print("\n\n⚠️  사용자에 의해 작업이 중단되었습니다.")
     except Exception as e:
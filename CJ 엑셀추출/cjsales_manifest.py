@@ -0,0 +1,98 @@
+"""
+CJ 할인 분할 파일 매니페스트
+
+분할 파일마다 원본 행 범위와 데이터 내용 해시를 JSON 파일에 기록합니다.
+다음 실행에서 내용 해시가 같은 분할 파일은 다시 만들지 않고, 새로 생기거나
+내용이 바뀐 파일만 다시 만들어 목록으로 남길 수 있습니다.
+"""
+
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+
+def hash_rows(rows):
+    """분할 파일 하나에 들어갈 행들의 내용 해시"""
+    payload = json.dumps(rows, ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def hash_file(path):
+    """파일 내용 해시 (양식 파일이 바뀌었는지 확인용)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ChunkManifest:
+    """
+    분할 파일별 (파일명, 원본 행 범위, 행 수, 내용 해시) 기록
+
+    signature(양식 파일 해시, 분할 크기 등)가 이전 실행과 다르면 모든 분할
+    파일이 바뀐 것으로 봅니다.
+    """
+
+    def __init__(self, path, signature):
+        self.path = path
+        self.signature = signature
+        self.previous = {}
+        self.chunks = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get('version') == MANIFEST_VERSION and data.get('signature') == signature:
+                self.previous = {int(number): entry for number, entry in data.get('chunks', {}).items()}
+
+    def status(self, file_num, content_hash):
+        """
+        분할 파일의 상태를 반환합니다.
+
+        'new': 이전 기록이 없거나 파일이 없음, 'dirty': 내용이 바뀜, 'unchanged': 그대로
+        """
+        previous = self.previous.get(file_num)
+        if not previous or not os.path.exists(os.path.join(os.path.dirname(self.path), previous['fileName'])):
+            return 'new'
+        if previous['hash'] != content_hash:
+            return 'dirty'
+        return 'unchanged'
+
+    def previous_file_name(self, file_num):
+        previous = self.previous.get(file_num)
+        return previous['fileName'] if previous else None
+
+    def record(self, file_num, file_name, start_row, end_row, row_count, content_hash):
+        self.chunks[file_num] = {
+            'fileName': file_name,
+            'startRow': start_row,
+            'endRow': end_row,
+            'rowCount': row_count,
+            'hash': content_hash
+        }
+
+    def keep_previous(self, file_num):
+        """이번 실행에서 다시 만들지 않은(또는 만들지 못한) 파일의 이전 기록을 유지합니다."""
+        if file_num in self.previous:
+            self.chunks[file_num] = self.previous[file_num]
+
+    def removed_file_names(self):
+        """이전 실행에는 있었지만 이번 원본에는 없는 분할 파일 이름"""
+        return [entry['fileName'] for number, entry in sorted(self.previous.items()) if number not in self.chunks]
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 매니페스트가 깨지지 않게 저장합니다."""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': MANIFEST_VERSION,
+                'signature': self.signature,
+                'chunks': {str(number): entry for number, entry in sorted(self.chunks.items())}
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -19,3 +19,9 @@ CJ_OUTPUT_DIR = "output/cj_discount"
 
 # 한 파일에 들어갈 데이터 행의 개수
 CJ_CHUNK_SIZE = 500
+
+# 분할 파일을 동시에 생성할 프로세스 수 (1이면 하나씩 생성)
+CJ_SPLIT_WORKERS = 4
+
+# 내용이 바뀐 분할 파일만 다시 만들기 (--changed-only와 같음)
+CJ_CHANGED_ONLY = False
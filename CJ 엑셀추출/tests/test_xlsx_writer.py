@@ -0,0 +1,42 @@
+"""양식 기반 xlsx 작성기가 데이터 영역의 양식 셀을 유지하는지 확인합니다."""
+
+import sys
+from pathlib import Path
+
+import openpyxl
+from openpyxl.styles import PatternFill
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cjsales_xlsx_writer import TemplateChunkWriter
+
+
+def _make_template(path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet['A4'] = '상품코드'
+    sheet['B4'] = '판매가K'
+    sheet['C4'] = '업로드용마진'
+    sheet['D4'] = '확인'
+    sheet['D5'] = '=B5*2'
+    sheet['E5'].fill = PatternFill('solid', fgColor='FFFF00')
+    sheet['D6'] = '=B6*2'
+    sheet['A8'] = '합계'
+    workbook.save(path)
+
+
+def test_data_rows_keep_template_cells_past_written_columns(tmp_path):
+    template_path = tmp_path / 'template.xlsx'
+    output_path = tmp_path / 'chunk.xlsx'
+    _make_template(template_path)
+
+    writer = TemplateChunkWriter(str(template_path), start_row=5, number_formats={2: '#,##0'})
+    writer.write(str(output_path), [('1001', 10000, 10), ('1002', 20000, None)])
+
+    sheet = openpyxl.load_workbook(output_path).active
+    assert [cell.value for cell in sheet[5][:4]] == ['1001', 10000, 10, '=B5*2']
+    assert [cell.value for cell in sheet[6][:4]] == ['1002', 20000, None, '=B6*2']
+    assert sheet['E5'].fill.fgColor.rgb == '00FFFF00'
+    assert sheet['B6'].number_format == '#,##0'
+    assert sheet['A8'].value == '합계'
+    assert sheet['D4'].value == '확인'
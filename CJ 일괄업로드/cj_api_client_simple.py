@@ -5,6 +5,10 @@ CJ API 클라이언트 (간소화 버전)
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
+from urllib3.util.retry import Retry
+from http.client import RemoteDisconnected
 import json
 import os
 from datetime import datetime, timedelta
@@ -17,10 +21,33 @@ try:
 except ImportError:
     pass
 
+class StaleConnectionRetry(Retry):
+    """
+    연결 실패에 더해, 재사용한 keep-alive 연결이 응답 없이 끊긴 경우도 다시 보내는 Retry
+
+    서버가 유휴 연결을 닫는 순간 그 연결로 요청을 보내면 응답을 한 바이트도 받지 못한 채
+    RemoteDisconnected(또는 전송 중 BrokenPipeError)가 납니다. urllib3는 이를 read 오류로
+    분류하지만, 응답이 시작되지 않았으므로 연결 실패와 같이 connect 횟수로 재시도합니다.
+    (같은 가격을 다시 설정하는 요청이라 중복 전송되어도 결과는 같습니다.)
+    """
+
+    def _is_connection_error(self, err: Exception) -> bool:
+        if isinstance(err, ProtocolError) and any(
+            isinstance(arg, (RemoteDisconnected, BrokenPipeError)) for arg in err.args
+        ):
+            return True
+        return super()._is_connection_error(err)
+
+
 class CJAPIClient:
-    """CJ 오쇼핑 API 클라이언트"""
+    """
+    CJ 오쇼핑 API 클라이언트
+
+    하나의 requests.Session을 연결 풀과 함께 소유하므로 여러 스레드에서
+    같은 인스턴스를 공유해도 됩니다 (TCP/TLS 연결을 재사용).
+    """
     
-    def __init__(self):
+    def __init__(self, pool_size: int = None, max_retries: int = None):
         # 환경변수에서 설정 로드
         self.vendor_code = os.getenv('CJ_VENDOR_CODE', '456988')
         self.auth_key = os.getenv('CJ_AUTH_KEY', '')
@@ -36,11 +63,54 @@ class CJAPIClient:
         if os.getenv('HTTPS_PROXY'):
             self.proxies['https'] = os.getenv('HTTPS_PROXY')
         
+        # 연결 풀 크기 (동시 요청 워커 수 이상으로 설정)
+        self.pool_size = pool_size or int(os.getenv('CJ_HTTP_POOL_SIZE', '10'))
+        # 연결 실패/응답 없이 끊긴 연결의 전송 계층 재시도 횟수
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('CJ_HTTP_RETRIES', '3'))
+        self.session = self._create_session()
+        
+        # False이면 요청마다 호출 메시지를 출력하지 않음
+        self.verbose = True
+        
         # API 인증 키 확인
         if not self.auth_key:
             print("⚠️  경고: CJ_AUTH_KEY 환경변수가 설정되지 않았습니다.")
             print("   .env 파일에 CJ_AUTH_KEY를 설정하거나 환경변수를 설정하세요.")
     
+    def _create_session(self) -> requests.Session:
+        """keep-alive 연결 풀과 재시도 어댑터가 설정된 세션 생성"""
+        # 연결 실패와 응답 없이 끊긴 keep-alive 연결만 재시도 (HTTP 상태 코드 기반 재시도는 하지 않음)
+        # 응답 대기 중 시간 초과나 응답을 받는 도중의 끊김(read)은 다시 보내지 않고,
+        # 업로더의 재시도 대기열과 적응형 조절에서 처리하도록 그대로 반환
+        retry = StaleConnectionRetry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=0,
+            status=0,
+            allowed_methods=frozenset(['POST']),
+            backoff_factor=0.5,
+            raise_on_status=False
+        )
+        # pool_block=True: 풀이 가득 차면 연결을 새로 만들고 버리는 대신 반환될 때까지 대기
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=retry,
+            pool_block=True
+        )
+        
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self.get_headers())
+        if self.proxies:
+            session.proxies.update(self.proxies)
+        return session
+    
+    def close(self):
+        """연결 풀 정리"""
+        self.session.close()
+    
     def get_headers(self) -> Dict:
         """API 요청 헤더 생성"""
         return {
@@ -88,15 +158,14 @@ class CJAPIClient:
         
         try:
             # 프록시 사용 여부 출력
-            proxy_status = "사용" if self.proxies else "미사용"
-            print(f"CJ API 호출 중... (프록시: {proxy_status})")
+            if self.verbose:
+                proxy_status = "사용" if self.proxies else "미사용"
+                print(f"CJ API 호출 중... (프록시: {proxy_status})")
             
-            # API 호출
-            response = requests.post(
+            # API 호출 (세션의 keep-alive 연결 재사용)
+            response = self.session.post(
                 self.api_url,
-                headers=self.get_headers(),
                 json=request_data,
-                proxies=self.proxies if self.proxies else None,
                 timeout=30
             )
             
@@ -124,6 +193,12 @@ class CJAPIClient:
                     "error": response.text
                 }
                 
+        except requests.exceptions.Timeout as e:
+            return {
+                "success": False,
+                "error": f"요청 시간 초과: {e}",
+                "timeout": True
+            }
         except requests.exceptions.ProxyError as e:
             return {
                 "success": False,
@@ -150,4 +225,5 @@ if __name__ == "__main__":
     print(f"API URL: {client.api_url}")
     print(f"Vendor Code: {client.vendor_code}")
     print(f"프록시 설정: {client.proxies if client.proxies else '없음'}")
+    print(f"연결 풀 크기: {client.pool_size}, 재시도: {client.max_retries}회")
     print("=" * 60)
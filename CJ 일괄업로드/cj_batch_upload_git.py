@@ -10,7 +10,13 @@ import os
 import sys
 import pandas as pd
 import glob
-from datetime import datetime
+import time
+import argparse
+import math
+import itertools
+import queue
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # 환경변수 로드 (선택사항)
@@ -25,6 +31,14 @@ except:
 
 # 간소화된 CJ API 클라이언트 import
 from cj_api_client_simple import CJAPIClient
+from cj_upload_engine import ConcurrentUploader, AIMDController, RetryQueue, is_retriable_failure
+from cj_upload_journal import UploadJournal, PriceSnapshot, filter_already_applied, price_key, applied_price
+from cj_upload_report import ResultReportWriter, summarize_report, write_report_workbook_from_csv
+from cj_products import CJUploadResult, products_from_frame, records_to_frame
+from cj_excel_loader import (
+    read_file_list, list_cj_excel_files, iter_parsed_cj_excel_files, concat_product_frames,
+    parse_cj_excel_file_cached, coalesce_products, ParsedWorkbookCache
+)
 
 # --- 사용자 설정 부분 ---
 
@@ -43,22 +57,111 @@ REPORT_FOLDER = os.getenv(
     str(PROJECT_ROOT / "output" / "cj_upload_reports")
 )
 
-# 3. 배치 크기 (한 번에 처리할 상품 개수)
+# 3. 배치 크기 (진행 상황을 요약해서 출력할 상품 개수 단위)
 BATCH_SIZE = int(os.getenv("CJ_BATCH_SIZE", "50"))
 
+# 4. 요청당 상품 개수 (1이면 상품별 개별 요청, 2 이상이면 salePriceInformationList로 묶어서 요청)
+#    기본값(50개/워커 8개/초당 20회)의 근거는 README의 "기본 동시성/속도 설정" 참고
+#    보수적으로 실행하려면 CJ_ITEMS_PER_REQUEST=1, CJ_UPLOAD_WORKERS=1, CJ_RATE_LIMIT=5
+ITEMS_PER_REQUEST = int(os.getenv("CJ_ITEMS_PER_REQUEST", "50"))
+
+# 5. 동시 업로드 워커 수
+UPLOAD_WORKERS = int(os.getenv("CJ_UPLOAD_WORKERS", "8"))
+
+# 6. 초당 최대 요청 수 (0이면 제한 없음)
+RATE_LIMIT = float(os.getenv("CJ_RATE_LIMIT", "20"))
+
+# 7. 동시에 처리 중일 수 있는 최대 요청 수 (0이면 워커 수의 2배)
+MAX_IN_FLIGHT = int(os.getenv("CJ_MAX_IN_FLIGHT", "0"))
+
+# 8. 적응형 모드 (응답 지연/오류에 따라 초당 요청 수, 동시 요청 수, 요청당 상품 수 자동 조절)
+#    CJ_RATE_LIMIT, CJ_UPLOAD_WORKERS, CJ_ITEMS_PER_REQUEST가 각각의 상한이 됩니다.
+ADAPTIVE = os.getenv("CJ_ADAPTIVE", "0").lower() in ("1", "true", "yes")
+ADAPTIVE_P95_MS = float(os.getenv("CJ_ADAPTIVE_P95_MS", "1000"))
+ADAPTIVE_ERROR_RATE = float(os.getenv("CJ_ADAPTIVE_ERROR_RATE", "0.05"))
+
+# 9. 재시도 설정 (연결 오류, 429, 5xx, 일시적 오류 메시지만 재시도)
+MAX_RETRIES = int(os.getenv("CJ_MAX_RETRIES", "3"))
+RETRY_BASE_DELAY = float(os.getenv("CJ_RETRY_BASE_DELAY", "2"))
+RETRY_MAX_DELAY = float(os.getenv("CJ_RETRY_MAX_DELAY", "60"))
+# 재시도할 failList/returnMessage 문구 (쉼표로 구분)
+RETRIABLE_MESSAGES = tuple(
+    keyword.strip()
+    for keyword in os.getenv("CJ_RETRIABLE_MESSAGES", "잠시 후,일시적,처리 중,처리중,timeout,Timeout,TIMEOUT").split(",")
+    if keyword.strip()
+)
+
+# 10. 업로드 저널 파일 경로 (--resume 이어하기에 사용)
+JOURNAL_FILE = os.getenv(
+    "CJ_JOURNAL_FILE",
+    os.path.join(REPORT_FOLDER, "cj_upload_journal.jsonl")
+)
+
+# 11. 마지막 적용 가격 스냅샷 파일 경로 (--delta 변경분 모드에 사용)
+SNAPSHOT_FILE = os.getenv(
+    "CJ_SNAPSHOT_FILE",
+    os.path.join(REPORT_FOLDER, "cj_price_snapshot.json")
+)
+
+# 12. 엑셀 파일을 병렬로 읽을 프로세스 수 (기본값: CPU 코어 수)
+LOAD_WORKERS = int(os.getenv("CJ_LOAD_WORKERS", str(os.cpu_count() or 1)))
+
+# 13. 스트리밍 모드에서 읽기 단계와 업로드 단계 사이 대기열 크기 (상품 수)
+STREAM_QUEUE_SIZE = int(os.getenv("CJ_STREAM_QUEUE_SIZE", "1000"))
+
+# 14. 여러 파일에 같은 상품코드/적용일시가 있을 때 남길 행 기준 (적용일시가 다르면 모두 남김)
+#     file: 가장 최근에 수정된 파일, applyDate: 적용일시가 가장 늦은 행, none: 합치지 않음
+COALESCE = os.getenv("CJ_COALESCE", "file")
+
+# 15. 엑셀 파싱 결과 캐시 폴더 (빈 값이면 캐시 사용 안 함)
+#     파일 경로/수정 시각/내용 해시가 같으면 엑셀을 다시 읽지 않고 캐시를 사용
+PARSE_CACHE_DIR = os.getenv(
+    "CJ_PARSE_CACHE_DIR",
+    os.path.join(EXCEL_FOLDER, ".cj_parse_cache")
+)
+
 # --- 설정 정보 출력 ---
-print("\n" + "="*60)
-print("🛒 CJ 할인 데이터 일괄 업로드 도구")
-print("="*60)
-print(f"📁 엑셀 폴더: {EXCEL_FOLDER}")
-print(f"📂 리포트 폴더: {REPORT_FOLDER}")
-print(f"📦 배치 크기: {BATCH_SIZE}개/배치")
-print("="*60 + "\n")
+# (프로세스 풀 워커가 이 파일을 다시 import할 때는 출력하지 않음)
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("🛒 CJ 할인 데이터 일괄 업로드 도구")
+    print("="*60)
+    print(f"📁 엑셀 폴더: {EXCEL_FOLDER}")
+    print(f"📂 리포트 폴더: {REPORT_FOLDER}")
+    print(f"📦 배치 크기: {BATCH_SIZE}개/배치")
+    print(f"📨 요청당 상품: {ITEMS_PER_REQUEST}개/요청")
+    print(f"⚙️  동시 작업: {UPLOAD_WORKERS}개, 속도 제한: {RATE_LIMIT}회/초")
+    print("="*60 + "\n")
 
 # --- 코드 실행 부분 ---
 
-def load_cj_excel_files(folder_path):
-    """CJ할인설정 폴더의 모든 엑셀 파일을 로드합니다."""
+def open_parse_cache(cache_dir=PARSE_CACHE_DIR, folder_path=EXCEL_FOLDER):
+    """
+    엑셀 파싱 결과 캐시를 엽니다 (설정이 비어 있거나, 폴더를 만들 수 없거나, pyarrow가 없으면 None).
+
+    folder_path에 더 이상 없는 엑셀 파일의 캐시는 열 때 지웁니다.
+    """
+    if not cache_dir:
+        return None
+    try:
+        cache = ParsedWorkbookCache(cache_dir)
+        if folder_path and os.path.isdir(folder_path):
+            removed_count = cache.prune(list_cj_excel_files(folder_path))
+            if removed_count:
+                print(f"🧹 파싱 캐시 정리: 폴더에 없는 파일의 캐시 {removed_count}개 삭제")
+        return cache
+    except (OSError, ImportError) as e:
+        print(f"⚠️  파싱 캐시를 사용할 수 없습니다 ({e}). 엑셀 파일을 매번 읽습니다.")
+        return None
+
+def load_cj_excel_frame(folder_path, workers=LOAD_WORKERS, cache_dir=PARSE_CACHE_DIR, only_files=None):
+    """
+    CJ할인설정 폴더의 모든 엑셀 파일을 하나의 상품 DataFrame으로 로드합니다.
+
+    파일들은 프로세스 풀에서 병렬로 읽으며, 반환값은 (상품 DataFrame, 파일 요약)입니다.
+    cache_dir의 파싱 캐시가 유효한 파일은 엑셀을 다시 읽지 않습니다.
+    only_files가 주어지면 그 목록에 있는 파일만 읽습니다.
+    """
     print(f"📁 폴더 스캔: {folder_path}")
     
     if not os.path.exists(folder_path):
@@ -67,189 +170,476 @@ def load_cj_excel_files(folder_path):
         print(f"   1. 폴더가 존재하는지 확인하세요.")
         print(f"   2. .env 파일에서 CJ_EXCEL_FOLDER 경로를 확인하세요.")
         print(f"   3. 또는 이 스크립트의 EXCEL_FOLDER 변수를 직접 수정하세요.")
-        return [], []
+        return concat_product_frames([]), []
     
     # 엑셀 파일 목록 가져오기
-    excel_files = glob.glob(os.path.join(folder_path, "*.xlsx"))
-    excel_files.sort()  # 파일명 순으로 정렬
+    excel_files = list_cj_excel_files(folder_path, only_files)
     
-    print(f"📊 발견된 엑셀 파일: {len(excel_files)}개")
+    print(f"📊 발견된 엑셀 파일: {len(excel_files)}개 (병렬 로드: 최대 {workers}개 프로세스)")
     
-    all_products = []
+    frames = []
     file_summary = []
+    cache = open_parse_cache(cache_dir, folder_path)
+    cached_count = 0
+    
+    for i, (file_path, df, summary) in enumerate(iter_parsed_cj_excel_files(excel_files, workers, cache), 1):
+        file_name = os.path.basename(file_path)
+        if summary.pop('cached', False):
+            cached_count += 1
+            file_name += " (캐시)"
+        if 'error' in summary:
+            print(f"[{i}/{len(excel_files)}] {file_name}: ❌ 오류: {summary['error']}")
+            file_summary.append(summary)
+        elif summary['totalRows'] == 0:
+            print(f"[{i}/{len(excel_files)}] {file_name}: ⚠️  빈 파일입니다.")
+        elif summary['validProducts'] == 0:
+            print(f"[{i}/{len(excel_files)}] {file_name}: ⚠️  유효한 데이터가 없습니다.")
+        else:
+            print(f"[{i}/{len(excel_files)}] {file_name}: ✅ {summary['validProducts']}개 상품 로드 완료")
+            frames.append(df)
+            file_summary.append(summary)
+    
+    if cached_count:
+        print(f"⚡ 파싱 캐시 사용: {cached_count}/{len(excel_files)}개 파일 ({cache.cache_dir})")
+    
+    return concat_product_frames(frames), file_summary
+
+def load_cj_excel_files(folder_path, workers=LOAD_WORKERS, coalesce=COALESCE, only_files=None):
+    """
+    CJ할인설정 폴더의 모든 엑셀 파일을 상품(CJProduct) 목록으로 로드합니다.
+
+    여러 파일에 같은 (상품코드, 적용일시)가 있으면 coalesce 기준('file', 'applyDate', 'none')에
+    따라 하나만 남기며, 반환값은 (상품 목록, 파일 요약, 가격 충돌 DataFrame)입니다.
+    이미 지난 적용일시는 즉시 적용('')으로 바꿔서 반환합니다.
+    """
+    products_df, file_summary = load_cj_excel_frame(folder_path, workers, only_files=only_files)
     
-    for i, file_path in enumerate(excel_files, 1):
+    # 중복 상품코드 정리 (마지막 요청이 어차피 최종 가격이 되므로 미리 하나로 합침)
+    loaded_count = len(products_df)
+    products_df, conflicts = coalesce_products(products_df, coalesce, now_text=apply_now_text())
+    removed_count = loaded_count - len(products_df)
+    if removed_count:
+        avoided_calls = math.ceil(loaded_count / ITEMS_PER_REQUEST) - math.ceil(len(products_df) / ITEMS_PER_REQUEST)
+        print(f"\n🔁 중복 상품코드 정리 (기준: {coalesce}): {removed_count}개 행 제외, 절약된 API 호출: {avoided_calls}회")
+        if not conflicts.empty:
+            conflict_count = len(conflicts[['itemCode', 'applyDate']].drop_duplicates())
+            print(f"   ⚠️  가격 충돌: {conflict_count}개 상품/적용일시 (파일마다 판매가/수수료율이 다름, 리포트 참고)")
+    
+    all_products = products_from_frame(products_df)
+    del products_df
+    
+    # 샘플 데이터 표시 (처음 3개만)
+    if all_products:
+        print(f"\n📋 샘플 데이터:")
+        for j, product in enumerate(all_products[:3]):
+            print(f"  {j+1}. {product['itemCode']}: {product['salePrice']:,}원 (수수료율: {product.get('commissionRate', 'N/A')}%) - {product['fileName']}")
+        if len(all_products) > 3:
+            print(f"  ... 외 {len(all_products)-3}개")
+    
+    return all_products, file_summary, conflicts
+
+def stream_products(produce, queue_size=STREAM_QUEUE_SIZE, name="cj-product-reader"):
+    """
+    produce(put)를 리더 스레드에서 실행하고, put으로 넣은 상품을 하나씩 반환하는 스트림입니다.
+
+    상품은 크기가 제한된 대기열을 거치므로 읽기 단계가 업로드보다 빨라도
+    메모리 사용량이 일정하고, 다 읽기 전에 첫 요청이 나갑니다.
+    리더 스레드에서 발생한 예외는 스트림이 끝난 뒤 다시 발생시킵니다.
+    """
+    product_queue = queue.Queue(maxsize=max(1, queue_size))
+    end_of_stream = object()
+    reader_errors = []
+    
+    def reader():
         try:
-            print(f"\n[{i}/{len(excel_files)}] 처리 중: {os.path.basename(file_path)}")
-            
-            # 2행을 헤더로 읽기 (A3행부터 데이터)
-            df = pd.read_excel(file_path, header=2)
-            
-            # 빈 행 제거
-            df = df.dropna(how='all')
-            
-            if df.empty:
-                print(f"  ⚠️  빈 파일입니다.")
+            produce(product_queue.put)
+        except Exception as e:
+            reader_errors.append(e)
+        finally:
+            product_queue.put(end_of_stream)
+    
+    # 업로드가 중단되어도 프로세스 종료를 막지 않도록 데몬 스레드로 실행
+    threading.Thread(target=reader, name=name, daemon=True).start()
+    
+    while True:
+        product = product_queue.get()
+        if product is end_of_stream:
+            break
+        yield product
+    
+    if reader_errors:
+        raise reader_errors[0]
+
+def stream_cj_products(excel_files, file_summary, product_filter=None, queue_size=STREAM_QUEUE_SIZE):
+    """
+    엑셀 파일을 하나씩 읽어 상품을 하나씩 반환하는 스트림입니다.
+
+    리더 스레드가 파일 단위로 읽은 상품을 크기가 제한된 대기열에 넣고,
+    업로드 단계는 대기열에서 꺼내 쓰므로 전체 파일을 다 읽기 전에
+    첫 요청이 나가고 메모리 사용량도 파일 수와 무관하게 일정합니다.
+    product_filter(products) -> products로 파일별 상품을 걸러낼 수 있으며,
+    파일별 요약은 읽는 대로 file_summary에 추가됩니다.
+    """
+    cache = open_parse_cache()
+    
+    def produce(put):
+        for i, file_path in enumerate(excel_files, 1):
+            df, summary = parse_cj_excel_file_cached(file_path, cache)
+            file_name = os.path.basename(file_path)
+            if summary.pop('cached', False):
+                file_name += " (캐시)"
+            if 'error' in summary:
+                print(f"📄 [{i}/{len(excel_files)}] {file_name}: ❌ 오류: {summary['error']}")
+                file_summary.append(summary)
                 continue
-            
-            # 컬럼명 정리
-            df.columns = ['itemCode', 'salePrice', 'commissionRate', 'supplyPrice', 'applyDate', 'applyTime']
-            
-            # 숫자형으로 변환
-            df['itemCode'] = df['itemCode'].astype(str).str.replace('.0', '', regex=False)
-            df['salePrice'] = pd.to_numeric(df['salePrice'], errors='coerce')
-            df['commissionRate'] = pd.to_numeric(df['commissionRate'], errors='coerce')
-            df['supplyPrice'] = pd.to_numeric(df['supplyPrice'], errors='coerce')
-            
-            # 공급가가 없는 경우 수수료율로 계산
-            mask_no_supply_price = df['supplyPrice'].isna() | (df['supplyPrice'] == 0)
-            df.loc[mask_no_supply_price, 'supplyPrice'] = (
-                df.loc[mask_no_supply_price, 'salePrice'] * 
-                (100 - df.loc[mask_no_supply_price, 'commissionRate']) / 100
-            )
-            
-            # 디버깅: 엑셀에서 읽은 원본 데이터 확인
-            print(f"  🔍 엑셀 원본 데이터 확인:")
-            for idx, row in df.head(3).iterrows():
-                if not pd.isna(row['itemCode']):
-                    print(f"    상품 {row['itemCode']}: 판매가 {row['salePrice']:,}원, 공급가 {row['supplyPrice']:,}원, 수수료율 {row['commissionRate']}%")
-            
-            # NaN 값들을 0으로 대체 후 정수 변환
-            df['supplyPrice'] = df['supplyPrice'].fillna(0).astype(int)
-            
-            # 필요한 컬럼만 선택
-            df = df[['itemCode', 'salePrice', 'supplyPrice', 'commissionRate']].copy()
-            
-            # 유효한 데이터만 필터링
-            valid_df = df.dropna(subset=['itemCode', 'salePrice'])
-            
-            if valid_df.empty:
-                print(f"  ⚠️  유효한 데이터가 없습니다.")
+            if df is None or df.empty:
                 continue
             
-            # 상품 데이터 추가
-            file_products = []
-            for _, row in valid_df.iterrows():
-                product = {
-                    'itemCode': str(row['itemCode']),
-                    'salePrice': int(row['salePrice']),
-                    'commissionRate': row['commissionRate'] if not pd.isna(row['commissionRate']) else None,
-                    'applyDate': '',
-                    'fileName': os.path.basename(file_path)
-                }
-                file_products.append(product)
-                all_products.append(product)
-            
-            file_summary.append({
-                'fileName': os.path.basename(file_path),
-                'totalRows': len(df),
-                'validProducts': len(file_products)
-            })
-            
-            print(f"  ✅ {len(file_products)}개 상품 로드 완료")
-            
-            # 샘플 데이터 표시 (처음 3개만)
-            if file_products:
-                print(f"  📋 샘플 데이터:")
-                for j, product in enumerate(file_products[:3]):
-                    print(f"    {j+1}. {product['itemCode']}: {product['salePrice']:,}원 (수수료율: {product.get('commissionRate', 'N/A')}%)")
-                if len(file_products) > 3:
-                    print(f"    ... 외 {len(file_products)-3}개")
+            products = products_from_frame(df)
+            del df
+            if product_filter:
+                products = product_filter(products)
+            print(f"📄 [{i}/{len(excel_files)}] {file_name}: {len(products)}개 상품 대기열에 추가")
+            file_summary.append(summary)
             
-        except Exception as e:
-            print(f"  ❌ 오류: {e}")
-            file_summary.append({
-                'fileName': os.path.basename(file_path),
-                'totalRows': 0,
-                'validProducts': 0,
-                'error': str(e)
-            })
-    
-    return all_products, file_summary
-
-def batch_upload_to_cj(products, batch_size=50):
-    """상품들을 배치로 나누어 CJ API에 업로드합니다."""
+            for product in products:
+                put(product)
+    
+    return stream_products(produce, queue_size, name="cj-excel-reader")
+
+def map_batch_result(request_products, result):
+    """
+    여러 상품을 담은 API 응답을 상품별 결과로 매핑합니다.
+
+    요청 자체가 실패하면 모든 상품을 실패로 처리하고, 성공 응답이면
+    failList의 itemCode로 실패 상품을 찾아냅니다. itemCode가 없는
+    failList 항목은 어느 상품의 실패인지 알 수 없으므로 단건 요청이
+    아니면 요청 전체를 실패로 기록합니다 (성공으로 잘못 보고하지 않기 위함).
+    """
+    api_success = result.get('success', False)
+    api_data_response = result.get('data') or {}
+    status_code = result.get('status_code', 0)
+
+    item_errors = {}
+    if api_data_response.get('error', False):
+        # CJ API 응답에서 error 필드 확인
+        error_message = api_data_response.get('returnMessage', 'Unknown error')
+        item_errors = {p['itemCode']: error_message for p in request_products}
+    elif not api_success:
+        error_message = result.get('error', 'Unknown error')
+        item_errors = {p['itemCode']: error_message for p in request_products}
+    else:
+        # CJ API 응답에서 failList 확인
+        request_codes = {p['itemCode'] for p in request_products}
+        unmatched_messages = []
+        for fail in api_data_response.get('failList') or []:
+            fail_code = str(fail.get('itemCode', '')).strip()
+            fail_message = fail.get('errorMessage', 'Unknown error')
+            if fail_code in request_codes:
+                item_errors[fail_code] = fail_message
+            else:
+                unmatched_messages.append(fail_message)
+
+        if unmatched_messages:
+            if len(request_products) == 1:
+                item_errors[request_products[0]['itemCode']] = unmatched_messages[0]
+            else:
+                error_message = f"실패 상품 식별 불가: {unmatched_messages[0]}"
+                for p in request_products:
+                    item_errors.setdefault(p['itemCode'], error_message)
+
+    elapsed = round(result.get('elapsed', 0.0), 3)
+    return [
+        CJUploadResult(
+            product,
+            success=product['itemCode'] not in item_errors,
+            error=item_errors.get(product['itemCode'], ''),
+            statusCode=status_code,
+            elapsed=elapsed,
+            retriable=(
+                product['itemCode'] in item_errors
+                and is_retriable_failure(status_code, item_errors[product['itemCode']], RETRIABLE_MESSAGES)
+            )
+        )
+        for product in request_products
+    ]
+
+def apply_now_text():
+    """이 시각 이전의 적용일시는 즉시 적용으로 봅니다 (요청이 도착하기 전에 지나가지 않도록 10초 여유)."""
+    return (datetime.now() + timedelta(seconds=10)).strftime('%Y-%m-%d %H:%M:%S')
+
+def resolve_apply_date(product, now_text):
+    """지난 적용일시는 즉시 적용('')으로 바꿉니다. 바꿨으면 True를 반환합니다."""
+    apply_date = product.get('applyDate') or ''
+    if apply_date and apply_date <= now_text:
+        product['applyDate'] = ''
+        return True
+    return False
+
+def schedule_products(products):
+    """
+    상품들을 적용일시 순으로 묶어 정렬합니다.
+
+    적용일시가 같은 상품끼리 이어지도록 정렬해야 요청 하나에 최대한 많이
+    담을 수 있습니다. 적용일시가 없거나 이미 지난 상품은 즉시 적용('')으로
+    맨 앞에 둡니다. 반환값은 (정렬된 상품 목록, 적용일시별 상품 수)입니다.
+    """
+    now_text = apply_now_text()
+    slots = {}
+    for product in products:
+        resolve_apply_date(product, now_text)
+        slots.setdefault(product.get('applyDate') or '', []).append(product)
+    
+    ordered = [product for slot in sorted(slots) for product in slots[slot]]
+    return ordered, {slot: len(slots[slot]) for slot in sorted(slots)}
+
+def build_price_requests(products, items_per_request=1):
+    """
+    상품 목록(또는 스트림)을 요청 단위 (요청명, 상품 목록)로 나눕니다.
+
+    items_per_request에 함수를 주면 요청을 만들 때마다 호출해서 크기를 정합니다
+    (적응형 모드에서 요청당 상품 수가 바뀌는 경우). 적용일시(applyDate)가
+    다른 상품은 같은 요청에 담지 않습니다.
+    """
+    request_size = items_per_request if callable(items_per_request) else (lambda: items_per_request)
+    products = iter(products)
+    carry_over = None
+    while True:
+        size = max(1, request_size())
+        request_products = [carry_over] if carry_over is not None else []
+        carry_over = None
+        if len(request_products) < size:
+            for product in products:
+                # 적용일시가 바뀌면 다음 요청으로 넘김
+                if request_products and product.get('applyDate', '') != request_products[0].get('applyDate', ''):
+                    carry_over = product
+                    break
+                request_products.append(product)
+                if len(request_products) >= size:
+                    break
+        if not request_products:
+            return
+        first = request_products[0]
+        if len(request_products) == 1:
+            price_change_name = f"CJ일괄업로드-{first['fileName']}-{first['itemCode']}"
+        else:
+            price_change_name = f"CJ일괄업로드-{first['fileName']}-{first['itemCode']}외{len(request_products) - 1}건"
+        yield price_change_name, request_products
+
+def send_price_request(cj_client, job):
+    """요청 단위 하나를 CJ API로 전송합니다."""
+    price_change_name, request_products = job
+    
+    # CJ API 요청 데이터
+    api_data_list = [
+        {
+            'itemCode': product['itemCode'],
+            'salePrice': product['salePrice'],
+            'commissionRate': product.get('commissionRate', None),
+            # 비어 있으면 CJAPIClient가 현재 시간 + 10초로 설정
+            'applyDate': product.get('applyDate') or ''
+        }
+        for product in request_products
+    ]
+    
+    return cj_client.change_price(
+        price_change_name=price_change_name,
+        sale_price_info_list=api_data_list
+    )
+
+def batch_upload_to_cj(products, batch_size=50, items_per_request=ITEMS_PER_REQUEST,
+                       workers=UPLOAD_WORKERS, rate_limit=RATE_LIMIT, max_in_flight=MAX_IN_FLIGHT,
+                       journal=None, verbose=True, adaptive=ADAPTIVE, max_retries=MAX_RETRIES,
+                       report=None, collect_results=True):
+    """
+    상품들을 CJ API에 동시 업로드합니다.
+
+    items_per_request가 1이면 상품마다 개별 요청을 보내고, 2 이상이면
+    salePriceInformationList에 최대 items_per_request개 상품을 담아
+    한 번에 요청합니다. 요청은 workers개의 스레드로 동시에 전송되며
+    초당 rate_limit개 요청을 넘지 않습니다. batch_size개 상품마다
+    진행 상황을 요약해서 출력합니다. journal이 주어지면 상품별 최종 결과를
+    확정되는 즉시 기록합니다. report(ResultReportWriter)도 같은 방식으로
+    결과 CSV에 기록하며, collect_results가 False이면 결과를 메모리에
+    모아두지 않고 빈 리스트를 반환합니다 (리포트는 CSV로 생성).
+
+    products는 리스트뿐 아니라 스트리밍 모드의 지연 이터레이터여도 되며,
+    이 경우 전체 상품 수를 모르므로 진행 상황에 '?'로 표시합니다.
+    verbose가 False이면 요청별 출력 없이 진행 요약만 출력합니다.
+
+    adaptive가 True이면 rate_limit, workers, items_per_request를 상한으로 두고
+    과부하(429/5xx)에는 초당 요청 수와 동시 요청 수를, 요청 크기/검증 오류에는
+    요청당 상품 수를 줄였다가 응답이 안정되면 다시 늘립니다.
+
+    재시도 가능한 실패(연결 오류, 429, 5xx, 일시적 오류 메시지)는 재시도
+    대기열에 넣었다가 지수 백오프 후 다른 재시도 상품들과 묶어서 최대
+    max_retries번 다시 보냅니다. 결과의 attempts는 시도 횟수입니다.
+    """
+    items_per_request = max(1, items_per_request)
+    total = len(products) if hasattr(products, '__len__') else None
+    total_label = total if total is not None else '?'
     print(f"\n🚀 CJ API 일괄 업로드 시작")
-    print(f"📊 총 {len(products)}개 상품을 {batch_size}개씩 배치 처리")
+    print(f"📊 총 {total_label}개 상품 (요청당 최대 {items_per_request}개 상품)")
+    print(f"⚙️  동시 작업: {workers}개, 속도 제한: {rate_limit}회/초, 재시도: 최대 {max_retries}회")
     
-    cj_client = CJAPIClient()
+    # 연결 풀은 동시 요청 수 이상이어야 대기 없이 연결을 재사용할 수 있음
+    cj_client = CJAPIClient(pool_size=max(workers, int(os.getenv("CJ_HTTP_POOL_SIZE", "10"))))
+    cj_client.verbose = verbose
+    uploader = ConcurrentUploader(workers=workers, rate_limit=rate_limit, max_in_flight=max_in_flight)
+    controller = None
+    if adaptive:
+        controller = AIMDController(
+            max_concurrency=workers,
+            max_batch_size=items_per_request,
+            max_rate=rate_limit,
+            latency_threshold=ADAPTIVE_P95_MS / 1000,
+            error_threshold=ADAPTIVE_ERROR_RATE
+        )
+        print(f"📈 적응형 모드: p95 {ADAPTIVE_P95_MS}ms, 오류율 {ADAPTIVE_ERROR_RATE:.0%} 기준 ({controller.describe()})")
+    request_size = (lambda: controller.batch_size) if controller else items_per_request
+    retry_queue = RetryQueue(max_retries=max_retries, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY)
+    # 재시도 중인 상품의 시도 횟수 (id(product) → 횟수)
+    attempts = {}
     results = []
+    progress = {'done': 0, 'success': 0, 'next_summary': batch_size, 'decreases': 0, 'batch_decreases': 0}
+    started = time.monotonic()
     
-    # 배치로 나누기
-    for i in range(0, len(products), batch_size):
-        batch = products[i:i + batch_size]
-        batch_num = (i // batch_size) + 1
-        total_batches = (len(products) + batch_size - 1) // batch_size
+    def build_retry_requests(ready):
+        # 적용일시가 같은 상품끼리 묶이도록 정렬 후 요청 단위로 나눔
+        ready.sort(key=lambda p: p.get('applyDate') or '')
+        return build_price_requests(ready, request_size)
+    
+    def jobs_with_retries(jobs):
+        # 새 요청을 보내기 전에 대기 시간이 지난 재시도 상품이 있으면 먼저 보냄
+        for job in jobs:
+            ready = retry_queue.pop_ready()
+            if ready:
+                yield from build_retry_requests(ready)
+            yield job
+    
+    def handle_result(request_products, result):
+        # CJ API 응답에서 실제 성공/실패 확인
+        request_results = map_batch_result(request_products, result)
         
-        print(f"\n📦 배치 {batch_num}/{total_batches} 처리 중... ({len(batch)}개 상품)")
+        final_results = []
+        retried = 0
+        for product, r in zip(request_products, request_results):
+            r['attempts'] = attempts.pop(id(product), 0) + 1
+            if not r['success'] and r['retriable'] and retry_queue.schedule(product, r['attempts']):
+                attempts[id(product)] = r['attempts']
+                retried += 1
+                continue
+            final_results.append(r)
         
-        # 각 상품별로 개별 요청
-        batch_results = []
-        for j, product in enumerate(batch, 1):
-            print(f"  [{j}/{len(batch)}] {product['itemCode']} 처리 중...", end=" ")
-            
-            # CJ API 요청 데이터
-            api_data = {
-                'itemCode': product['itemCode'],
-                'salePrice': product['salePrice'],
-                'commissionRate': product.get('commissionRate', None),
-                'applyDate': ''
-            }
-            
-            result = cj_client.change_price(
-                price_change_name=f"CJ일괄업로드-{product['fileName']}-{product['itemCode']}",
-                sale_price_info_list=[api_data]
-            )
-            
-            # CJ API 응답에서 실제 성공/실패 확인
-            api_success = result.get('success', False)
-            api_data_response = result.get('data', {})
-            
-            # CJ API 응답에서 error 필드 확인
-            if api_data_response and api_data_response.get('error', False):
-                api_success = False
-                error_message = api_data_response.get('returnMessage', 'Unknown error')
-            # CJ API 응답에서 failList 확인
-            elif api_data_response and 'failList' in api_data_response and api_data_response['failList']:
-                api_success = False
-                error_message = api_data_response['failList'][0].get('errorMessage', 'Unknown error')
-            else:
-                error_message = result.get('error', '')
-            
-            batch_results.append({
-                'itemCode': product['itemCode'],
-                'salePrice': product['salePrice'],
-                'commissionRate': product.get('commissionRate', None),
-                'fileName': product['fileName'],
-                'success': api_success,
-                'error': error_message,
-                'statusCode': result.get('status_code', 0)
-            })
-            
-            if api_success:
-                print(f"✅ 성공")
+        if collect_results:
+            results.extend(final_results)
+        progress['done'] += len(final_results)
+        progress['success'] += sum(1 for r in final_results if r['success'])
+        for r in final_results:
+            if journal:
+                journal.record(r)
+            if report:
+                report.record(r)
+        done = progress['done']
+        
+        if verbose:
+            first = request_products[0]
+            failed = [r for r in request_results if not r['success']]
+            label = first['itemCode'] if len(request_results) == 1 else f"{first['itemCode']} 외 {len(request_results) - 1}개"
+            retry_label = f" (🔁 {retried}개 재시도 예약)" if retried else ""
+            if not failed:
+                print(f"  [{done}/{total_label}] {label} ✅ 성공")
+            elif len(request_results) == 1:
+                print(f"  [{done}/{total_label}] {label} ❌ 실패: {failed[0]['error']}{retry_label}")
             else:
-                print(f"❌ 실패: {error_message}")
+                print(f"  [{done}/{total_label}] {label} ⚠️  {len(request_results) - len(failed)}개 성공, {len(failed)}개 실패{retry_label}")
+                for r in failed[:3]:
+                    print(f"      - {r['itemCode']}: {r['error']}")
+                if len(failed) > 3:
+                    print(f"      ... 외 {len(failed) - 3}개")
         
-        results.extend(batch_results)
+        if controller and controller.decreases > progress['decreases']:
+            progress['decreases'] = controller.decreases
+            print(f"  📉 과부하 감지 (상태 코드 {result.get('status_code', 0) or '연결 오류'}) → {controller.describe()}")
+        if controller and controller.batch_decreases > progress['batch_decreases']:
+            progress['batch_decreases'] = controller.batch_decreases
+            print(f"  📉 요청 크기/검증 오류 감지 (상태 코드 {result.get('status_code', 0)}) → {controller.describe()}")
+        
+        if done >= progress['next_summary'] or done == total:
+            elapsed = max(time.monotonic() - started, 1e-9)
+            window = f", {controller.describe()}" if controller else ""
+            waiting = f", 재시도 대기 {len(retry_queue)}" if len(retry_queue) else ""
+            print(f"\n📦 진행: {done}/{total_label}개 완료 (성공 {progress['success']}, 실패 {done - progress['success']}{waiting}, {done / elapsed:.1f}개/초{window})\n")
+            while progress['next_summary'] <= done:
+                progress['next_summary'] += batch_size
+    
+    send = lambda job: send_price_request(cj_client, job)
+    try:
+        jobs = jobs_with_retries(build_price_requests(products, request_size))
+        for (_, request_products), result in uploader.run(jobs, send, controller):
+            handle_result(request_products, result)
         
-        # 배치 간 잠시 대기 (API 부하 방지)
-        if i + batch_size < len(products):
-            print(f"  ⏳ 2초 대기 중...")
-            import time
-            time.sleep(2)
+        # 남은 재시도 상품은 대기 시간이 지나는 대로 묶어서 다시 전송
+        while len(retry_queue):
+            wait_seconds = retry_queue.seconds_until_ready()
+            if wait_seconds > 0:
+                print(f"  🔁 재시도 대기 중... ({len(retry_queue)}개 상품, {wait_seconds:.1f}초)")
+                time.sleep(wait_seconds)
+            jobs = build_retry_requests(retry_queue.pop_ready())
+            for (_, request_products), result in uploader.run(jobs, send, controller):
+                handle_result(request_products, result)
+    finally:
+        cj_client.close()
     
     return results
 
-def generate_report(results, file_summary):
-    """실행 결과 리포트를 생성합니다."""
+def write_report_workbook(report_path, report_df, conflicts=None):
+    """리포트 시트와 (있으면) 가격 충돌 시트를 엑셀 파일로 저장합니다."""
+    with pd.ExcelWriter(report_path) as writer:
+        report_df.to_excel(writer, sheet_name='리포트', index=False)
+        if conflicts is not None and not conflicts.empty:
+            conflicts.to_excel(writer, sheet_name='가격충돌', index=False)
+
+def print_conflicts(conflicts):
+    """가격 충돌 상품을 출력합니다 (최대 10개)."""
+    if conflicts is None or conflicts.empty:
+        return
+    groups = list(conflicts.groupby(['itemCode', 'applyDate'], sort=False))
+    print(f"\n⚠️  가격 충돌 상품 ({len(groups)}개 상품/적용일시, 최대 10개 표시):")
+    for (item_code, apply_date), rows in groups[:10]:
+        candidates = ", ".join(
+            f"{'✔ ' if row.selected else ''}{row.salePrice:,}원({row.fileName})"
+            for row in rows.itertuples()
+        )
+        print(f"  - {item_code} [{apply_date or '즉시 적용'}]: {candidates}")
+    if len(groups) > 10:
+        print(f"  ... 외 {len(groups) - 10}개")
+
+def new_report_csv_path():
+    """이번 실행의 결과 CSV 경로 (엑셀 리포트는 같은 이름의 .xlsx로 저장)"""
+    report_file = f"cj_upload_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    return os.path.join(REPORT_FOLDER, report_file)
+
+def generate_report(report_csv_path, file_summary, conflicts=None):
+    """
+    결과 CSV로 실행 결과 리포트를 생성합니다.
+
+    CSV를 한 줄씩 읽어 통계를 내고, 엑셀 리포트도 쓰기 전용 모드로
+    만들므로 결과 수와 관계없이 메모리 사용량이 일정합니다.
+    """
     print(f"\n" + "=" * 60)
     print(f"📊 실행 결과 리포트")
     print(f"=" * 60)
     
     # 전체 통계
-    total_products = len(results)
-    success_count = sum(1 for r in results if r['success'])
+    summary = summarize_report(report_csv_path)
+    total_products = summary['total']
+    if not total_products:
+        print("📈 기록된 업로드 결과가 없습니다.")
+        print_conflicts(conflicts)
+        print(f"\n📄 결과 CSV: {report_csv_path}")
+        return
+    success_count = summary['success']
     failed_count = total_products - success_count
     
     print(f"📈 전체 통계:")
@@ -257,6 +647,12 @@ def generate_report(results, file_summary):
     print(f"  성공: {success_count:,}개 ({success_count/total_products*100:.1f}%)")
     print(f"  실패: {failed_count:,}개 ({failed_count/total_products*100:.1f}%)")
     
+    # 재시도 통계 (첫 시도 성공률과 최종 성공률)
+    first_try_count = summary['first_try']
+    recovered_count = success_count - first_try_count
+    print(f"  첫 시도 성공: {first_try_count:,}개 ({first_try_count/total_products*100:.1f}%)")
+    print(f"  재시도 후 성공: {recovered_count:,}개 → 최종 성공률 {success_count/total_products*100:.1f}%")
+    
     # 파일별 통계
     print(f"\n📁 파일별 통계:")
     for file_info in file_summary:
@@ -266,30 +662,28 @@ def generate_report(results, file_summary):
             print(f"  📄 {file_info['fileName']}: {file_info['validProducts']}개 상품")
     
     # 실패한 상품들
-    failed_products = [r for r in results if not r['success']]
-    if failed_products:
+    if failed_count:
         print(f"\n❌ 실패한 상품들 (최대 10개):")
-        for product in failed_products[:10]:
+        for product in summary['failed']:
             print(f"  - {product['itemCode']} ({product['fileName']}): {product['error']}")
-        if len(failed_products) > 10:
-            print(f"  ... 외 {len(failed_products)-10}개")
+        if failed_count > len(summary['failed']):
+            print(f"  ... 외 {failed_count - len(summary['failed'])}개")
     
     # 성공한 상품들 샘플
-    success_products = [r for r in results if r['success']]
-    if success_products:
+    if summary['succeeded']:
         print(f"\n✅ 성공한 상품들 샘플 (최대 5개):")
-        for product in success_products[:5]:
+        for product in summary['succeeded']:
             print(f"  - {product['itemCode']}: {product['salePrice']:,}원 ({product['fileName']})")
     
+    print_conflicts(conflicts)
+    
     # 엑셀 리포트 생성
-    os.makedirs(REPORT_FOLDER, exist_ok=True)
-    report_df = pd.DataFrame(results)
-    report_file = f"cj_upload_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    report_path = os.path.join(REPORT_FOLDER, report_file)
-    report_df.to_excel(report_path, index=False)
-    print(f"\n📄 상세 리포트 저장: {report_path}")
-
-def test_mode_only(products, file_summary):
+    report_path = os.path.splitext(report_csv_path)[0] + '.xlsx'
+    write_report_workbook_from_csv(report_csv_path, report_path, conflicts)
+    print(f"\n📄 결과 CSV: {report_csv_path}")
+    print(f"📄 상세 리포트 저장: {report_path}")
+
+def test_mode_only(products, file_summary, conflicts=None):
     """테스트 모드로 데이터만 분석합니다."""
     print(f"\n" + "=" * 60)
     print(f"📊 테스트 모드 분석 결과 (실제 업로드 안함)")
@@ -339,20 +733,197 @@ def test_mode_only(products, file_summary):
     if len(products) > 10:
         print(f"  ... 외 {len(products)-10}개")
     
+    print_conflicts(conflicts)
+    
     # 엑셀 리포트 생성
     if products:
         os.makedirs(REPORT_FOLDER, exist_ok=True)
-        report_df = pd.DataFrame(products)
+        report_df = records_to_frame(products)
         report_file = f"cj_products_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         report_path = os.path.join(REPORT_FOLDER, report_file)
-        report_df.to_excel(report_path, index=False)
+        write_report_workbook(report_path, report_df, conflicts)
         print(f"\n📄 상세 리포트 저장: {report_path}")
 
-def main():
+def update_price_snapshot():
+    """이번 실행(이어하기 포함)에서 성공한 가격을 저널에서 읽어 스냅샷에 반영합니다."""
+    snapshot = PriceSnapshot(SNAPSHOT_FILE)
+    applied_at = {}
+    applied = UploadJournal.load_applied(JOURNAL_FILE, applied_at)
+    snapshot.merge(applied, applied_at)
+    snapshot.save()
+
+class StreamCoalescer:
+    """
+    스트리밍 업로드에서 앞서 읽은 상품과 (상품코드, 적용일시)가 같은 상품을 골라냅니다.
+
+    파일을 다 읽기 전에 업로드하므로 coalesce_products처럼 미리 합칠 수 없고,
+    중복 상품을 그대로 보내면 같은 키의 요청들이 동시에 전송되어 어느 가격이
+    최종 가격이 될지 알 수 없습니다. 그래서 처음 읽은 상품만 바로 보내고, 가격이
+    다른 중복 상품은 키마다 마지막 것만 모아 두었다가 본 업로드가 끝난 뒤 보냅니다
+    (ordered_lane). 따라서 같은 키는 나중에 읽은 파일(파일명 순)의 가격이 남습니다.
+    지금까지 읽은 키를 모두 기억하므로 메모리는 고유 키 수에 비례합니다.
+    """
+
+    def __init__(self):
+        # 키 → 처음 읽은 상품의 (판매가, 수수료율, 파일명)
+        self._first = {}
+        # 키 → 마지막으로 읽은 중복 상품 (본 업로드 후 전송)
+        self._deferred = {}
+        # 키 → 가격이 달랐던 행들의 (판매가, 수수료율, 파일명)
+        self._conflict_rows = {}
+
+    def split(self, products):
+        """처음 읽은 상품 목록을 반환하고, 가격이 다른 중복 상품은 나중에 보내도록 모아 둡니다."""
+        first_products = []
+        for product in products:
+            key = price_key(product)
+            row = applied_price(product) + (product['fileName'],)
+            first = self._first.get(key)
+            if first is None:
+                self._first[key] = row
+                first_products.append(product)
+                continue
+            if key not in self._deferred and row[:2] == first[:2]:
+                # 같은 가격의 단순 중복은 보낼 필요 없음
+                continue
+            # 마지막으로 읽은 상품이 남도록 기존 항목을 지우고 다시 넣음
+            self._deferred.pop(key, None)
+            self._deferred[key] = product
+            self._conflict_rows.setdefault(key, [first]).append(row)
+        return first_products
+
+    def ordered_lane(self):
+        """본 업로드가 끝난 뒤 보낼 상품 (처음 읽은 가격과 같아진 키는 제외)"""
+        return [product for key, product in self._deferred.items()
+                if applied_price(product) != self._first[key][:2]]
+
+    def conflicts(self):
+        """coalesce_products와 같은 형식의 가격 충돌 DataFrame"""
+        rows = []
+        for (item_code, apply_date), key_rows in self._conflict_rows.items():
+            for i, (sale_price, commission_rate, file_name) in enumerate(key_rows, 1):
+                rows.append([item_code, sale_price, commission_rate, apply_date, file_name, i == len(key_rows)])
+        return pd.DataFrame(rows, columns=['itemCode', 'salePrice', 'commissionRate', 'applyDate', 'fileName', 'selected'])
+
+def make_stream_product_filter(resume=False, delta=False):
+    """
+    스트리밍 업로드에서 파일(묶음)별 상품에 적용할 필터를 만듭니다.
+
+    적용일시별로 묶어 정렬하고, 앞서 읽은 상품과 같은 키의 중복 상품은
+    StreamCoalescer로 골라내며, 이어하기/변경분 모드이면 이미 같은 가격으로
+    적용된 상품을 제외합니다. 반환값은 (필터, 묶음별 제외 상품 수 목록, StreamCoalescer)입니다.
+    """
+    skip_prices = {}
+    if delta:
+        skip_prices.update(PriceSnapshot(SNAPSHOT_FILE).prices)
+    if resume:
+        skip_prices.update(UploadJournal.load_applied(JOURNAL_FILE))
+    skipped_counts = []
+    coalescer = StreamCoalescer()
+    
+    def product_filter(products):
+        # 파일 안에서 적용일시별로 묶어야 요청 하나에 최대한 많이 담을 수 있음
+        # (지난 적용일시를 즉시 적용으로 바꾼 뒤에 저널/스냅샷의 적용일시와 비교)
+        products, _ = schedule_products(products)
+        # 중복 상품은 건너뛰기 판단 전에 골라냄 (나중 가격이 스냅샷과 같아도 앞의 가격을 덮어써야 함)
+        products = coalescer.split(products)
+        remaining, skipped = filter_already_applied(products, skip_prices)
+        skipped_counts.append(skipped)
+        return remaining
+    
+    return product_filter, skipped_counts, coalescer
+
+def upload_stream_and_report(products, file_summary, skipped_counts, resume=False, coalescer=None):
+    """
+    상품 스트림을 업로드하고 결과 리포트를 만듭니다.
+
+    결과는 저널과 결과 CSV에만 기록하고 메모리에 모아두지 않습니다.
+    coalescer가 주어지면 스트림 업로드가 모두 끝난 뒤 중복 상품을 이어서 보내고
+    (같은 키의 요청이 동시에 전송되지 않도록), 가격 충돌을 리포트에 포함합니다.
+    file_summary는 스트림을 다 읽은 뒤 리포트에 사용합니다.
+    업로드한 상품이 있으면 True를 반환합니다.
+    """
+    print(f"📝 업로드 저널: {JOURNAL_FILE}")
+    journal = UploadJournal(JOURNAL_FILE, resume=resume)
+    report = ResultReportWriter(new_report_csv_path())
+    print(f"📝 결과 CSV: {report.path}")
+    try:
+        batch_upload_to_cj(products, BATCH_SIZE, ITEMS_PER_REQUEST, journal=journal,
+                           report=report, collect_results=False)
+        ordered_products = coalescer.ordered_lane() if coalescer else []
+        if ordered_products:
+            # 처음 읽은 상품의 요청이 모두 끝난 뒤에 보내야 나중 가격이 최종 가격이 됨
+            print(f"\n🔁 중복 상품 {len(ordered_products)}개를 나중에 읽은 가격으로 이어서 전송합니다.")
+            ordered_products, _ = schedule_products(ordered_products)
+            batch_upload_to_cj(ordered_products, BATCH_SIZE, ITEMS_PER_REQUEST, journal=journal,
+                               report=report, collect_results=False)
+    finally:
+        journal.close()
+        report.close()
+        update_price_snapshot()
+    
+    if skipped_counts:
+        print(f"\n⏩ 이미 같은 가격으로 적용되어 건너뛴 상품: {sum(skipped_counts)}개")
+    
+    conflicts = coalescer.conflicts() if coalescer else None
+    if not report.count:
+        print_conflicts(conflicts)
+        print("✅ 업로드할 상품이 없습니다.")
+        os.remove(report.path)
+        return False
+    
+    print(f"\n📊 리포트 생성")
+    generate_report(report.path, file_summary, conflicts)
+    return True
+
+def run_streaming_upload(resume=False, delta=False, only_files=None):
+    """엑셀 읽기와 API 업로드를 동시에 진행하는 스트리밍 모드"""
+    print(f"\n🌊 스트리밍 업로드 모드")
+    
+    if not os.path.exists(EXCEL_FOLDER):
+        print(f"❌ 폴더를 찾을 수 없습니다: {EXCEL_FOLDER}")
+        return
+    
+    excel_files = list_cj_excel_files(EXCEL_FOLDER, only_files)
+    if not excel_files:
+        print("❌ 엑셀 파일이 없습니다.")
+        return
+    
+    print(f"📊 발견된 엑셀 파일: {len(excel_files)}개")
+    print(f"\n⚠️  주의: 파일을 읽는 즉시 상품 가격이 실제로 변경됩니다!")
+    print(f"📁 대상 폴더: {EXCEL_FOLDER}")
+    
+    confirm = input(f"\n정말로 진행하시겠습니까? (y/N): ")
+    if confirm.lower() not in ['y', 'yes']:
+        print("취소되었습니다.")
+        return
+    
+    # 이어하기/변경분 모드는 파일 단위로 걸러냄
+    product_filter, skipped_counts, coalescer = make_stream_product_filter(resume, delta)
+    
+    file_summary = []
+    products = stream_cj_products(excel_files, file_summary, product_filter)
+    if upload_stream_and_report(products, file_summary, skipped_counts, resume=resume, coalescer=coalescer):
+        print(f"\n🎉 스트리밍 업로드가 완료되었습니다!")
+
+def main(resume=False, delta=False, stream=False, files_from=None):
     """메인 함수"""
+    # 파일 목록 모드: 분할 프로그램이 새로 만들거나 바꾼 파일만 업로드
+    only_files = None
+    if files_from:
+        only_files = read_file_list(files_from)
+        print(f"\n📄 파일 목록 사용: {files_from} ({len(only_files)}개 파일)")
+        if not only_files:
+            print("✅ 업로드할 파일이 없습니다.")
+            return
+    
+    if stream:
+        run_streaming_upload(resume=resume, delta=delta, only_files=only_files)
+        return
+    
     # 1단계: 엑셀 파일들 로드
     print(f"\n📁 1단계: 엑셀 파일 로드")
-    products, file_summary = load_cj_excel_files(EXCEL_FOLDER)
+    products, file_summary, conflicts = load_cj_excel_files(EXCEL_FOLDER, only_files=only_files)
     
     if not products:
         print("❌ 로드된 상품이 없습니다.")
@@ -360,6 +931,25 @@ def main():
     
     print(f"\n📊 로드 완료: {len(products)}개 상품")
     
+    # 변경분 모드: 마지막으로 적용된 가격/수수료율과 같은 상품은 제외
+    if delta:
+        snapshot = PriceSnapshot(SNAPSHOT_FILE)
+        loaded_count = len(products)
+        products, unchanged = filter_already_applied(products, snapshot.prices)
+        avoided_calls = math.ceil(loaded_count / ITEMS_PER_REQUEST) - math.ceil(len(products) / ITEMS_PER_REQUEST)
+        print(f"\n📉 변경분 모드: 스냅샷({len(snapshot.prices)}개 상품/적용일시)과 동일한 {unchanged}개 상품 제외")
+        print(f"   업로드 대상: {len(products)}개 상품, 절약된 API 호출: {avoided_calls}회")
+        if not products:
+            print("✅ 변경된 상품이 없습니다.")
+            return
+    
+    # 적용일시(applyDate/applyTime)별로 묶기
+    products, schedule = schedule_products(products)
+    if len(schedule) > 1 or '' not in schedule:
+        print(f"\n🗓️  적용일시별 상품 수:")
+        for slot, count in schedule.items():
+            print(f"  {slot or '즉시 적용'}: {count:,}개")
+    
     # 2단계: 모드 선택
     print(f"\n📋 실행 모드를 선택하세요:")
     print(f"1. 테스트 모드 (데이터 분석만, 실제 업로드 안함)")
@@ -370,7 +960,7 @@ def main():
     if choice == "1":
         # 테스트 모드
         print(f"\n🔍 테스트 모드 실행")
-        test_mode_only(products, file_summary)
+        test_mode_only(products, file_summary, conflicts)
         print(f"\n🎉 테스트 분석이 완료되었습니다!")
         print(f"💡 실제 업로드를 원하시면 다시 실행해서 2번을 선택하세요.")
         
@@ -384,13 +974,33 @@ def main():
             print("취소되었습니다.")
             return
         
+        # 이어하기: 저널에 같은 가격으로 이미 적용된 상품은 건너뜀
+        if resume:
+            applied = UploadJournal.load_applied(JOURNAL_FILE)
+            products, skipped = filter_already_applied(products, applied)
+            print(f"\n⏩ 이어하기: 이미 적용된 {skipped}개 상품을 건너뜁니다. (남은 상품: {len(products)}개)")
+            if not products:
+                print("✅ 모든 상품이 이미 적용되어 있습니다.")
+                return
+        
         # 3단계: CJ API 업로드
         print(f"\n🚀 2단계: CJ API 업로드")
-        results = batch_upload_to_cj(products, BATCH_SIZE)
+        print(f"📝 업로드 저널: {JOURNAL_FILE}")
+        journal = UploadJournal(JOURNAL_FILE, resume=resume)
+        # 결과는 확정되는 즉시 CSV에 기록 (중단되어도 그때까지의 결과가 남음)
+        report = ResultReportWriter(new_report_csv_path())
+        print(f"📝 결과 CSV: {report.path}")
+        try:
+            batch_upload_to_cj(products, BATCH_SIZE, ITEMS_PER_REQUEST, journal=journal,
+                               report=report, collect_results=False)
+        finally:
+            journal.close()
+            report.close()
+            update_price_snapshot()
         
         # 4단계: 리포트 생성
         print(f"\n📊 3단계: 리포트 생성")
-        generate_report(results, file_summary)
+        generate_report(report.path, file_summary, conflicts)
         
         print(f"\n🎉 일괄 업로드가 완료되었습니다!")
     
@@ -398,8 +1008,20 @@ def main():
         print("❌ 잘못된 선택입니다.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CJ 할인 데이터 일괄 업로드 도구")
+    parser.add_argument("--resume", action="store_true",
+                        help="업로드 저널을 읽어 이미 같은 가격으로 적용된 상품은 건너뜁니다.")
+    parser.add_argument("--delta", action="store_true",
+                        help="마지막으로 적용된 가격 스냅샷과 비교해 판매가/수수료율이 바뀐 상품만 업로드합니다.")
+    parser.add_argument("--stream", action="store_true",
+                        help="전체 파일을 먼저 읽지 않고, 파일을 읽는 대로 바로 업로드합니다 (실제 업로드).")
+    parser.add_argument("--files-from", metavar="PATH",
+                        help="목록 파일(한 줄에 하나)에 있는 엑셀 파일만 업로드합니다. "
+                             "CJ 엑셀추출의 cjsales_changed_files.txt를 넘기면 새로 생기거나 바뀐 분할 파일만 처리합니다.")
+    args = parser.parse_args()
+    
     try:
-        main()
+        main(resume=args.resume, delta=args.delta, stream=args.stream, files_from=args.files_from)
     except KeyboardInterrupt:
         print("\n\n⚠️  사용자에 의해 작업이 중단되었습니다.")
     except Exception as e:
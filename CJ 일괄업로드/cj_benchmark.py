@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+CJ 일괄 업로드 처리량 벤치마크
+
+로컬 대역 서버(cj_mock_server.py)를 띄우고 가상의 상품들로 batch_upload_to_cj를
+실행하여 처리량(상품/초), 응답 지연 p50/p95/p99, 오류 처리 결과를 측정합니다.
+실제 CJ API는 호출하지 않습니다.
+
+사용 예시:
+    python cj_benchmark.py --items 5000 --items-per-request 50 --workers 8 --rate-limit 0
+    python cj_benchmark.py --items 2000 --latency-ms 120 --error-rate 0.01 --fail-rate 0.02 --max-rps 20
+    python cj_benchmark.py --items 3000 --max-rps 10 --compare
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+from cj_mock_server import MockCJServer, add_mock_server_arguments, config_from_arguments
+from cj_products import CJProduct
+
+
+def percentile(values, pct):
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+def make_benchmark_products(count):
+    """벤치마크용 가상 상품 목록을 만듭니다."""
+    return [
+        CJProduct(
+            itemCode=str(2000000000 + i),
+            salePrice=random.randrange(10000, 100000, 100),
+            commissionRate=10.0,
+            applyDate='',
+            fileName='benchmark'
+        )
+        for i in range(count)
+    ]
+
+
+def print_benchmark_report(results, elapsed, server):
+    """벤치마크 결과를 출력합니다."""
+    total = len(results)
+    success_count = sum(1 for r in results if r['success'])
+    latencies = sorted(r['elapsed'] for r in results)
+
+    print("\n" + "=" * 60)
+    print("📊 벤치마크 결과")
+    print("=" * 60)
+    print(f"  상품 수: {total:,}개 / 소요 시간: {elapsed:.2f}초")
+    print(f"  처리량: {total / max(elapsed, 1e-9):,.1f}개/초 (요청 {server.stats['requests'] / max(elapsed, 1e-9):,.1f}회/초)")
+    print(f"  응답 지연: p50 {percentile(latencies, 50) * 1000:.0f}ms, "
+          f"p95 {percentile(latencies, 95) * 1000:.0f}ms, p99 {percentile(latencies, 99) * 1000:.0f}ms")
+    print(f"  성공: {success_count:,}개, 실패: {total - success_count:,}개")
+
+    status_counts = Counter(r['statusCode'] for r in results if not r['success'])
+    if status_counts:
+        print(f"\n❌ 실패 상품 상태 코드별:")
+        for status_code, count in status_counts.most_common():
+            print(f"  {status_code or '연결 오류'}: {count:,}개")
+
+    error_counts = Counter(r['error'] for r in results if not r['success'])
+    if error_counts:
+        print(f"\n❌ 실패 사유 (상위 5개):")
+        for error, count in error_counts.most_common(5):
+            print(f"  {count:,}개 - {str(error)[:80]}")
+
+    print(f"\n🧪 대역 서버 통계: {server.stats}")
+
+
+def run_benchmark(config, items, **upload_options):
+    """
+    대역 서버를 띄우고 가상 상품 items개를 업로드합니다.
+
+    upload_options는 batch_upload_to_cj에 그대로 넘기며,
+    (상품별 결과, 소요 시간, 대역 서버)를 반환합니다 (서버는 종료된 상태).
+    """
+    server = MockCJServer(config=config)
+    server.start_in_background()
+    print(f"🧪 CJ API 대역 서버: {server.api_url}")
+
+    from cj_batch_upload_git import batch_upload_to_cj
+
+    # 업로드 도구가 대역 서버로 요청하도록 설정 (프록시 미사용)
+    # .env의 프록시 설정을 덮어쓰도록 업로드 도구 import(.env 로드) 이후에 설정
+    os.environ['CJ_API_URL'] = server.api_url
+    os.environ.setdefault('CJ_AUTH_KEY', 'benchmark')
+    for proxy_key in ('HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy'):
+        os.environ.pop(proxy_key, None)
+    os.environ['NO_PROXY'] = '127.0.0.1,localhost'
+
+    products = make_benchmark_products(items)
+    started = time.monotonic()
+    try:
+        results = batch_upload_to_cj(products, verbose=False, **upload_options)
+        return results, time.monotonic() - started, server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CJ 일괄 업로드 처리량 벤치마크 (로컬 대역 서버 사용)')
+    parser.add_argument('--items', type=int, default=1000, help='업로드할 가상 상품 수')
+    parser.add_argument('--items-per-request', type=int, default=50, help='요청당 상품 수')
+    parser.add_argument('--workers', type=int, default=8, help='동시 업로드 워커 수')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='클라이언트 초당 요청 제한 (0이면 제한 없음)')
+    parser.add_argument('--max-in-flight', type=int, default=0, help='동시에 처리 중일 수 있는 최대 요청 수')
+    parser.add_argument('--batch-size', type=int, default=1000, help='진행 상황 요약 간격 (상품 수)')
+    parser.add_argument('--adaptive', action='store_true', help='적응형(AIMD) 모드로 실행')
+    parser.add_argument('--compare', action='store_true',
+                        help='고정 모드와 적응형 모드를 차례로 실행하고, 적응형의 성공 수가 더 적으면 실패(종료 코드 1)')
+    parser.add_argument('--seed', type=int, default=None, help='난수 시드 (재현용)')
+    add_mock_server_arguments(parser)
+    args = parser.parse_args()
+
+    upload_options = dict(
+        batch_size=args.batch_size,
+        items_per_request=args.items_per_request,
+        workers=args.workers,
+        rate_limit=args.rate_limit,
+        max_in_flight=args.max_in_flight
+    )
+    modes = [False, True] if args.compare else [args.adaptive]
+    outcomes = {}
+    for adaptive in modes:
+        if args.seed is not None:
+            random.seed(args.seed)
+        results, elapsed, server = run_benchmark(config_from_arguments(args), args.items,
+                                                 adaptive=adaptive, **upload_options)
+        print_benchmark_report(results, elapsed, server)
+        outcomes[adaptive] = (sum(1 for r in results if r['success']), elapsed, server.stats['requests'])
+
+    if args.compare:
+        print("\n⚖️  고정/적응형 비교")
+        for adaptive, (success_count, elapsed, requests) in outcomes.items():
+            label = '적응형' if adaptive else '고정'
+            print(f"  {label}: 성공 {success_count:,}개, {elapsed:.2f}초, 요청 {requests:,}회")
+        if outcomes[True][0] < outcomes[False][0]:
+            print("❌ 적응형 모드의 성공 수가 고정 모드보다 적습니다.")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+CJ 할인 엑셀 파일 로더
+
+CJ할인설정 폴더의 엑셀 파일들을 프로세스 풀에서 병렬로 읽고,
+행 단위 반복(iterrows) 없이 열 단위 연산으로 상품 데이터를 만듭니다.
+읽은 결과는 파일 경로/수정 시각/내용 해시 기준으로 캐시하여, 같은 폴더를
+다시 실행할 때는 엑셀을 다시 읽지 않습니다.
+프로세스 풀 워커가 가져와 쓰는 모듈이므로 import 시 출력 등의 부작용이 없어야 합니다.
+"""
+
+import os
+import glob
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# 파싱 캐시는 Parquet으로만 저장 (pyarrow가 없으면 캐시를 사용하지 않음)
+# pickle은 읽을 때 임의 코드가 실행될 수 있어 공유 폴더에 두는 캐시 형식으로 쓰지 않음
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+CACHE_FORMAT = 'parquet'
+CACHE_EXTENSIONS = ('.json', '.parquet')
+
+# 엑셀 양식의 열 순서 (A3행부터 데이터)
+CJ_EXCEL_COLUMNS = ['itemCode', 'salePrice', 'commissionRate', 'supplyPrice', 'applyDate', 'applyTime']
+
+# 로더가 반환하는 상품 열
+# applyDate: 엑셀의 적용일/적용시간 ('YYYY-MM-DD HH:MM:SS', 없으면 '')
+# fileMtime: 파일 수정 시각 (여러 파일에 같은 상품이 있을 때 최신 파일 판단용)
+PRODUCT_COLUMNS = ['itemCode', 'salePrice', 'commissionRate', 'applyDate', 'fileName', 'fileMtime']
+
+# 중복 상품코드 처리 기준
+COALESCE_MODES = ('file', 'applyDate', 'none')
+
+# 파싱 방식이 바뀌면 올려서 기존 캐시를 무효화
+PARSE_CACHE_VERSION = 1
+
+
+def _parse_apply_datetime(apply_date, apply_time):
+    """적용일/적용시간 열을 'YYYY-MM-DD HH:MM:SS' 문자열 열로 합칩니다 (없으면 '')."""
+    dates = pd.to_datetime(apply_date, errors='coerce')
+    # 'HH:MM' 형식은 초를 붙여서 해석
+    times = pd.to_timedelta(
+        apply_time.astype(str).str.strip().str.replace(r'^(\d{1,2}:\d{2})$', r'\1:00', regex=True),
+        errors='coerce'
+    )
+    # 적용시간이 있으면 적용일 날짜에 더하고, 없으면 적용일 값(시간 포함)을 그대로 사용
+    scheduled = dates.where(times.isna(), dates.dt.normalize() + times)
+    return scheduled.dt.strftime('%Y-%m-%d %H:%M:%S').fillna('')
+
+
+def parse_cj_excel_file(file_path):
+    """
+    엑셀 파일 하나를 읽어 (상품 DataFrame, 파일 요약)을 반환합니다.
+
+    오류가 나도 예외를 던지지 않고 파일 요약에 error를 담아 반환합니다.
+    """
+    file_name = os.path.basename(file_path)
+    try:
+        # 2행을 헤더로 읽기 (A3행부터 데이터)
+        df = pd.read_excel(file_path, header=2)
+
+        # 빈 행 제거
+        df = df.dropna(how='all')
+
+        if df.empty:
+            return None, {'fileName': file_name, 'totalRows': 0, 'validProducts': 0}
+
+        # 컬럼명 정리
+        df.columns = CJ_EXCEL_COLUMNS
+        total_rows = len(df)
+
+        # 유효한 데이터만 필터링 (상품코드와 판매가가 있는 행)
+        df = df.assign(salePrice=pd.to_numeric(df['salePrice'], errors='coerce'))
+        df = df.dropna(subset=['itemCode', 'salePrice'])
+
+        commission_rate = pd.to_numeric(df['commissionRate'], errors='coerce')
+        products = pd.DataFrame({
+            'itemCode': df['itemCode'].astype(str).str.replace('.0', '', regex=False),
+            'salePrice': df['salePrice'].astype('int64'),
+            'commissionRate': commission_rate.astype(object).where(commission_rate.notna(), None),
+            'applyDate': _parse_apply_datetime(df['applyDate'], df['applyTime']),
+            'fileName': file_name,
+            'fileMtime': os.path.getmtime(file_path)
+        }, columns=PRODUCT_COLUMNS)
+
+        return products, {'fileName': file_name, 'totalRows': total_rows, 'validProducts': len(products)}
+
+    except Exception as e:
+        return None, {'fileName': file_name, 'totalRows': 0, 'validProducts': 0, 'error': str(e)}
+
+
+def _file_content_hash(file_path):
+    """파일 내용의 해시 (수정 시각만 바뀐 파일을 알아보기 위함)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedWorkbookCache:
+    """
+    엑셀 파일별 파싱 결과 캐시
+
+    파일마다 정규화된 상품 DataFrame(Parquet)과 메타데이터(JSON: 경로, 수정 시각,
+    크기, 내용 해시, 파일 요약)를 저장합니다. pyarrow가 필요합니다.
+    수정 시각과 크기가 같으면 바로 캐시를 사용하고, 수정 시각만 달라졌으면
+    내용 해시를 비교해 같을 때 캐시를 사용합니다.
+    캐시 파일 이름은 엑셀 파일 경로의 해시이며, prune()으로 더 이상 폴더에
+    없는 파일의 캐시를 지웁니다.
+    """
+
+    def __init__(self, cache_dir):
+        if not HAS_PYARROW:
+            raise ImportError("파싱 캐시에는 pyarrow가 필요합니다 (pip install pyarrow)")
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _key(file_path):
+        return hashlib.blake2b(os.path.abspath(file_path).encode('utf-8'), digest_size=16).hexdigest()
+
+    def _paths(self, file_path):
+        base = os.path.join(self.cache_dir, self._key(file_path))
+        return base + '.json', base + '.parquet'
+
+    def prune(self, keep_files):
+        """
+        keep_files(폴더를 스캔한 엑셀 파일 경로 목록)에 없는 파일의 캐시를 지웁니다.
+
+        매일 새 이름으로 내려받는 파일의 캐시가 계속 쌓이지 않게 하며,
+        중단되어 남은 임시 파일과 이전 형식(pickle)의 캐시 파일도 함께 지웁니다.
+        지운 캐시 항목 수를 반환합니다.
+        """
+        keep_keys = {self._key(file_path) for file_path in keep_files}
+        removed = set()
+        for name in os.listdir(self.cache_dir):
+            key = name.split('.', 1)[0]
+            if key in keep_keys and name.endswith(CACHE_EXTENSIONS):
+                continue
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            if key not in keep_keys and not name.endswith('.tmp'):
+                removed.add(key)
+        return len(removed)
+
+    def load(self, file_path):
+        """캐시가 유효하면 (DataFrame 또는 None, 파일 요약)을, 아니면 None을 반환합니다."""
+        meta_path, data_path = self._paths(file_path)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            stat = os.stat(file_path)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get('version') != PARSE_CACHE_VERSION or meta.get('format') != CACHE_FORMAT:
+            return None
+        if meta['size'] != stat.st_size:
+            return None
+        if meta['mtime'] != stat.st_mtime:
+            # 수정 시각만 바뀌고 내용은 같으면 캐시 사용 (메타데이터의 수정 시각 갱신)
+            if meta['hash'] != _file_content_hash(file_path):
+                return None
+            meta['mtime'] = stat.st_mtime
+            self._write_meta(meta_path, meta)
+
+        df = None
+        if meta['hasData']:
+            try:
+                df = pd.read_parquet(data_path)
+            except Exception:
+                return None
+            # Parquet은 None을 NaN으로 돌려주므로 파싱 직후와 같은 형태로 복원
+            commission_rate = pd.to_numeric(df['commissionRate'], errors='coerce')
+            df['commissionRate'] = commission_rate.astype(object).where(commission_rate.notna(), None)
+            df['fileMtime'] = stat.st_mtime
+        return df, dict(meta['summary'], cached=True)
+
+    def store(self, file_path, df, summary):
+        """파싱 결과를 저장합니다. 오류가 난 파일은 저장하지 않습니다."""
+        if 'error' in summary:
+            return
+        meta_path, data_path = self._paths(file_path)
+        stat = os.stat(file_path)
+        has_data = df is not None and not df.empty
+        if has_data:
+            tmp_path = data_path + '.tmp'
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, data_path)
+        # 데이터 파일을 먼저 쓰고 메타데이터를 마지막에 써야 중단되어도 깨진 캐시를 읽지 않음
+        self._write_meta(meta_path, {
+            'version': PARSE_CACHE_VERSION,
+            'format': CACHE_FORMAT,
+            'path': os.path.abspath(file_path),
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'hash': _file_content_hash(file_path),
+            'hasData': has_data,
+            'summary': summary
+        })
+
+    @staticmethod
+    def _write_meta(meta_path, meta):
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+
+def parse_cj_excel_file_cached(file_path, cache=None):
+    """캐시가 있으면 캐시에서, 없으면 엑셀을 읽어 (DataFrame, 파일 요약)을 반환합니다."""
+    if cache:
+        hit = cache.load(file_path)
+        if hit:
+            return hit
+    df, summary = parse_cj_excel_file(file_path)
+    if cache:
+        cache.store(file_path, df, summary)
+    return df, summary
+
+
+def read_file_list(list_path):
+    """파일 목록(한 줄에 경로 하나, 빈 줄과 #으로 시작하는 줄은 무시)을 읽습니다."""
+    with open(list_path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def list_cj_excel_files(folder_path, only=None):
+    """
+    폴더의 엑셀 파일 목록을 파일명 순으로 반환합니다.
+
+    only(파일 경로 목록)가 주어지면 그중 파일명이 같은 파일만 반환합니다.
+    """
+    excel_files = glob.glob(os.path.join(folder_path, "*.xlsx"))
+    if only is not None:
+        names = {os.path.basename(path) for path in only}
+        excel_files = [path for path in excel_files if os.path.basename(path) in names]
+    excel_files.sort()  # 파일명 순으로 정렬
+    return excel_files
+
+
+def iter_parsed_cj_excel_files(excel_files, workers=None, cache=None):
+    """
+    엑셀 파일들을 병렬로 읽어 파일 순서대로 (파일 경로, DataFrame, 요약)을 반환합니다.
+
+    cache(ParsedWorkbookCache)가 주어지면 캐시가 유효한 파일은 읽지 않고,
+    나머지 파일만 읽어서 캐시에 저장합니다. 캐시에서 가져온 파일의 요약에는
+    cached=True가 들어 있습니다.
+    workers가 1이거나 읽을 파일이 하나뿐이면 프로세스 풀 없이 현재 프로세스에서 읽습니다.
+    """
+    cached = {}
+    if cache:
+        for file_path in excel_files:
+            hit = cache.load(file_path)
+            if hit:
+                cached[file_path] = hit
+    to_parse = [file_path for file_path in excel_files if file_path not in cached]
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(to_parse) <= 1:
+        parsed = map(parse_cj_excel_file, to_parse)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(to_parse)))
+        parsed = executor.map(parse_cj_excel_file, to_parse)
+
+    try:
+        for file_path in excel_files:
+            if file_path in cached:
+                yield (file_path, *cached.pop(file_path))
+                continue
+            df, summary = next(parsed)
+            if cache:
+                cache.store(file_path, df, summary)
+            yield file_path, df, summary
+    finally:
+        if executor:
+            executor.shutdown()
+
+
+def concat_product_frames(frames):
+    """파일별 상품 DataFrame을 하나로 합칩니다."""
+    frames = [df for df in frames if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=PRODUCT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _resolve_past_apply_dates(products_df, now_text):
+    """now_text 이전의 적용일시를 즉시 적용('')으로 바꾼 복사본을 반환합니다."""
+    if not now_text:
+        return products_df
+    products_df = products_df.copy()
+    products_df.loc[products_df['applyDate'] <= now_text, 'applyDate'] = ''
+    return products_df
+
+
+def coalesce_products(products_df, precedence='file', now_text=None):
+    """
+    여러 파일에 중복된 (상품코드, 적용일시) 행을 하나로 합칩니다.
+
+    같은 상품이라도 적용일시가 다르면 각각의 예약 가격이므로 모두 남깁니다.
+    now_text('YYYY-MM-DD HH:MM:SS')가 주어지면 그 이전 적용일시는 즉시 적용('')으로
+    바꾼 뒤 합치므로, 이미 지난 예약 가격 중에서는 하나만 남습니다.
+
+    precedence가 'file'이면 가장 최근에 수정된 파일(같으면 파일명 순으로 뒤)의
+    행을, 'applyDate'이면 적용일시가 가장 늦은 행을 남깁니다 (같으면 'file' 기준).
+    'none'이면 합치지 않습니다.
+
+    반환값은 (합친 DataFrame, 가격 충돌 DataFrame)이며, 가격 충돌은 같은
+    상품코드/적용일시에 서로 다른 판매가/수수료율이 있었던 행들과 채택 여부입니다.
+    """
+    if precedence not in COALESCE_MODES:
+        raise ValueError(f"알 수 없는 중복 처리 기준: {precedence} (가능한 값: {', '.join(COALESCE_MODES)})")
+
+    empty_conflicts = pd.DataFrame(columns=['itemCode', 'salePrice', 'commissionRate', 'applyDate', 'fileName', 'selected'])
+    if products_df.empty:
+        return products_df, empty_conflicts
+    if precedence == 'none':
+        return _resolve_past_apply_dates(products_df, now_text), empty_conflicts
+
+    sort_keys = ['fileMtime', 'fileName']
+    if precedence == 'applyDate':
+        # 적용일이 없는 행('')은 가장 이른 것으로 취급
+        sort_keys = ['applyDate'] + sort_keys
+    # 지난 적용일시를 즉시 적용으로 바꾸기 전의 순서로 정렬 (지난 예약 중 가장 늦은 행이 뒤로)
+    ordered = products_df.reset_index(drop=True).sort_values(sort_keys, kind='stable')
+    ordered = _resolve_past_apply_dates(ordered, now_text)
+
+    keys = ['itemCode', 'applyDate']
+    duplicated = ordered.duplicated(subset=keys, keep=False)
+    coalesced = ordered.drop_duplicates(subset=keys, keep='last').sort_index()
+
+    # 같은 상품코드/적용일시에 다른 판매가/수수료율이 있었으면 충돌로 기록
+    duplicates = ordered[duplicated]
+    if duplicates.empty:
+        return coalesced.reset_index(drop=True), empty_conflicts
+
+    price_keys = duplicates['salePrice'].astype(str) + '|' + duplicates['commissionRate'].astype(str)
+    price_counts = price_keys.groupby([duplicates['itemCode'], duplicates['applyDate']]).transform('nunique')
+    conflicts = duplicates[price_counts > 1].copy()
+    conflicts['selected'] = conflicts.index.isin(coalesced.index)
+    conflicts = conflicts.sort_values(keys + sort_keys, kind='stable')[list(empty_conflicts.columns)]
+
+    return coalesced.reset_index(drop=True), conflicts.reset_index(drop=True)
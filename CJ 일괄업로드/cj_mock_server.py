@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+CJ 가격 변경 API 로컬 대역 서버
+
+실제 가격을 바꾸지 않고 업로드 도구를 시험하기 위한 /item/setItemPriceMod 대역입니다.
+응답 지연, 5xx 오류, 429 응답, 상품별 failList 항목, 응답 없이 끊긴 연결을
+설정한 비율로 섞어서 반환합니다. 실제 서버처럼 keep-alive(HTTP/1.1) 연결을 유지합니다.
+
+사용 예시:
+    python cj_mock_server.py --port 8089 --latency-ms 80 --fail-rate 0.02
+    CJ_API_URL=http://127.0.0.1:8089/item/setItemPriceMod python cj_batch_upload_git.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cj_upload_engine import TokenBucket
+
+API_PATH = '/item/setItemPriceMod'
+
+
+class MockCJServerConfig:
+    """대역 서버의 응답 동작 설정"""
+
+    def __init__(self, latency_ms: float = 50.0, jitter_ms: float = 20.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 fail_rate: float = 0.0, max_rps: float = 0.0, drop_rate: float = 0.0):
+        self.latency_ms = latency_ms        # 평균 응답 지연
+        self.jitter_ms = jitter_ms          # 응답 지연 편차 (±)
+        self.error_rate = error_rate        # 500 응답 비율 (요청 단위)
+        self.throttle_rate = throttle_rate  # 429 응답 비율 (요청 단위)
+        self.fail_rate = fail_rate          # failList에 넣을 상품 비율 (상품 단위)
+        self.max_rps = max_rps              # 초당 허용 요청 수 (초과 시 429, 0이면 제한 없음)
+        self.drop_rate = drop_rate          # 요청을 읽은 뒤 응답 없이 연결을 끊는 비율 (요청 단위)
+
+
+class MockCJRequestHandler(BaseHTTPRequestHandler):
+    """setItemPriceMod 요청 처리기"""
+
+    # keep-alive 연결 유지 (클라이언트 연결 풀이 연결을 재사용)
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # 요청마다 로그를 출력하지 않음
+        pass
+
+    def _send_json(self, status_code, body):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        server = self.server
+        config = server.config
+
+        if self.path.split('?')[0] != API_PATH:
+            self._send_json(404, {'error': True, 'returnMessage': 'Not Found'})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            request_data = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            self._send_json(400, {'error': True, 'returnMessage': 'Invalid JSON'})
+            return
+        items = request_data.get('salePriceInformationList') or []
+
+        server.count('requests')
+        server.count('items', len(items))
+
+        if server.should_drop():
+            # 서버가 keep-alive 연결을 먼저 닫은 경우처럼 응답 없이 끊음
+            server.count('dropped')
+            self.close_connection = True
+            return
+
+        if not server.rate_limiter.try_acquire() or random.random() < config.throttle_rate:
+            server.count('throttled')
+            self._send_json(429, {'error': True, 'returnMessage': 'Too Many Requests'})
+            return
+
+        delay_ms = max(0.0, random.uniform(config.latency_ms - config.jitter_ms, config.latency_ms + config.jitter_ms))
+        time.sleep(delay_ms / 1000)
+
+        if random.random() < config.error_rate:
+            server.count('errors')
+            self._send_json(500, {'error': True, 'returnMessage': 'Internal Server Error'})
+            return
+
+        fail_list = [
+            {'itemCode': item.get('itemCode'), 'errorMessage': '판매가 변경 불가 상품입니다. (대역 서버)'}
+            for item in items
+            if random.random() < config.fail_rate
+        ]
+        server.count('failed_items', len(fail_list))
+        self._send_json(200, {
+            'error': False,
+            'returnMessage': 'SUCCESS',
+            'successCount': len(items) - len(fail_list),
+            'failList': fail_list
+        })
+
+
+class MockCJServer(ThreadingHTTPServer):
+    """요청 통계를 모으는 CJ API 대역 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, config: MockCJServerConfig = None):
+        super().__init__((host, port), MockCJRequestHandler)
+        self.config = config or MockCJServerConfig()
+        self.rate_limiter = TokenBucket(self.config.max_rps, capacity=max(1.0, self.config.max_rps))
+        self.stats = {'requests': 0, 'items': 0, 'throttled': 0, 'errors': 0, 'failed_items': 0, 'dropped': 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def api_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+    def count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def should_drop(self) -> bool:
+        """이번 요청을 응답 없이 끊을지 결정합니다."""
+        return random.random() < self.config.drop_rate
+
+    def start_in_background(self):
+        """별도 스레드에서 서버를 실행합니다."""
+        thread = threading.Thread(target=self.serve_forever, name='cj-mock-server', daemon=True)
+        thread.start()
+        return thread
+
+
+def add_mock_server_arguments(parser):
+    """대역 서버 동작 옵션을 argparse 파서에 추가합니다."""
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='평균 응답 지연 (ms)')
+    parser.add_argument('--jitter-ms', type=float, default=20.0, help='응답 지연 편차 (ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='500 응답 비율 (0~1)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='무작위 429 응답 비율 (0~1)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='failList에 넣을 상품 비율 (0~1)')
+    parser.add_argument('--max-rps', type=float, default=0.0, help='초당 허용 요청 수, 초과 시 429 (0이면 제한 없음)')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='응답 없이 연결을 끊는 비율 (0~1)')
+
+
+def config_from_arguments(args) -> MockCJServerConfig:
+    return MockCJServerConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        fail_rate=args.fail_rate,
+        max_rps=args.max_rps,
+        drop_rate=args.drop_rate
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='CJ 가격 변경 API 로컬 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    add_mock_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockCJServer(args.host, args.port, config_from_arguments(args))
+    print(f"🧪 CJ API 대역 서버 실행 중: {server.api_url}")
+    print(f"   CJ_API_URL={server.api_url} 로 설정하면 업로드 도구가 이 서버로 요청합니다.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 요청 통계: {server.stats}")
+        server.server_close()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+CJ 상품/업로드 결과 레코드
+
+상품 하나마다 dict를 만들면 키 해시 테이블 때문에 상품당 수백 바이트가 더 들고,
+같은 파일명 문자열도 상품마다 따로 보관됩니다. 여기의 레코드는 __slots__로
+필드만 보관하고 파일명/적용일시/오류 메시지처럼 반복되는 문자열은 intern하여
+한 객체를 공유합니다.
+
+기존 코드와 호환되도록 record['itemCode'], record.get('commissionRate')처럼
+dict와 같은 방식으로도 접근할 수 있습니다.
+"""
+
+import sys
+
+import pandas as pd
+
+
+class SlotRecord:
+    """__slots__ 레코드에 dict 방식 접근을 제공하는 기반 클래스"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return self.__slots__
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __repr__(self):
+        fields = ', '.join(f"{key}={getattr(self, key)!r}" for key in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class CJProduct(SlotRecord):
+    """업로드할 상품 하나 (applyDate: 'YYYY-MM-DD HH:MM:SS', 없으면 즉시 적용 '')"""
+
+    __slots__ = ('itemCode', 'salePrice', 'commissionRate', 'applyDate', 'fileName')
+
+    def __init__(self, itemCode, salePrice, commissionRate=None, applyDate='', fileName=''):
+        self.itemCode = itemCode
+        self.salePrice = salePrice
+        self.commissionRate = commissionRate
+        self.applyDate = applyDate
+        self.fileName = fileName
+
+
+class CJUploadResult(SlotRecord):
+    """상품 하나의 업로드 결과 (리포트/저널 한 줄)"""
+
+    __slots__ = ('itemCode', 'salePrice', 'commissionRate', 'applyDate', 'fileName', 'success',
+                 'error', 'statusCode', 'elapsed', 'retriable', 'attempts')
+
+    def __init__(self, product, success, error='', statusCode=0, elapsed=0.0, retriable=False, attempts=1):
+        # 상품의 문자열 객체(파일명 등)를 그대로 공유
+        self.itemCode = product['itemCode']
+        self.salePrice = product['salePrice']
+        self.commissionRate = product.get('commissionRate')
+        self.applyDate = product.get('applyDate') or ''
+        self.fileName = product['fileName']
+        self.success = success
+        # 같은 실패 메시지가 여러 상품에 반복되므로 하나만 보관
+        self.error = sys.intern(error) if isinstance(error, str) else error
+        self.statusCode = statusCode
+        self.elapsed = elapsed
+        self.retriable = retriable
+        self.attempts = attempts
+
+
+def products_from_frame(products_df):
+    """
+    로더가 만든 상품 DataFrame을 CJProduct 목록으로 바꿉니다.
+
+    열 단위로 꺼내서 만들며, 파일명과 적용일시 문자열은 intern합니다.
+    """
+    if products_df is None or products_df.empty:
+        return []
+    intern = sys.intern
+    return [
+        CJProduct(item_code, sale_price, commission_rate, intern(apply_date), intern(file_name))
+        for item_code, sale_price, commission_rate, apply_date, file_name in zip(
+            products_df['itemCode'].tolist(),
+            products_df['salePrice'].tolist(),
+            products_df['commissionRate'].tolist(),
+            products_df['applyDate'].tolist(),
+            products_df['fileName'].tolist()
+        )
+    ]
+
+
+def _to_number(value):
+    """pd.to_numeric(errors='coerce')처럼 숫자로 바꿀 수 없으면 None을 반환합니다."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if not isinstance(value, (int, float)):
+        try:
+            value = float(str(value).strip())
+        except ValueError:
+            return None
+    return None if value != value else value
+
+
+def products_from_rows(rows, file_name):
+    """
+    (상품코드, 판매가, 수수료율) 행 목록을 CJProduct 목록으로 바꿉니다.
+
+    CJ 엑셀추출이 분할 파일 A~C열에 쓰는 행을 파일을 거치지 않고 바로 받을 때
+    사용하며, 엑셀 로더(parse_cj_excel_file)와 같은 규칙으로 정리합니다.
+    상품코드나 판매가가 없는 행은 제외하고, 적용일시는 즉시 적용('')입니다.
+    """
+    file_name = sys.intern(file_name)
+    apply_date = sys.intern('')
+    products = []
+    for item_code, sale_price, commission_rate in rows:
+        sale_price = _to_number(sale_price)
+        if item_code is None or sale_price is None:
+            continue
+        products.append(CJProduct(
+            str(item_code).replace('.0', ''),
+            int(sale_price),
+            _to_number(commission_rate),
+            apply_date,
+            file_name
+        ))
+    return products
+
+
+def records_to_frame(records, record_type=CJProduct):
+    """레코드 목록을 DataFrame으로 바꿉니다 (리포트 저장용)."""
+    columns = list(record_type.__slots__)
+    return pd.DataFrame(
+        [[record[column] for column in columns] for record in records],
+        columns=columns
+    )
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+CJ 할인 분할 → 일괄 업로드 통합 파이프라인
+
+CJ 엑셀추출(cjsales_git.py)이 원본 엑셀을 읽어 가공한 행을 분할 파일로 저장하고
+일괄 업로드(cj_batch_upload_git.py)가 그 파일들을 다시 읽는 대신, 가공한 행을
+메모리에서 바로 업로드 단계로 넘깁니다.
+분할 엑셀 파일은 감사(기록)용으로만 백그라운드에서 저장하며, 끌 수도 있습니다.
+"""
+
+import os
+import sys
+import queue
+import argparse
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리
+PROJECT_ROOT = Path(__file__).parent
+
+# CJ 엑셀추출 폴더 (cjsales_git.py가 있는 위치)
+CJ_SALES_DIR = os.getenv("CJ_SALES_DIR", str(PROJECT_ROOT.parent / "CJ 엑셀추출"))
+if CJ_SALES_DIR not in sys.path:
+    sys.path.append(CJ_SALES_DIR)
+
+import cjsales_git as splitter
+import cj_batch_upload_git as uploader
+from cj_products import products_from_rows
+from cjsales_manifest import ChunkManifest, hash_rows
+
+# --- 사용자 설정 부분 ---
+# (원본/양식 파일, 분할 크기 등은 cjsales_git.py, 업로드 설정은 cj_batch_upload_git.py 설정을 따름)
+
+# 1. 분할 파일을 감사 기록으로 저장할지 여부 (0이면 저장하지 않음)
+#    저장 위치는 CJ_OUTPUT_DIR (업로드와 함께 실행되므로 CJ_SPLIT_WORKERS와 관계없이 한 스레드에서 저장)
+#    저장한 분할 파일은 cjsales_git.py와 같은 매니페스트/변경 파일 목록에 기록
+PIPELINE_AUDIT = os.getenv("CJ_PIPELINE_AUDIT", "1").lower() in ("1", "true", "yes")
+
+# --- 코드 실행 부분 ---
+
+class ChunkAuditWriter:
+    """
+    분할 파일(감사 기록)을 백그라운드 스레드에서 저장합니다.
+
+    submit한 작업은 크기가 제한된 대기열을 거쳐 cjsales_git.generate_chunk_files로
+    넘어가므로, 파일 저장이 업로드를 기다리게 하지 않고 메모리도 일정합니다.
+    저장 중 오류가 나도 업로드는 계속되며, close()에서 결과를 알려줍니다.
+
+    리더/업로드 스레드와 연결 풀이 동작 중인 프로세스를 fork하면 잠긴 락을
+    물려받아 멈출 수 있으므로, 프로세스 풀 없이 이 스레드에서 하나씩 저장합니다.
+    """
+
+    def __init__(self, queue_size):
+        self._jobs = queue.Queue(maxsize=max(1, queue_size))
+        self._end = object()
+        self._finished = False
+        self.result = (0, [])
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="cjsales-audit-writer", daemon=True)
+        self._thread.start()
+
+    def _iter_jobs(self):
+        while True:
+            job = self._jobs.get()
+            if job is self._end:
+                self._finished = True
+                return
+            yield job
+
+    def _run(self):
+        try:
+            self.result = splitter.generate_chunk_files(self._iter_jobs(), None, workers=1)
+        except Exception as e:
+            self.error = e
+            # 남은 작업은 버려서 submit이 멈추지 않게 함
+            if not self._finished:
+                for _ in self._iter_jobs():
+                    pass
+
+    def submit(self, file_num, output_path, rows):
+        self._jobs.put((file_num, output_path, rows))
+
+    def close(self):
+        """남은 파일을 모두 저장할 때까지 기다리고 (성공 수, 실패한 파일 번호 목록)을 반환합니다."""
+        self._jobs.put(self._end)
+        self._thread.join()
+        return self.result
+
+
+def save_audit_manifest(manifest, written, failed_files):
+    """
+    감사 기록으로 저장한 분할 파일을 cjsales_git.py와 같은 매니페스트에 기록합니다.
+
+    written은 {파일 번호: (상태, 파일명, 시작 행, 끝 행, 행 수, 내용 해시)}이며,
+    저장에 실패한 파일은 다음 실행에서 다시 만들도록 이전 기록을 유지합니다.
+    새로 생기거나 바뀐 파일 목록도 함께 저장하고 그 개수를 반환합니다.
+    """
+    changed_paths = []
+    for file_num, (status, file_name, start_row, end_row, row_count, content_hash) in sorted(written.items()):
+        if file_num in failed_files:
+            manifest.keep_previous(file_num)
+            continue
+        manifest.record(file_num, file_name, start_row, end_row, row_count, content_hash)
+        if status != 'unchanged':
+            changed_paths.append(os.path.join(splitter.output_dir, file_name))
+    manifest.save()
+    splitter.write_changed_list(changed_paths)
+    return len(changed_paths)
+
+
+def run_pipeline(resume=False, delta=False, audit=PIPELINE_AUDIT):
+    """원본 엑셀을 읽는 대로 가공한 상품을 CJ API로 업로드합니다."""
+    print(f"\n🔗 분할 → 업로드 통합 파이프라인")
+    print(f"📁 원본 파일: {splitter.source_file}")
+    print(f"📊 분할 크기: {splitter.chunk_size}개 행/묶음")
+
+    if audit and not splitter.check_template_file():
+        return
+
+    source_workbook, source_sheet = splitter.open_source_sheet()
+    if source_workbook is None:
+        return
+
+    audit_writer = None
+    manifest = None
+    # 감사 기록으로 저장할 분할 파일의 매니페스트 기록 (원본을 끝까지 읽었을 때만 반영)
+    written = {}
+    read_complete = False
+    try:
+        print(f"\n⚠️  주의: 원본을 읽는 즉시 상품 가격이 실제로 변경됩니다!")
+        confirm = input(f"\n정말로 진행하시겠습니까? (y/N): ")
+        if confirm.lower() not in ['y', 'yes']:
+            print("취소되었습니다.")
+            return
+
+        if audit:
+            os.makedirs(splitter.output_dir, exist_ok=True)
+            # 분할 파일 작업은 몇 개까지만 대기 (저장이 밀리면 읽기도 잠시 기다림)
+            audit_writer = ChunkAuditWriter(queue_size=4)
+            manifest = ChunkManifest(splitter.MANIFEST_FILE, splitter.manifest_signature())
+            print(f"🗂️  분할 파일은 감사 기록으로 백그라운드에서 저장합니다: {splitter.output_dir}")
+        else:
+            print(f"🗂️  분할 파일을 저장하지 않습니다 (CJ_PIPELINE_AUDIT=0 또는 --no-audit)")
+
+        # 이어하기/변경분 모드는 묶음 단위로 걸러냄
+        product_filter, skipped_counts, coalescer = uploader.make_stream_product_filter(resume, delta)
+        # 분할 파일 이름(감사 기록)과 같은 이름을 상품의 fileName으로 사용
+        today = datetime.now().strftime("%Y-%m-%d")
+        file_summary = []
+
+        def produce(put):
+            nonlocal read_complete
+            chunks = splitter.iter_source_chunks(source_sheet, splitter.chunk_size)
+            for file_num, (start_row, end_row, rows) in enumerate(chunks, start=1):
+                file_name = f"{today}_{file_num}.xlsx"
+                if audit_writer:
+                    content_hash = hash_rows(rows)
+                    written[file_num] = (manifest.status(file_num, content_hash), file_name,
+                                         start_row, end_row, len(rows), content_hash)
+                    audit_writer.submit(file_num, os.path.join(splitter.output_dir, file_name), rows)
+
+                products = products_from_rows(rows, file_name)
+                file_summary.append({'fileName': file_name, 'totalRows': len(rows), 'validProducts': len(products)})
+                products = product_filter(products)
+                print(f"📄 [{file_num}] {file_name} (원본 {start_row}~{end_row}행): {len(products)}개 상품 대기열에 추가")
+
+                for product in products:
+                    put(product)
+            read_complete = True
+
+        products = uploader.stream_products(produce, name="cjsales-reader")
+        if uploader.upload_stream_and_report(products, file_summary, skipped_counts, resume=resume,
+                                             coalescer=coalescer):
+            print(f"\n🎉 통합 파이프라인 업로드가 완료되었습니다!")
+    finally:
+        if audit_writer:
+            print(f"\n🗂️  분할 파일 저장 마무리 중...")
+            success_count, failed_files = audit_writer.close()
+            if audit_writer.error:
+                print(f"⚠️  분할 파일 저장 중 오류가 발생했습니다: {audit_writer.error}")
+            print(f"🗂️  분할 파일: 성공 {success_count}개, 실패 {len(failed_files)}개 ({splitter.output_dir})")
+            if read_complete and not audit_writer.error:
+                changed_count = save_audit_manifest(manifest, written, failed_files)
+                print(f"📝 매니페스트 기록: 새로 생기거나 바뀐 파일 {changed_count}개 ({splitter.CHANGED_LIST_FILE})")
+            else:
+                print(f"⚠️  분할 파일을 모두 저장하지 못해 매니페스트는 갱신하지 않습니다.")
+        source_workbook.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CJ 할인 분할 → 일괄 업로드 통합 파이프라인")
+    parser.add_argument("--resume", action="store_true",
+                        help="업로드 저널을 읽어 이미 같은 가격으로 적용된 상품은 건너뜁니다.")
+    parser.add_argument("--delta", action="store_true",
+                        help="마지막으로 적용된 가격 스냅샷과 비교해 판매가/수수료율이 바뀐 상품만 업로드합니다.")
+    parser.add_argument("--no-audit", action="store_true",
+                        help="감사 기록용 분할 엑셀 파일을 저장하지 않습니다.")
+    args = parser.parse_args()
+
+    try:
+        run_pipeline(resume=args.resume, delta=args.delta, audit=PIPELINE_AUDIT and not args.no_audit)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  사용자에 의해 작업이 중단되었습니다.")
+    except Exception as e:
+        print(f"\n\n❌ 예상치 못한 오류가 발생했습니다: {e}")
+        print("\n💡 이 오류가 계속 발생하면 GitHub Issues에 보고해주세요.")
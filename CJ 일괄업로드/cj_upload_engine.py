@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+CJ 가격 변경 업로드 엔진
+
+여러 요청을 동시에 전송하되, 초당 요청 수(토큰 버킷)와 동시에 처리 중인
+요청 수를 제한하여 CJ API 허용량을 넘지 않도록 합니다.
+적응형 모드에서는 응답 지연과 오류에 따라 초당 요청 수와 동시 요청 수를
+AIMD(가산 증가, 승산 감소) 방식으로 자동 조절합니다. 요청당 상품 수는
+요청 크기/검증 오류가 날 때만 줄입니다.
+일시적인 실패는 재시도 대기열에서 지수 백오프 후 다시 묶어서 전송합니다.
+"""
+
+import heapq
+import itertools
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class TokenBucket:
+    """초당 rate개의 토큰을 채우는 스레드 안전 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        # rate가 0 이하이면 제한 없음
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def set_rate(self, rate: float):
+        """초당 토큰 수를 바꿉니다 (지금까지 쌓인 토큰은 이전 속도로 계산)."""
+        with self._lock:
+            if self.rate > 0:
+                self._refill()
+            else:
+                self._last = time.monotonic()
+            self.rate = float(rate)
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰을 얻을 때까지 대기합니다."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                # 대기 중에 제한이 풀린 경우
+                if self.rate <= 0:
+                    return
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait_seconds = (tokens - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """대기하지 않고 토큰을 얻을 수 있으면 True를 반환합니다."""
+        if self.rate <= 0:
+            return True
+
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+
+# failList/returnMessage 중 잠시 후 다시 시도하면 성공할 수 있는 메시지에 포함되는 문구
+DEFAULT_RETRIABLE_MESSAGES = ('잠시 후', '일시적', '처리 중', '처리중', 'timeout', 'Timeout', 'TIMEOUT')
+
+
+def is_retriable_failure(status_code: int, error_message: str, retriable_messages=DEFAULT_RETRIABLE_MESSAGES) -> bool:
+    """
+    실패를 재시도 가능/불가능으로 분류합니다.
+
+    연결 오류(상태 코드 없음), 413(요청이 너무 큼, 더 작게 나눠 다시 보냄), 429, 5xx는
+    재시도 가능하고, 그 외(4xx, 상품별 failList 등)는 일시적 오류 문구가 포함된
+    경우에만 재시도 가능합니다.
+    """
+    status_code = status_code or 0
+    if status_code in (0, 413, 429) or status_code >= 500:
+        return True
+    return any(keyword in str(error_message) for keyword in retriable_messages)
+
+
+class RetryQueue:
+    """
+    재시도 대기열 (지수 백오프 + 지터)
+
+    n번째 재시도는 base_delay * 2^(n-1)초(최대 max_delay) 범위의 절반~전체 중
+    무작위 시간만큼 기다린 뒤 꺼낼 수 있습니다.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 2.0, max_delay: float = 60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._heap = []
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, item, retry_number: int) -> bool:
+        """retry_number번째 재시도를 예약합니다. 재시도 횟수를 넘으면 False를 반환합니다."""
+        if retry_number > self.max_retries:
+            return False
+        delay = min(self.max_delay, self.base_delay * 2 ** (retry_number - 1))
+        delay = random.uniform(delay / 2, delay)
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), item))
+        return True
+
+    def pop_ready(self) -> list:
+        """대기 시간이 지난 항목들을 꺼냅니다."""
+        now = time.monotonic()
+        ready = []
+        while self._heap and self._heap[0][0] <= now:
+            ready.append(heapq.heappop(self._heap)[2])
+        return ready
+
+    def seconds_until_ready(self) -> float:
+        """가장 먼저 꺼낼 수 있는 항목까지 남은 시간"""
+        if not self._heap:
+            return 0.0
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+
+def is_congestion_signal(result) -> bool:
+    """서버 과부하 신호인지 확인 (429, 5xx, 시간 초과, 연결 오류)"""
+    if result.get('success'):
+        return False
+    status_code = result.get('status_code') or 0
+    return status_code == 429 or status_code >= 500 or result.get('timeout', False) or status_code == 0
+
+
+def is_request_size_signal(result) -> bool:
+    """
+    요청당 상품 수를 줄여야 하는 신호인지 확인합니다.
+
+    413(요청이 너무 큼), 400(요청 검증 실패), 어느 상품인지 알 수 없는 failList
+    항목처럼 한 요청에 담긴 상품 전체가 함께 실패하는 경우입니다.
+    """
+    status_code = result.get('status_code') or 0
+    if status_code in (400, 413):
+        return True
+    if not result.get('success'):
+        return False
+    fail_list = (result.get('data') or {}).get('failList') or []
+    return any(not str(fail.get('itemCode', '')).strip() for fail in fail_list)
+
+
+class AIMDController:
+    """
+    초당 요청 수, 동시 요청 수, 요청당 상품 수를 AIMD 방식으로 조절합니다.
+
+    - 과부하 신호(429/5xx/시간 초과/연결 오류): 초당 요청 수와 동시 요청 수를 절반으로
+      줄입니다. 요청당 상품 수는 그대로 둡니다 (요청을 잘게 나누면 요청 수가 늘어
+      오히려 과부하가 심해짐).
+    - 요청 크기/검증 오류(is_request_size_signal): 요청당 상품 수만 절반으로 줄입니다.
+    - 최근 sample_size개 요청의 p95 응답 지연과 오류율이 기준 이하: 한 단계씩 늘립니다.
+
+    max_rate가 0(제한 없음)이면 처음 과부하가 감지될 때 최근 완료 속도의 절반으로
+    초당 요청 수 제한을 시작합니다. 줄인 직후에는 이미 전송 중이던 요청들의 결과로
+    다시 줄이지 않도록 그만큼 기다립니다.
+    """
+
+    def __init__(self, max_concurrency: int, max_batch_size: int = 1, max_rate: float = 0.0,
+                 latency_threshold: float = 1.0, error_threshold: float = 0.05,
+                 sample_size: int = 20, decrease_factor: float = 0.5, min_rate: float = 0.5):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_rate = max(0.0, float(max_rate))
+        self.min_rate = min_rate
+        self.latency_threshold = latency_threshold
+        self.error_threshold = error_threshold
+        self.sample_size = max(1, sample_size)
+        self.decrease_factor = decrease_factor
+        # 요청당 상품 수는 최대값의 10%씩, 초당 요청 수는 상한의 10%씩 늘림
+        self.batch_step = max(1, self.max_batch_size // 10)
+        self.rate_step = self.max_rate / 10
+
+        # 동시 요청 수는 최대값의 절반, 요청당 상품 수와 초당 요청 수는 설정값에서 시작
+        self.concurrency = max(1, math.ceil(self.max_concurrency / 2))
+        self.batch_size = self.max_batch_size
+        self.rate = self.max_rate
+
+        self._latencies = []
+        self._errors = 0
+        self._completed_at = deque(maxlen=self.sample_size * 2)
+        self._since_decrease = 0
+        self._since_batch_decrease = 0
+        self._in_flight_at_decrease = 0
+        self._in_flight_at_batch_decrease = 0
+        self.increases = 0
+        self.decreases = 0
+        self.batch_decreases = 0
+
+    def observe(self, result):
+        """요청 하나의 결과를 반영합니다."""
+        self._completed_at.append(time.monotonic())
+        self._since_decrease += 1
+        self._since_batch_decrease += 1
+
+        if is_congestion_signal(result):
+            # 감소 직후 함께 전송 중이던 나머지 요청들의 결과는 무시
+            if self._since_decrease >= self._in_flight_at_decrease:
+                self._decrease()
+            return
+
+        if is_request_size_signal(result):
+            if self._since_batch_decrease >= self._in_flight_at_batch_decrease:
+                self._decrease_batch_size()
+            return
+
+        self._latencies.append(result.get('elapsed', 0.0))
+        if not result.get('success'):
+            self._errors += 1
+
+        if len(self._latencies) >= self.sample_size:
+            latencies = sorted(self._latencies)
+            p95 = latencies[max(0, math.ceil(0.95 * len(latencies)) - 1)]
+            error_rate = self._errors / len(latencies)
+            if p95 <= self.latency_threshold and error_rate <= self.error_threshold:
+                self._increase()
+            self._latencies = []
+            self._errors = 0
+
+    def _increase(self):
+        concurrency = min(self.max_concurrency, self.concurrency + 1)
+        batch_size = min(self.max_batch_size, self.batch_size + self.batch_step)
+        rate = self.rate
+        if rate:
+            rate = rate + self.rate_step
+            if self.max_rate:
+                rate = min(self.max_rate, rate)
+        if (concurrency, batch_size, rate) != (self.concurrency, self.batch_size, self.rate):
+            self.increases += 1
+        self.concurrency, self.batch_size, self.rate = concurrency, batch_size, rate
+
+    def _recent_rate(self) -> float:
+        """최근 완료된 요청들의 초당 완료 수"""
+        if len(self._completed_at) < 2:
+            return float(self.concurrency)
+        span = self._completed_at[-1] - self._completed_at[0]
+        return (len(self._completed_at) - 1) / max(span, 1e-3)
+
+    def _decrease(self):
+        rate = self.rate or self._recent_rate()
+        if not self.rate_step:
+            # 제한 없이 시작한 경우 처음 정한 제한의 10%씩 다시 늘림
+            self.rate_step = max(self.min_rate, rate * self.decrease_factor / 10)
+        self._in_flight_at_decrease = self.concurrency
+        self.rate = max(self.min_rate, rate * self.decrease_factor)
+        self.concurrency = max(1, int(self.concurrency * self.decrease_factor))
+        self.decreases += 1
+        self._since_decrease = 0
+        self._latencies = []
+        self._errors = 0
+
+    def _decrease_batch_size(self):
+        self._in_flight_at_batch_decrease = self.concurrency
+        self.batch_size = max(1, int(self.batch_size * self.decrease_factor))
+        self.batch_decreases += 1
+        self._since_batch_decrease = 0
+
+    def describe(self) -> str:
+        rate = f"{self.rate:.1f}" if self.rate else "제한 없음"
+        return (f"초당 요청 {rate}, 동시 요청 {self.concurrency}/{self.max_concurrency}, "
+                f"요청당 상품 {self.batch_size}/{self.max_batch_size}")
+
+
+class ConcurrentUploader:
+    """작업을 스레드 풀로 동시에 처리하는 업로드 엔진"""
+
+    def __init__(self, workers: int = 4, rate_limit: float = 5.0, max_in_flight: int = 0):
+        self.workers = max(1, workers)
+        # 동시에 제출해 둘 최대 요청 수 (0이면 워커 수의 2배)
+        self.max_in_flight = max(self.workers, max_in_flight or self.workers * 2)
+        self.rate_limiter = TokenBucket(rate_limit)
+
+    def _send(self, send, job):
+        self.rate_limiter.acquire()
+        started = time.monotonic()
+        try:
+            result = send(job)
+        except Exception as e:
+            result = {"success": False, "error": f"예상치 못한 오류: {e}"}
+        result.setdefault("elapsed", time.monotonic() - started)
+        return result
+
+    def run(self, jobs, send, controller: AIMDController = None):
+        """
+        jobs를 동시에 처리하며 완료되는 순서대로 (job, result)를 반환합니다.
+
+        jobs는 지연 생성되는 이터러블이어도 되며, 동시에 제출되는 요청은
+        max_in_flight개를 넘지 않습니다. controller가 주어지면 동시 요청 수와
+        초당 요청 수는 controller.concurrency, controller.rate를 따르고,
+        완료된 결과를 controller에 알려줍니다.
+        """
+        def in_flight_limit():
+            if not controller:
+                return self.max_in_flight
+            if controller.rate != self.rate_limiter.rate:
+                self.rate_limiter.set_rate(controller.rate)
+            return controller.concurrency
+
+        def collect(pending):
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if controller:
+                    controller.observe(result)
+                yield pending.pop(future), result
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {}
+            jobs = iter(jobs)
+            while True:
+                # 창이 줄어든 경우 처리 중인 요청이 창 아래로 내려갈 때까지 대기
+                while len(pending) >= in_flight_limit():
+                    yield from collect(pending)
+                job = next(jobs, None)
+                if job is None:
+                    break
+                pending[executor.submit(self._send, send, job)] = job
+
+            while pending:
+                yield from collect(pending)
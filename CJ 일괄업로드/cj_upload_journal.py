@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+CJ 업로드 저널
+
+상품별 업로드 결과를 완료되는 즉시 JSONL 파일에 한 줄씩 추가합니다.
+작업이 중간에 중단되어도 --resume 모드로 이미 적용된 상품을 건너뛸 수 있습니다.
+마지막 적용 가격 스냅샷은 --delta 모드에서 바뀐 상품만 골라내는 데 사용합니다.
+
+같은 상품이라도 적용일시(applyDate)가 다르면 별도의 예약 가격이므로
+저널과 스냅샷 모두 (상품코드, 적용일시) 단위로 비교합니다. 적용일시가 지난
+예약 가격은 그 상품의 즉시 적용('') 가격으로 합쳐서, 예약 가격이 적용된 뒤
+이전 즉시 적용 가격으로 되돌리는 업로드를 건너뛰지 않게 합니다.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+
+def _normalize_rate(value):
+    """수수료율 비교용 정규화 (None/NaN → None)"""
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value != value else value
+
+
+def price_key(product) -> Tuple[str, str]:
+    """저널/스냅샷에서 가격을 구분하는 키 (상품코드, 적용일시; 즉시 적용은 '')"""
+    return product['itemCode'], product.get('applyDate') or ''
+
+
+def applied_price(product) -> Tuple[int, float]:
+    """저널/스냅샷과 비교하는 가격 (판매가, 정규화한 수수료율)"""
+    return product['salePrice'], _normalize_rate(product.get('commissionRate'))
+
+
+def _now_text() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def supersede_past_slots(prices: Dict, applied_at: Dict, now_text: str):
+    """
+    적용일시가 now_text 이전인 예약 가격을 그 상품의 즉시 적용('') 가격으로 합칩니다.
+
+    applied_at은 즉시 적용 키별로 가격이 적용된 시각입니다. 예약 가격은 적용일시에
+    적용되므로, 즉시 적용 가격보다 늦게 적용된 예약 가격이 현재 가격(즉시 적용 키)이
+    되고 그보다 먼저 적용된 예약 가격은 버립니다. prices와 applied_at을 직접 바꿉니다.
+    """
+    past_keys = sorted((key for key in prices if key[1] and key[1] <= now_text), key=lambda key: key[1])
+    for key in past_keys:
+        item_code, apply_date = key
+        price = prices.pop(key)
+        immediate_key = (item_code, '')
+        if immediate_key not in prices or apply_date >= applied_at.get(immediate_key, ''):
+            prices[immediate_key] = price
+            applied_at[immediate_key] = apply_date
+
+
+class UploadJournal:
+    """
+    추가 전용(append-only) JSONL 업로드 저널
+
+    매 기록마다 fsync하면 디스크가 병목이 되므로 sync_every개 기록마다,
+    또는 마지막 동기화 후 sync_interval초가 지나면 한 번에 fsync합니다.
+    """
+
+    def __init__(self, path: str, resume: bool = False, sync_every: int = 200, sync_interval: float = 2.0):
+        self.path = path
+        self.sync_every = max(1, sync_every)
+        self.sync_interval = sync_interval
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # 이어하기가 아니면 새 저널로 시작
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+        if resume and self._file.tell() > 0:
+            # 중단 시점에 잘린 마지막 줄 뒤에 이어 쓰지 않도록 줄바꿈 보장
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write('\n')
+
+    def record(self, result: Dict):
+        """상품 하나의 업로드 결과를 기록합니다."""
+        entry = {
+            'itemCode': result['itemCode'],
+            'salePrice': result['salePrice'],
+            'commissionRate': _normalize_rate(result.get('commissionRate')),
+            'applyDate': result.get('applyDate') or '',
+            'success': bool(result['success']),
+            'error': result.get('error', ''),
+            'recordedAt': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+
+        with self._lock:
+            self._file.write(line)
+            self._pending += 1
+            if self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+                self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    @staticmethod
+    def load_applied(path: str, applied_at: Dict = None, now_text: str = None) -> Dict[Tuple[str, str], Tuple[int, float]]:
+        """
+        저널에서 성공적으로 적용된 (상품코드, 적용일시)별 (판매가, 수수료율)을 읽어옵니다.
+
+        같은 상품/적용일시가 여러 번 기록되어 있으면 마지막 기록을 따르며,
+        마지막 기록이 실패이면 적용되지 않은 것으로 봅니다.
+        중단 시점에 잘린 마지막 줄은 무시합니다.
+        적용일시가 now_text(기본값: 현재 시각) 이전인 예약 가격은 즉시 적용 가격으로
+        합치며(supersede_past_slots), applied_at(dict)을 넘기면 즉시 적용 가격의
+        적용 시각을 채웁니다.
+        """
+        applied = {}
+        if applied_at is None:
+            applied_at = {}
+        if not os.path.exists(path):
+            return applied
+
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if 'itemCode' not in entry:
+                    continue
+                # 적용일시가 없는 이전 저널 기록은 즉시 적용으로 봄
+                key = price_key(entry)
+                if entry.get('success'):
+                    applied[key] = (entry['salePrice'], entry.get('commissionRate'))
+                    if not key[1]:
+                        applied_at[key] = entry.get('recordedAt', '')
+                else:
+                    applied.pop(key, None)
+                    applied_at.pop(key, None)
+        supersede_past_slots(applied, applied_at, now_text or _now_text())
+        return applied
+
+
+def filter_already_applied(products: List[Dict], applied: Dict[Tuple[str, str], Tuple[int, float]]):
+    """
+    같은 적용일시에 이미 같은 가격으로 적용된 상품을 제외한 (남은 상품, 건너뛴 상품 수)를 반환합니다.
+
+    적용일시가 다른 예약 가격은 다른 가격으로 보고 남깁니다.
+    """
+    remaining = []
+    skipped = 0
+    for product in products:
+        previous = applied.get(price_key(product))
+        if previous and previous == applied_price(product):
+            skipped += 1
+        else:
+            remaining.append(product)
+    return remaining, skipped
+
+
+class PriceSnapshot:
+    """
+    마지막으로 성공 적용된 (판매가, 수수료율) 스냅샷
+
+    (상품코드, 적용일시)별 최신 적용 가격을 JSON 파일 하나에 보관하며, 변경분 모드에서
+    가격이나 수수료율이 달라진 상품만 업로드하는 기준으로 사용합니다.
+    적용일시가 now_text(기본값: 현재 시각) 이전인 예약 가격은 읽을 때와 갱신할 때
+    즉시 적용 가격으로 합칩니다 (supersede_past_slots).
+    파일에는 [상품코드, 적용일시, 판매가, 수수료율, 적용 시각] 목록으로 저장합니다.
+    """
+
+    def __init__(self, path: str, now_text: str = None):
+        self.path = path
+        self.now_text = now_text
+        self.prices = {}
+        # 즉시 적용 키별 적용 시각 (모르면 '')
+        self.applied_at = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                # 상품코드만 키로 쓰던 이전 형식은 즉시 적용 가격으로 읽음
+                self.prices = {(code, ''): tuple(value) for code, value in data.items()}
+            else:
+                for code, apply_date, sale_price, commission_rate, *rest in data:
+                    self.prices[(code, apply_date)] = (sale_price, commission_rate)
+                    if rest and rest[0]:
+                        self.applied_at[(code, apply_date)] = rest[0]
+        supersede_past_slots(self.prices, self.applied_at, self.now_text or _now_text())
+
+    def merge(self, applied: Dict[Tuple[str, str], Tuple[int, float]], applied_at: Dict = None):
+        """
+        적용된 가격으로 스냅샷을 갱신합니다.
+
+        applied_at에 없는 즉시 적용 가격은 지금 적용된 것으로 봅니다.
+        """
+        now_text = self.now_text or _now_text()
+        applied_at = applied_at or {}
+        for key, (sale_price, commission_rate) in applied.items():
+            self.prices[key] = (sale_price, _normalize_rate(commission_rate))
+            if not key[1]:
+                self.applied_at[key] = applied_at.get(key) or now_text
+        supersede_past_slots(self.prices, self.applied_at, now_text)
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 스냅샷이 깨지지 않게 저장합니다."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump([[code, apply_date, sale_price, commission_rate, self.applied_at.get((code, apply_date), '')]
+                       for (code, apply_date), (sale_price, commission_rate) in self.prices.items()],
+                      f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+CJ 업로드 결과 리포트
+
+상품별 최종 결과를 확정되는 즉시 CSV 파일에 한 줄씩 추가합니다.
+전체 결과를 메모리에 모아두지 않으므로 대량 업로드에도 메모리 사용량이 일정하고,
+작업이 중간에 중단되어도 그때까지의 결과가 CSV에 남습니다.
+최종 엑셀 리포트는 CSV를 한 줄씩 읽어 openpyxl 쓰기 전용 모드로 만듭니다.
+"""
+
+import csv
+import os
+import threading
+import time
+from typing import Dict
+
+from openpyxl import Workbook
+
+# 리포트 열 순서 (batch_upload_to_cj의 상품별 결과 키)
+REPORT_COLUMNS = [
+    'itemCode', 'salePrice', 'commissionRate', 'applyDate', 'fileName', 'success',
+    'error', 'statusCode', 'elapsed', 'retriable', 'attempts'
+]
+
+
+def _to_bool(value):
+    return value == 'True'
+
+
+def _to_optional_float(value):
+    return float(value) if value not in ('', 'nan') else None
+
+
+# CSV에서 읽은 문자열을 원래 자료형으로 되돌리는 변환기
+_COLUMN_TYPES = {
+    'salePrice': int,
+    'commissionRate': _to_optional_float,
+    'success': _to_bool,
+    'statusCode': lambda value: int(value or 0),
+    'elapsed': lambda value: float(value or 0.0),
+    'retriable': _to_bool,
+    'attempts': lambda value: int(value or 1),
+}
+
+
+class ResultReportWriter:
+    """
+    추가 전용(append-only) CSV 결과 기록기
+
+    flush_every개 기록마다, 또는 마지막 flush 후 flush_interval초가 지나면
+    파일에 내보냅니다. 전체/성공 건수만 메모리에 유지합니다.
+    """
+
+    def __init__(self, path: str, flush_every: int = 200, flush_interval: float = 2.0):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.success_count = 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # utf-8-sig: 엑셀에서 CSV를 바로 열어도 한글이 깨지지 않음
+        self._file = open(path, 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=REPORT_COLUMNS, extrasaction='ignore')
+        self._writer.writeheader()
+
+    def record(self, result: Dict):
+        """상품 하나의 최종 결과를 기록합니다."""
+        with self._lock:
+            self._writer.writerow(result)
+            self.count += 1
+            if result['success']:
+                self.success_count += 1
+            self._pending += 1
+            if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def _flush(self):
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._flush()
+                self._file.close()
+
+
+def iter_report_rows(path: str):
+    """결과 CSV를 한 줄씩 읽어 원래 자료형의 dict로 반환합니다."""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            for column, convert in _COLUMN_TYPES.items():
+                if column in row:
+                    row[column] = convert(row[column])
+            yield row
+
+
+def summarize_report(path: str, failed_limit: int = 10, success_limit: int = 5) -> Dict:
+    """
+    결과 CSV를 한 번 훑어 통계와 실패/성공 샘플을 모읍니다.
+
+    샘플은 각각 최대 failed_limit, success_limit개만 보관합니다.
+    """
+    summary = {'total': 0, 'success': 0, 'first_try': 0, 'failed': [], 'succeeded': []}
+    for row in iter_report_rows(path):
+        summary['total'] += 1
+        if row['success']:
+            summary['success'] += 1
+            if row.get('attempts', 1) == 1:
+                summary['first_try'] += 1
+            if len(summary['succeeded']) < success_limit:
+                summary['succeeded'].append(row)
+        elif len(summary['failed']) < failed_limit:
+            summary['failed'].append(row)
+    return summary
+
+
+def write_report_workbook_from_csv(csv_path: str, report_path: str, conflicts=None):
+    """
+    결과 CSV로 엑셀 리포트를 만듭니다.
+
+    openpyxl 쓰기 전용 모드로 한 줄씩 내보내므로 결과 수와 관계없이
+    메모리 사용량이 일정합니다. conflicts(가격 충돌 DataFrame)가 있으면
+    '가격충돌' 시트를 추가합니다.
+    """
+    workbook = Workbook(write_only=True)
+
+    sheet = workbook.create_sheet('리포트')
+    sheet.append(REPORT_COLUMNS)
+    for row in iter_report_rows(csv_path):
+        sheet.append([row.get(column) for column in REPORT_COLUMNS])
+
+    if conflicts is not None and not conflicts.empty:
+        conflict_sheet = workbook.create_sheet('가격충돌')
+        conflict_sheet.append(list(conflicts.columns))
+        for values in conflicts.itertuples(index=False):
+            conflict_sheet.append([None if value != value else value for value in values])
+
+    workbook.save(report_path)
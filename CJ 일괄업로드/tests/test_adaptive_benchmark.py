@@ -0,0 +1,33 @@
+"""초당 요청 수 제한(429)이 있는 대역 서버에서 적응형 모드가 고정 모드보다 나쁘지 않은지 확인합니다."""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cj_batch_upload_git as uploader
+from cj_benchmark import run_benchmark
+from cj_mock_server import MockCJServerConfig
+
+
+def _run(adaptive):
+    random.seed(7)
+    results, elapsed, server = run_benchmark(
+        MockCJServerConfig(latency_ms=20, jitter_ms=5, max_rps=10), 1000,
+        batch_size=1000, items_per_request=50, workers=8, rate_limit=0, max_retries=3, adaptive=adaptive
+    )
+    return sum(1 for r in results if r['success']), server.stats
+
+
+def test_adaptive_is_not_worse_than_fixed_under_max_rps(monkeypatch):
+    monkeypatch.setattr(uploader, 'RETRY_BASE_DELAY', 0.2)
+    monkeypatch.setattr(uploader, 'RETRY_MAX_DELAY', 1.0)
+
+    fixed_success, fixed_stats = _run(adaptive=False)
+    adaptive_success, adaptive_stats = _run(adaptive=True)
+
+    assert adaptive_success >= fixed_success
+    # 429에 요청을 잘게 나누지 않으므로 요청 수도 고정 모드보다 많지 않음
+    assert adaptive_stats['requests'] <= fixed_stats['requests']
+    assert adaptive_stats['items'] <= fixed_stats['items']
@@ -0,0 +1,65 @@
+"""keep-alive 연결이 응답 없이 끊겼을 때 전송 계층에서 다시 보내는지 대역 서버로 확인합니다."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cj_api_client_simple import CJAPIClient
+from cj_mock_server import MockCJServer, MockCJServerConfig
+from cj_upload_engine import is_retriable_failure
+
+
+class DropSecondRequestServer(MockCJServer):
+    """두 번째 요청만 응답 없이 끊는 대역 서버 (첫 요청으로 연결이 풀에 들어간 뒤)"""
+
+    def should_drop(self):
+        return self.stats['requests'] == 2
+
+
+def _start(server_class, monkeypatch):
+    server = server_class(config=MockCJServerConfig(latency_ms=0, jitter_ms=0))
+    server.start_in_background()
+    monkeypatch.setenv('CJ_API_URL', server.api_url)
+    monkeypatch.setenv('CJ_AUTH_KEY', 'test')
+    monkeypatch.setenv('NO_PROXY', '127.0.0.1')
+    return server
+
+
+def _change_price(client):
+    client.verbose = False
+    return client.change_price('테스트', [{'itemCode': '1001', 'salePrice': 10000}])
+
+
+@pytest.fixture
+def drop_server(monkeypatch):
+    server = _start(DropSecondRequestServer, monkeypatch)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_closed_without_response_is_resent(drop_server):
+    client = CJAPIClient(pool_size=1, max_retries=1)
+
+    assert _change_price(client)['success'] is True
+    result = _change_price(client)
+    client.close()
+
+    assert result['success'] is True
+    assert drop_server.stats['dropped'] == 1
+    assert drop_server.stats['requests'] == 3
+
+
+def test_dropped_connection_without_retries_goes_to_the_retry_queue(drop_server):
+    client = CJAPIClient(pool_size=1, max_retries=0)
+
+    _change_price(client)
+    result = _change_price(client)
+    client.close()
+
+    assert result['success'] is False
+    assert drop_server.stats['requests'] == 2
+    assert is_retriable_failure(result.get('status_code'), result['error'])
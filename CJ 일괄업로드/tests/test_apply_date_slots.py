@@ -0,0 +1,186 @@
+"""같은 상품코드의 여러 적용일시(예약 가격)가 로드/정렬/이어하기에서 유지되는지 확인합니다."""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cj_batch_upload_git as uploader
+from cj_products import CJProduct
+from cj_upload_journal import UploadJournal, PriceSnapshot, filter_already_applied
+
+
+def _day(offset):
+    return (datetime.now() + timedelta(days=offset)).strftime('%Y-%m-%d')
+
+
+def _write_cj_excel(path, rows, mtime):
+    """CJ할인설정 양식처럼 3행을 헤더로, 그 아래에 데이터를 씁니다."""
+    df = pd.DataFrame(rows, columns=['상품코드', '판매가', '수수료율', '공급가', '적용일', '적용시간'])
+    df.to_excel(path, startrow=2, index=False)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def excel_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploader, 'open_parse_cache', lambda *args: None)
+    return tmp_path
+
+
+def test_week_of_slots_for_one_item_survives_load_and_schedule(excel_folder):
+    _write_cj_excel(excel_folder / 'week.xlsx', [
+        ['1001', 10000, 10, None, _day(1), '10:00'],
+        ['1001', 11000, 10, None, _day(2), '10:00'],
+        ['1001', 12000, 10, None, _day(3), '10:00'],
+        ['1001', 9000, 10, None, None, None],
+        ['1002', 5000, 12, None, _day(1), '10:00'],
+    ], mtime=1_000_000)
+
+    products, _, conflicts = uploader.load_cj_excel_files(str(excel_folder), workers=1, coalesce='file')
+
+    assert conflicts.empty
+    assert sorted((p['itemCode'], p['salePrice']) for p in products) == [
+        ('1001', 9000), ('1001', 10000), ('1001', 11000), ('1001', 12000), ('1002', 5000)
+    ]
+
+    ordered, schedule = uploader.schedule_products(products)
+    assert list(schedule) == ['', f"{_day(1)} 10:00:00", f"{_day(2)} 10:00:00", f"{_day(3)} 10:00:00"]
+    assert list(schedule.values()) == [1, 2, 1, 1]
+    assert [p['salePrice'] for p in ordered if p['itemCode'] == '1001'] == [9000, 10000, 11000, 12000]
+
+    # 적용일시가 다른 상품은 같은 요청에 담기지 않음
+    requests = list(uploader.build_price_requests(ordered, 50))
+    assert [len(request_products) for _, request_products in requests] == [1, 2, 1, 1]
+
+
+def test_conflict_only_when_item_and_slot_are_the_same(excel_folder):
+    _write_cj_excel(excel_folder / 'old.xlsx', [
+        ['1001', 10000, 10, None, _day(1), '10:00'],
+        ['1001', 11000, 10, None, _day(2), '10:00'],
+    ], mtime=1_000_000)
+    _write_cj_excel(excel_folder / 'new.xlsx', [
+        ['1001', 10500, 10, None, _day(1), '10:00'],
+    ], mtime=2_000_000)
+
+    products, _, conflicts = uploader.load_cj_excel_files(str(excel_folder), workers=1, coalesce='file')
+
+    assert sorted(p['salePrice'] for p in products) == [10500, 11000]
+    assert set(conflicts['applyDate']) == {f"{_day(1)} 10:00:00"}
+    assert conflicts.loc[conflicts['selected'], 'salePrice'].tolist() == [10500]
+
+
+def test_past_slots_collapse_into_immediate_price(excel_folder):
+    _write_cj_excel(excel_folder / 'past.xlsx', [
+        ['1001', 8000, 10, None, _day(-2), '10:00'],
+        ['1001', 8500, 10, None, _day(-1), '10:00'],
+        ['1001', 10000, 10, None, _day(1), '10:00'],
+    ], mtime=1_000_000)
+
+    products, _, _ = uploader.load_cj_excel_files(str(excel_folder), workers=1, coalesce='applyDate')
+
+    assert sorted((p['applyDate'], p['salePrice']) for p in products) == [
+        ('', 8500), (f"{_day(1)} 10:00:00", 10000)
+    ]
+
+
+def test_resume_and_delta_skip_only_the_applied_slot(tmp_path, excel_folder):
+    _write_cj_excel(excel_folder / 'week.xlsx', [
+        ['1001', 10000, 10, None, _day(1), '10:00'],
+        ['1001', 11000, 10, None, _day(2), '10:00'],
+    ], mtime=1_000_000)
+    products, _, _ = uploader.load_cj_excel_files(str(excel_folder), workers=1, coalesce='file')
+    products, _ = uploader.schedule_products(products)
+    first_slot = next(p for p in products if p['salePrice'] == 10000)
+
+    journal_path = str(tmp_path / 'journal.jsonl')
+    journal = UploadJournal(journal_path)
+    journal.record(uploader.CJUploadResult(first_slot, success=True))
+    journal.close()
+
+    applied = UploadJournal.load_applied(journal_path)
+    remaining, skipped = filter_already_applied(products, applied)
+    assert skipped == 1
+    assert [p['salePrice'] for p in remaining] == [11000]
+
+    snapshot_path = str(tmp_path / 'snapshot.json')
+    snapshot = PriceSnapshot(snapshot_path)
+    snapshot.merge(applied)
+    snapshot.save()
+    remaining, unchanged = filter_already_applied(products, PriceSnapshot(snapshot_path).prices)
+    assert unchanged == 1
+    assert [p['salePrice'] for p in remaining] == [11000]
+
+
+def test_snapshot_reads_item_code_only_format_as_immediate_prices(tmp_path):
+    snapshot_path = tmp_path / 'snapshot.json'
+    snapshot_path.write_text('{"1001": [9000, 10.0]}', encoding='utf-8')
+
+    assert PriceSnapshot(str(snapshot_path)).prices == {('1001', ''): (9000, 10.0)}
+
+
+def _at(days, time_text='10:00:00'):
+    return f"{_day(days)} {time_text}"
+
+
+def test_revert_after_scheduled_slot_takes_effect_is_not_skipped(tmp_path):
+    snapshot_path = str(tmp_path / 'snapshot.json')
+    immediate = CJProduct('1001', 9000, 10, '', 'a.xlsx')
+    scheduled = CJProduct('1001', 10000, 10, _at(1), 'b.xlsx')
+
+    # 1) 즉시 9000원, 2) 내일 10000원 예약
+    for product in (immediate, scheduled):
+        journal_path = str(tmp_path / 'journal.jsonl')
+        journal = UploadJournal(journal_path)
+        journal.record(uploader.CJUploadResult(product, success=True))
+        journal.close()
+        applied_at = {}
+        snapshot = PriceSnapshot(snapshot_path)
+        snapshot.merge(UploadJournal.load_applied(journal_path, applied_at), applied_at)
+        snapshot.save()
+
+    # 예약 전에는 9000원이 현재 가격이므로 다시 보낼 필요 없음
+    _, skipped = filter_already_applied([immediate], PriceSnapshot(snapshot_path, now_text=_at(0)).prices)
+    assert skipped == 1
+
+    # 3) 예약 가격이 적용된 뒤 9000원으로 되돌리는 파일은 업로드해야 함
+    after = PriceSnapshot(snapshot_path, now_text=_at(2))
+    assert after.prices == {('1001', ''): (10000, 10.0)}
+    remaining, skipped = filter_already_applied([immediate], after.prices)
+    assert (remaining, skipped) == ([immediate], 0)
+
+
+def test_immediate_price_applied_after_the_slot_stays_current(tmp_path):
+    snapshot_path = tmp_path / 'snapshot.json'
+    snapshot_path.write_text(json.dumps([
+        ['1001', '', 9000, 10.0, _at(-1, '12:00:00')],
+        ['1001', _at(-1), 10000, 10.0, ''],
+        ['1002', '', 5000, 10.0, _at(-3)],
+        ['1002', _at(-2), 5500, 10.0, ''],
+        ['1002', _at(-1), 6000, 10.0, ''],
+    ]), encoding='utf-8')
+
+    assert PriceSnapshot(str(snapshot_path)).prices == {
+        ('1001', ''): (9000, 10.0),
+        ('1002', ''): (6000, 10.0),
+    }
+
+
+def test_resume_journal_merges_past_slots_by_apply_time(tmp_path):
+    journal_path = tmp_path / 'journal.jsonl'
+    entries = [
+        {'itemCode': '1001', 'salePrice': 9000, 'commissionRate': 10.0, 'applyDate': '', 'success': True,
+         'recordedAt': _at(-2)},
+        {'itemCode': '1001', 'salePrice': 10000, 'commissionRate': 10.0, 'applyDate': _at(-1), 'success': True,
+         'recordedAt': _at(-2)},
+    ]
+    journal_path.write_text(''.join(json.dumps(entry) + '\n' for entry in entries), encoding='utf-8')
+
+    applied_at = {}
+    assert UploadJournal.load_applied(str(journal_path), applied_at) == {('1001', ''): (10000, 10.0)}
+    assert applied_at == {('1001', ''): _at(-1)}
@@ -0,0 +1,19 @@
+"""결과가 하나도 기록되지 않은 실행에서도 리포트 생성이 실패하지 않는지 확인합니다."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cj_batch_upload_git as uploader
+from cj_upload_report import ResultReportWriter
+
+
+def test_empty_result_csv_does_not_divide_by_zero(tmp_path, capsys):
+    report = ResultReportWriter(str(tmp_path / 'report.csv'))
+    report.close()
+
+    uploader.generate_report(report.path, [{'fileName': 'a.xlsx', 'validProducts': 0}])
+
+    assert '기록된 업로드 결과가 없습니다' in capsys.readouterr().out
+    assert not (tmp_path / 'report.xlsx').exists()
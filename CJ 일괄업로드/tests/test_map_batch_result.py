@@ -0,0 +1,74 @@
+"""여러 상품을 담은 API 응답이 상품별 성공/실패로 올바르게 나뉘는지 확인합니다."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cj_batch_upload_git import map_batch_result
+from cj_products import CJProduct
+
+
+def _products(*item_codes):
+    return [CJProduct(code, 10000, 10.0, '', 'a.xlsx') for code in item_codes]
+
+
+def _by_code(results):
+    return {result['itemCode']: result for result in results}
+
+
+def test_fail_list_marks_only_listed_items_as_failed():
+    products = _products('1001', '1002', '1003')
+    response = {'success': True, 'status_code': 200, 'elapsed': 0.1234,
+                'data': {'error': False, 'failList': [{'itemCode': ' 1002 ', 'errorMessage': '판매가 오류'}]}}
+
+    results = _by_code(map_batch_result(products, response))
+
+    assert [results[code]['success'] for code in ('1001', '1002', '1003')] == [True, False, True]
+    assert results['1002']['error'] == '판매가 오류'
+    assert results['1002']['retriable'] is False
+    assert results['1001']['elapsed'] == 0.123
+
+
+def test_unmatched_fail_entry_fails_the_whole_request():
+    products = _products('1001', '1002')
+    response = {'success': True, 'status_code': 200,
+                'data': {'error': False, 'failList': [{'errorMessage': '잠시 후 다시 시도'}]}}
+
+    results = map_batch_result(products, response)
+
+    assert not any(result['success'] for result in results)
+    assert {result['error'] for result in results} == {'실패 상품 식별 불가: 잠시 후 다시 시도'}
+    assert all(result['retriable'] for result in results)
+
+
+def test_unmatched_fail_entry_belongs_to_the_only_item_of_a_single_request():
+    response = {'success': True, 'status_code': 200,
+                'data': {'error': False, 'failList': [{'itemCode': '9999', 'errorMessage': '상품 없음'}]}}
+
+    [result] = map_batch_result(_products('1001'), response)
+
+    assert result['success'] is False
+    assert result['error'] == '상품 없음'
+
+
+def test_matched_errors_are_kept_when_another_entry_is_unmatched():
+    response = {'success': True, 'status_code': 200,
+                'data': {'error': False, 'failList': [{'itemCode': '1001', 'errorMessage': '판매가 오류'},
+                                                      {'errorMessage': '알 수 없음'}]}}
+
+    results = _by_code(map_batch_result(_products('1001', '1002'), response))
+
+    assert results['1001']['error'] == '판매가 오류'
+    assert results['1002']['error'] == '실패 상품 식별 불가: 알 수 없음'
+
+
+def test_request_failure_and_error_response_fail_every_item():
+    products = _products('1001', '1002')
+
+    http_failure = map_batch_result(products, {'success': False, 'status_code': 503, 'error': 'HTTP 503'})
+    assert [(r['success'], r['error'], r['retriable']) for r in http_failure] == [(False, 'HTTP 503', True)] * 2
+
+    error_response = map_batch_result(products, {'success': True, 'status_code': 200,
+                                                 'data': {'error': True, 'returnMessage': '인증 실패'}})
+    assert [(r['success'], r['error'], r['retriable']) for r in error_response] == [(False, '인증 실패', False)] * 2
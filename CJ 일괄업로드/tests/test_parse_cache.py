@@ -0,0 +1,64 @@
+"""엑셀 파싱 캐시가 폴더에 없는 파일과 이전 형식(pickle)의 항목을 정리하는지 확인합니다."""
+
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cj_batch_upload_git as uploader
+from cj_excel_loader import parse_cj_excel_file_cached
+
+
+def _write_cj_excel(path):
+    df = pd.DataFrame([['1001', 10000, 10, None, None, None]],
+                      columns=['상품코드', '판매가', '수수료율', '공급가', '적용일', '적용시간'])
+    df.to_excel(path, startrow=2, index=False)
+
+
+def test_opening_cache_prunes_entries_of_files_no_longer_in_folder(tmp_path):
+    excel_folder = tmp_path / 'excel'
+    cache_dir = tmp_path / 'cache'
+    excel_folder.mkdir()
+    for name in ('2025-11-27_1.xlsx', '2025-11-28_1.xlsx'):
+        _write_cj_excel(excel_folder / name)
+
+    cache = uploader.open_parse_cache(str(cache_dir), str(excel_folder))
+    for name in ('2025-11-27_1.xlsx', '2025-11-28_1.xlsx'):
+        parse_cj_excel_file_cached(str(excel_folder / name), cache)
+    (cache_dir / 'leftover.json.tmp').write_text('{}', encoding='utf-8')
+    assert len(os.listdir(cache_dir)) == 5
+
+    os.remove(excel_folder / '2025-11-27_1.xlsx')
+    cache = uploader.open_parse_cache(str(cache_dir), str(excel_folder))
+
+    assert len(os.listdir(cache_dir)) == 2
+    df, summary = parse_cj_excel_file_cached(str(excel_folder / '2025-11-28_1.xlsx'), cache)
+    assert summary.get('cached') is True
+    assert df['itemCode'].tolist() == ['1001']
+
+
+def test_legacy_pickle_cache_is_removed_and_never_read(tmp_path):
+    excel_folder = tmp_path / 'excel'
+    cache_dir = tmp_path / 'cache'
+    excel_folder.mkdir()
+    excel_path = excel_folder / '2025-11-28_1.xlsx'
+    _write_cj_excel(excel_path)
+
+    cache = uploader.open_parse_cache(str(cache_dir), str(excel_folder))
+    parse_cj_excel_file_cached(str(excel_path), cache)
+    meta_path, data_path = cache._paths(str(excel_path))
+    legacy_path = data_path[:-len('.parquet')] + '.pkl'
+    os.rename(data_path, legacy_path)
+
+    uploader.open_parse_cache(str(cache_dir), str(excel_folder))
+
+    assert sorted(os.listdir(cache_dir)) == [os.path.basename(meta_path)]
+
+
+def test_cache_is_disabled_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr('cj_excel_loader.HAS_PYARROW', False)
+
+    assert uploader.open_parse_cache(str(tmp_path / 'cache'), str(tmp_path)) is None
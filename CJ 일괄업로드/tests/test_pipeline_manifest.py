@@ -0,0 +1,92 @@
+"""통합 파이프라인이 감사 기록으로 저장한 분할 파일을 cjsales 매니페스트에 기록하는지 확인합니다."""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cj_sales_pipeline as pipeline
+from cj_sales_pipeline import splitter, uploader
+from cjsales_manifest import ChunkManifest
+
+CHUNKS = [
+    (2, 3, [['1001', 10000, 10], ['1002', 5000, 10]]),
+    (4, 5, [['1003', 7000, 10], ['1004', 8000, 10]]),
+]
+
+
+class FakeWorkbook:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    output_dir = tmp_path / 'output'
+    monkeypatch.setattr(splitter, 'output_dir', str(output_dir))
+    monkeypatch.setattr(splitter, 'MANIFEST_FILE', str(output_dir / 'cjsales_manifest.json'))
+    monkeypatch.setattr(splitter, 'CHANGED_LIST_FILE', str(output_dir / 'cjsales_changed_files.txt'))
+    monkeypatch.setattr(splitter, 'manifest_signature', lambda: {'chunkSize': 2})
+    monkeypatch.setattr(splitter, 'check_template_file', lambda: True)
+    monkeypatch.setattr(splitter, 'open_source_sheet', lambda: (FakeWorkbook(), None))
+    monkeypatch.setattr('builtins.input', lambda prompt: 'y')
+
+    failing = set()
+
+    def fake_generate_chunk_files(jobs, num_files, workers=1):
+        success_count, failed_files = 0, []
+        for file_num, output_path, rows in jobs:
+            if file_num in failing:
+                failed_files.append(file_num)
+                continue
+            Path(output_path).write_text(json.dumps(rows), encoding='utf-8')
+            success_count += 1
+        return success_count, failed_files
+
+    monkeypatch.setattr(splitter, 'generate_chunk_files', fake_generate_chunk_files)
+    monkeypatch.setattr(uploader, 'upload_stream_and_report',
+                        lambda products, *args, **kwargs: bool(list(products)))
+
+    def run(chunks=CHUNKS, failed=()):
+        failing.clear()
+        failing.update(failed)
+        monkeypatch.setattr(splitter, 'iter_source_chunks', lambda sheet, size: iter(chunks))
+        pipeline.run_pipeline(audit=True)
+        manifest = ChunkManifest(splitter.MANIFEST_FILE, splitter.manifest_signature())
+        with open(splitter.CHANGED_LIST_FILE, encoding='utf-8') as f:
+            changed = [os.path.basename(line.strip()) for line in f]
+        return manifest.previous, changed
+
+    return run
+
+
+def test_audit_files_are_recorded_in_the_manifest(run):
+    chunks, changed = run()
+
+    assert [(n, entry['startRow'], entry['endRow'], entry['rowCount']) for n, entry in sorted(chunks.items())] == [
+        (1, 2, 3, 2), (2, 4, 5, 2)
+    ]
+    assert changed == [chunks[1]['fileName'], chunks[2]['fileName']]
+
+
+def test_only_changed_chunks_are_listed_on_the_next_run(run):
+    run()
+    changed_rows = [CHUNKS[0], (4, 5, [['1003', 7500, 10], ['1004', 8000, 10]])]
+
+    chunks, changed = run(changed_rows)
+
+    assert changed == [chunks[2]['fileName']]
+
+
+def test_failed_audit_file_keeps_its_previous_record(run):
+    first, _ = run()
+    changed_rows = [(2, 3, [['1001', 9000, 10], ['1002', 5000, 10]]), CHUNKS[1]]
+
+    chunks, changed = run(changed_rows, failed={1})
+
+    assert chunks[1] == first[1]
+    assert changed == []
@@ -0,0 +1,82 @@
+"""재시도 대기열의 백오프/지터 범위와 실패의 재시도 가능 여부 분류를 확인합니다."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cj_upload_engine import RetryQueue, is_retriable_failure
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('cj_upload_engine.time.monotonic', lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize('retry_number, delay', [(1, 2.0), (2, 4.0), (3, 8.0), (6, 30.0)])
+def test_backoff_waits_between_half_and_full_delay(clock, retry_number, delay):
+    for _ in range(200):
+        retry_queue = RetryQueue(max_retries=10, base_delay=2.0, max_delay=30.0)
+        clock[0] = 100.0
+        assert retry_queue.schedule('item', retry_number)
+
+        assert delay / 2 <= retry_queue.seconds_until_ready() <= delay
+        clock[0] = 100.0 + delay / 2 - 1e-6
+        assert retry_queue.pop_ready() == []
+        clock[0] = 100.0 + delay
+        assert retry_queue.pop_ready() == ['item']
+        assert len(retry_queue) == 0
+
+
+def test_jitter_spreads_retries_of_the_same_attempt(clock):
+    retry_queue = RetryQueue(max_retries=3, base_delay=2.0)
+    for i in range(100):
+        retry_queue.schedule(i, 2)
+
+    # 두 번째 재시도는 2~4초 사이에 고르게 퍼지므로 3초 시점에는 일부만 꺼낼 수 있음
+    clock[0] = 103.0
+    assert 10 < len(retry_queue.pop_ready()) < 90
+
+
+def test_schedule_refuses_retries_past_the_limit(clock):
+    retry_queue = RetryQueue(max_retries=2)
+
+    assert retry_queue.schedule('a', 2) is True
+    assert retry_queue.schedule('b', 3) is False
+    assert len(retry_queue) == 1
+
+
+def test_ready_items_come_out_in_due_order(clock):
+    retry_queue = RetryQueue(max_retries=5, base_delay=1.0)
+    retry_queue.schedule('late', 4)
+    retry_queue.schedule('early', 1)
+
+    clock[0] = 100.0 + 8.0
+    assert retry_queue.pop_ready() == ['early', 'late']
+    assert retry_queue.seconds_until_ready() == 0.0
+
+
+@pytest.mark.parametrize('status_code, message, expected', [
+    (0, '요청 오류: Connection refused', True),
+    (None, '요청 시간 초과', True),
+    (413, 'Request Entity Too Large', True),
+    (429, 'Too Many Requests', True),
+    (500, 'Internal Server Error', True),
+    (503, '', True),
+    (400, '판매가 오류', False),
+    (404, 'Not Found', False),
+    (200, '판매 불가 상품입니다.', False),
+    (200, '잠시 후 다시 시도해 주세요', True),
+    (200, 'DB timeout', True),
+])
+def test_failure_classification(status_code, message, expected):
+    assert is_retriable_failure(status_code, message) is expected
+
+
+def test_custom_retriable_messages_replace_the_defaults():
+    assert is_retriable_failure(200, '재처리 요망', retriable_messages=('재처리',)) is True
+    assert is_retriable_failure(200, '잠시 후 다시 시도', retriable_messages=('재처리',)) is False
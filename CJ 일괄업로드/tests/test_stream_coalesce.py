@@ -0,0 +1,80 @@
+"""스트리밍 업로드에서 중복 (상품코드, 적용일시)가 본 업로드 뒤 순서대로 전송되는지 확인합니다."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cj_batch_upload_git as uploader
+from cj_products import CJProduct, CJUploadResult
+from cj_upload_journal import PriceSnapshot
+
+FILES = {
+    'a.xlsx': [('1001', 10000), ('1002', 5000), ('1003', 7000)],
+    'b.xlsx': [('1001', 11000), ('1002', 5000), ('1003', 8000)],
+    'c.xlsx': [('1003', 7000)],
+}
+
+
+@pytest.fixture
+def stream_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploader, 'JOURNAL_FILE', str(tmp_path / 'journal.jsonl'))
+    monkeypatch.setattr(uploader, 'SNAPSHOT_FILE', str(tmp_path / 'snapshot.json'))
+    monkeypatch.setattr(uploader, 'REPORT_FOLDER', str(tmp_path / 'reports'))
+
+    uploads = []
+    reports = []
+
+    def fake_batch_upload(products, *args, journal=None, report=None, **kwargs):
+        batch = []
+        for product in products:
+            batch.append((product['itemCode'], product['salePrice']))
+            result = CJUploadResult(product, success=True)
+            journal.record(result)
+            report.record(result)
+        uploads.append(batch)
+
+    monkeypatch.setattr(uploader, 'batch_upload_to_cj', fake_batch_upload)
+    monkeypatch.setattr(uploader, 'generate_report',
+                        lambda path, file_summary, conflicts=None: reports.append(conflicts))
+
+    def run(delta=False):
+        product_filter, skipped_counts, coalescer = uploader.make_stream_product_filter(delta=delta)
+
+        def produce(put):
+            for file_name, rows in FILES.items():
+                for product in product_filter([CJProduct(code, price, 10, '', file_name) for code, price in rows]):
+                    put(product)
+
+        products = uploader.stream_products(produce)
+        uploader.upload_stream_and_report(products, [], skipped_counts, coalescer=coalescer)
+        return uploads, reports[0]
+
+    return run
+
+
+def test_duplicates_are_sent_after_the_stream_and_last_file_wins(stream_run):
+    uploads, conflicts = stream_run()
+
+    assert uploads == [[('1001', 10000), ('1002', 5000), ('1003', 7000)], [('1001', 11000)]]
+    assert PriceSnapshot(uploader.SNAPSHOT_FILE).prices[('1001', '')] == (11000, 10.0)
+
+    rows = [(row.itemCode, row.salePrice, row.fileName, row.selected) for row in conflicts.itertuples()]
+    assert rows == [
+        ('1001', 10000, 'a.xlsx', False), ('1001', 11000, 'b.xlsx', True),
+        ('1003', 7000, 'a.xlsx', False), ('1003', 8000, 'b.xlsx', False), ('1003', 7000, 'c.xlsx', True),
+    ]
+
+
+def test_later_duplicate_is_sent_even_if_it_matches_the_snapshot(stream_run):
+    snapshot = PriceSnapshot(uploader.SNAPSHOT_FILE)
+    snapshot.merge({('1001', ''): (11000, 10), ('1002', ''): (5000, 10)})
+    snapshot.save()
+
+    uploads, _ = stream_run(delta=True)
+
+    # 앞 파일의 10000원이 먼저 적용되므로 스냅샷과 같은 11000원도 다시 보내야 함
+    assert uploads == [[('1001', 10000), ('1003', 7000)], [('1001', 11000)]]
+    assert PriceSnapshot(uploader.SNAPSHOT_FILE).prices[('1001', '')] == (11000, 10.0)
@@ -0,0 +1,136 @@
+"""업로드 엔진(토큰 버킷, 동시 업로드, AIMD 조절)의 동작을 확인합니다."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cj_upload_engine import TokenBucket, ConcurrentUploader, AIMDController
+
+OK = {'success': True, 'status_code': 200, 'elapsed': 0.05, 'data': {'error': False, 'failList': []}}
+THROTTLED = {'success': False, 'status_code': 429, 'elapsed': 0.01}
+TOO_LARGE = {'success': False, 'status_code': 413, 'elapsed': 0.01}
+
+
+def test_token_bucket_paces_acquires_to_its_rate():
+    bucket = TokenBucket(rate=20)
+
+    started = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    elapsed = time.monotonic() - started
+
+    # 첫 토큰은 바로, 나머지 10개는 0.05초 간격
+    assert 0.45 <= elapsed < 0.8
+    assert bucket.try_acquire() is False
+
+
+def test_token_bucket_without_rate_never_waits():
+    bucket = TokenBucket(rate=0)
+
+    started = time.monotonic()
+    for _ in range(1000):
+        bucket.acquire()
+
+    assert time.monotonic() - started < 0.1
+    assert bucket.try_acquire() is True
+
+
+def test_concurrent_uploader_rate_limit_holds_across_workers():
+    uploader = ConcurrentUploader(workers=8, rate_limit=50)
+
+    started = time.monotonic()
+    results = list(uploader.run(range(26), lambda job: {'success': True, 'job': job}))
+    elapsed = time.monotonic() - started
+
+    assert sorted(result['job'] for _, result in results) == list(range(26))
+    # 워커가 8개여도 초당 50회: 첫 요청 이후 25개에 0.5초
+    assert elapsed >= 0.45
+
+
+def test_congestion_lowers_rate_and_concurrency_but_keeps_batch_size():
+    controller = AIMDController(max_concurrency=8, max_batch_size=50, max_rate=20)
+    assert (controller.rate, controller.concurrency, controller.batch_size) == (20, 4, 50)
+
+    controller.observe(THROTTLED)
+
+    assert (controller.rate, controller.concurrency, controller.batch_size) == (10, 2, 50)
+    assert controller.batch_decreases == 0
+
+
+def test_results_already_in_flight_do_not_decrease_again():
+    controller = AIMDController(max_concurrency=8, max_batch_size=50, max_rate=20)
+
+    # 감소 전 동시 요청 4개의 결과는 한 번만 반영
+    for _ in range(4):
+        controller.observe(THROTTLED)
+    assert (controller.rate, controller.decreases) == (10, 1)
+
+    controller.observe(THROTTLED)
+    assert (controller.rate, controller.decreases) == (5, 2)
+
+
+def test_unlimited_rate_starts_from_recent_completion_rate(monkeypatch):
+    clock = iter(i * 0.01 for i in range(100))
+    monkeypatch.setattr('cj_upload_engine.time.monotonic', lambda: next(clock))
+    controller = AIMDController(max_concurrency=8, max_batch_size=50, max_rate=0)
+    assert controller.rate == 0
+
+    for _ in range(10):
+        controller.observe(OK)
+    controller.observe(THROTTLED)
+
+    # 0.01초마다 완료 → 초당 100회의 절반
+    assert controller.rate == pytest.approx(50)
+    assert controller.batch_size == 50
+
+
+def test_request_size_errors_shrink_only_the_batch():
+    controller = AIMDController(max_concurrency=8, max_batch_size=50, max_rate=20)
+
+    controller.observe(TOO_LARGE)
+    assert (controller.rate, controller.concurrency, controller.batch_size) == (20, 4, 25)
+
+    unmatched = {'success': True, 'status_code': 200, 'elapsed': 0.05,
+                 'data': {'error': False, 'failList': [{'errorMessage': '알 수 없음'}]}}
+    for _ in range(5):
+        controller.observe(unmatched)
+    assert (controller.rate, controller.batch_size, controller.batch_decreases) == (20, 12, 2)
+
+
+def test_healthy_window_increases_up_to_the_limits():
+    controller = AIMDController(max_concurrency=8, max_batch_size=50, max_rate=20, sample_size=5)
+    controller.observe(THROTTLED)
+    controller.observe(TOO_LARGE)
+    assert (controller.rate, controller.concurrency, controller.batch_size) == (10, 2, 25)
+
+    for _ in range(5):
+        controller.observe(OK)
+    assert (controller.rate, controller.concurrency, controller.batch_size) == (12, 3, 30)
+
+    for _ in range(100):
+        controller.observe(OK)
+    assert (controller.rate, controller.concurrency, controller.batch_size) == (20, 8, 50)
+
+
+def test_slow_window_does_not_increase():
+    controller = AIMDController(max_concurrency=8, max_batch_size=50, max_rate=20,
+                                sample_size=5, latency_threshold=0.5)
+    for _ in range(5):
+        controller.observe(dict(OK, elapsed=0.8))
+    assert (controller.rate, controller.concurrency, controller.increases) == (20, 4, 0)
+
+
+def test_uploader_follows_controller_rate():
+    uploader = ConcurrentUploader(workers=4, rate_limit=0)
+    controller = AIMDController(max_concurrency=4, max_batch_size=1, max_rate=0)
+    controller.rate = 20
+
+    started = time.monotonic()
+    list(uploader.run(range(11), lambda job: dict(OK), controller))
+
+    assert uploader.rate_limiter.rate == 20
+    assert time.monotonic() - started >= 0.45
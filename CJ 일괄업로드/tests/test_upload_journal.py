@@ -0,0 +1,82 @@
+"""업로드 저널이 묶음 단위로 동기화되고, 중단된 뒤 이어하기에서 올바르게 읽히는지 확인합니다."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cj_products import CJProduct, CJUploadResult
+from cj_upload_journal import UploadJournal, filter_already_applied
+
+
+def _result(item_code, sale_price=10000, success=True):
+    return CJUploadResult(CJProduct(item_code, sale_price, 10, '', 'a.xlsx'), success=success)
+
+
+def test_records_reach_disk_once_per_sync_batch(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr('cj_upload_journal.os.fsync', synced.append)
+    journal_path = tmp_path / 'journal.jsonl'
+    journal = UploadJournal(str(journal_path), sync_every=3, sync_interval=3600)
+
+    for code in ('1001', '1002'):
+        journal.record(_result(code))
+    assert synced == [] and journal_path.read_text(encoding='utf-8') == ''
+
+    journal.record(_result('1003'))
+    assert len(synced) == 1
+    assert len(journal_path.read_text(encoding='utf-8').splitlines()) == 3
+
+    journal.record(_result('1004'))
+    journal.close()
+    assert len(synced) == 2
+    assert len(journal_path.read_text(encoding='utf-8').splitlines()) == 4
+
+
+def test_resume_after_crash_mid_batch_resends_only_unsynced_records(tmp_path):
+    journal_path = str(tmp_path / 'journal.jsonl')
+    journal = UploadJournal(journal_path, sync_every=3, sync_interval=3600)
+    for code in ('1001', '1002', '1003', '1004', '1005'):
+        journal.record(_result(code))
+
+    # 프로세스가 여기서 죽으면 마지막 동기화 이후의 두 건은 디스크에 없음
+    applied = UploadJournal.load_applied(journal_path)
+    journal.close()
+    products = [CJProduct(code, 10000, 10, '', 'a.xlsx') for code in ('1001', '1002', '1003', '1004', '1005')]
+    remaining, skipped = filter_already_applied(products, applied)
+
+    assert skipped == 3
+    assert [p['itemCode'] for p in remaining] == ['1004', '1005']
+
+
+def test_resume_ignores_truncated_last_line_and_starts_a_new_line(tmp_path):
+    journal_path = tmp_path / 'journal.jsonl'
+    complete = json.dumps({'itemCode': '1001', 'salePrice': 10000, 'commissionRate': 10.0,
+                           'applyDate': '', 'success': True}, ensure_ascii=False)
+    journal_path.write_text(complete + '\n{"itemCode": "1002", "salePr', encoding='utf-8')
+
+    journal = UploadJournal(str(journal_path), resume=True)
+    journal.record(_result('1003'))
+    journal.close()
+
+    assert UploadJournal.load_applied(str(journal_path)) == {
+        ('1001', ''): (10000, 10.0),
+        ('1003', ''): (10000, 10.0),
+    }
+
+
+def test_last_record_wins_and_a_later_failure_unapplies(tmp_path):
+    journal_path = str(tmp_path / 'journal.jsonl')
+    journal = UploadJournal(journal_path)
+    journal.record(_result('1001', 10000))
+    journal.record(_result('1001', 12000))
+    journal.record(_result('1002', 5000))
+    journal.record(_result('1002', 5000, success=False))
+    journal.close()
+
+    assert UploadJournal.load_applied(journal_path) == {('1001', ''): (12000, 10.0)}
+
+    # 이어하기가 아니면 새 저널로 시작
+    UploadJournal(journal_path).close()
+    assert UploadJournal.load_applied(journal_path) == {}